@@ -47,11 +47,20 @@ from pipeline.processors import (
     RowLookupProcessor,
     SheetSelectorProcessor,
 )
-from config import APP_ROOT_DIR
+from config import (
+    APP_ROOT_DIR,
+    SHEET_DISK_CACHE_MAX_BYTES,
+    SHEET_MEMORY_CACHE_MAX_BYTES,
+)
 from pipeline.execution.path_analyzer import PathAnalyzer
 from pipeline.execution.file_analyzer import FileAnalyzer
 from pipeline.execution.batch_preloader import BatchPreloader
 from pipeline.performance.analyzer import get_performance_analyzer
+from pipeline.utils.sheet_cache import (
+    configure_sheet_cache,
+    configure_sheet_memory_cache,
+)
+from excel.workspace_manager import workspace_manager
 
 
 class NodePreviewResult:
@@ -191,6 +200,14 @@ class PipelineService:
         self.file_analyzer = FileAnalyzer()
         self.batch_preloader = BatchPreloader()
 
+        # 持久化Sheet缓存放在工作区目录下，文件未变化时跳过重复解析，总大小超出上限时淘汰旧条目
+        configure_sheet_cache(
+            str(workspace_manager.get_sheet_cache_path()), SHEET_DISK_CACHE_MAX_BYTES
+        )
+
+        # 进程级Sheet内存缓存，跨请求复用已加载的Sheet（如编辑流程时的重复预览）
+        configure_sheet_memory_cache(SHEET_MEMORY_CACHE_MAX_BYTES)
+
         self.default_output_file_folder = APP_ROOT_DIR + "/output"
 
     @staticmethod
@@ -110,6 +110,9 @@ def create_execute_pipeline_request(
     target_node_id: str,
     execution_mode: str = "production",
     test_mode_max_rows: int = 100,
+    prune_columns: bool = True,
+    pushdown_filters: bool = True,
+    late_materialization: bool = True,
 ) -> ExecutePipelineRequest:
     """
     创建pipeline执行请求
@@ -119,6 +122,9 @@ def create_execute_pipeline_request(
         target_node_id: 目标节点ID
         execution_mode: 执行模式字符串
         test_mode_max_rows: 测试模式最大行数
+        prune_columns: 是否只读取流程中用到的列（服务只返回输出数据，默认开启）
+        pushdown_filters: 是否将行过滤下推到sheet加载阶段（默认开启）
+        late_materialization: 是否在输出节点才物化行过滤和行查找的结果（默认开启）
 
     Returns:
         ExecutePipelineRequest对象
@@ -135,6 +141,9 @@ def create_execute_pipeline_request(
         target_node_id=target_node_id,
         execution_mode=exec_mode,
         test_mode_max_rows=test_mode_max_rows,
+        prune_columns=prune_columns,
+        pushdown_filters=pushdown_filters,
+        late_materialization=late_materialization,
     )
 
 
@@ -1,2 +1,27 @@
 import os
 APP_ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _env_megabytes(name: str, default: int) -> int:
+    """
+    读取以MB为单位的环境变量并转换为字节数
+
+    Args:
+        name: 环境变量名
+        default: 未设置或不是整数时使用的默认值（MB）
+
+    Returns:
+        字节数，负数按0处理
+    """
+    try:
+        megabytes = int(os.environ.get(name, str(default)))
+    except ValueError:
+        megabytes = default
+    return max(megabytes, 0) * 1024 * 1024
+
+
+# 进程级Sheet内存缓存的内存上限（MB），可通过环境变量调整，0表示关闭
+SHEET_MEMORY_CACHE_MAX_BYTES = _env_megabytes("FLOWEXCEL_SHEET_CACHE_MB", 512)
+
+# 持久化Sheet缓存的磁盘占用上限（MB），超出时淘汰最久未使用的条目
+SHEET_DISK_CACHE_MAX_BYTES = _env_megabytes("FLOWEXCEL_SHEET_DISK_CACHE_MB", 2048)
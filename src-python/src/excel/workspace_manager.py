@@ -3,7 +3,6 @@
 Workspace management module for handling workspace configurations.
 """
 
-import hashlib
 import os
 import json
 import shutil
@@ -14,6 +13,7 @@ from pathlib import Path
 from pydantic import BaseModel
 from config import APP_ROOT_DIR
 from app.models import FileInfo, FileInfoResponse
+from pipeline.utils.sheet_cache import light_hash
 
 
 class WorkspaceSummary(BaseModel):
@@ -279,15 +279,11 @@ class WorkspaceManager:
 
     @staticmethod
     def light_hash(path: str, head: int = 1024, tail: int = 1024) -> str:
-        size = os.path.getsize(path)
-        with open(path, "rb") as f:
-            start = f.read(head)
-            if size > tail:
-                f.seek(-tail, os.SEEK_END)
-                end = f.read(tail)
-            else:
-                end = b""
-        return hashlib.md5(start + end).hexdigest()
+        return light_hash(path, head, tail)
+
+    def get_sheet_cache_path(self) -> Path:
+        """获取持久化Sheet缓存目录路径"""
+        return self.workspace_dir / ".sheet_cache"
 
     def get_file_info(self, file_path: str) -> FileInfo:
         """Get the hash of a file."""
@@ -14,6 +14,7 @@ import uvicorn
 import socket
 import json
 import argparse
+import multiprocessing
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -253,4 +254,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包后的可执行文件需要此调用以支持pipeline并行执行的工作进程
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,162 @@
+"""
+聚合融合
+同一上游DataFrame上的多个聚合节点共享列转换：每个被引用的列只做一次数值转换，
+所有索引值的分组在一次拼接后的数组上按连续区间计算，结果与逐索引执行完全一致
+只有原始列已经是int64/float64时才在拼接后的数组上直接计算：此时数值转换不改变dtype，
+与逐组转换相同；object等其他列逐组转换后的dtype取决于组内的值，沿用逐索引的聚合逻辑
+"""
+
+from typing import Any, Dict, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..models import AggregationOperation, RowSelection
+
+
+class AggregationFusion:
+    """融合聚合器 - 对按键分组的行一次性计算多个聚合"""
+
+    def __init__(
+        self,
+        df: Union[pd.DataFrame, RowSelection],
+        groups: Dict[str, np.ndarray],
+        aggregator_processor,
+    ):
+        """
+        Args:
+            df: 所有聚合节点共同的上游DataFrame
+            groups: 分组键 -> 组内行位置（按行顺序，组之间不重叠）
+            aggregator_processor: 聚合节点处理器（处理无法融合的列）
+        """
+        self.df = df
+        self.keys = list(groups)
+        self.aggregator_processor = aggregator_processor
+
+        lengths = [len(groups[key]) for key in self.keys]
+        self.offsets = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+        self.order = (
+            np.concatenate([groups[key] for key in self.keys])
+            if self.keys
+            else np.empty(0, dtype=np.intp)
+        )
+        self._columns: Dict[str, Tuple[pd.Series, pd.Series, np.ndarray]] = {}
+
+    def evaluate(
+        self, column: str, operation: AggregationOperation
+    ) -> Dict[str, Any]:
+        """
+        计算一个聚合节点在所有分组上的结果
+
+        Args:
+            column: 目标列名
+            operation: 聚合操作
+
+        Returns:
+            分组键 -> 聚合结果；不在结果中的键没有匹配行，结果为None
+        """
+        raw, numeric, numeric_valid = self._column_arrays(column)
+        numeric_values = numeric.to_numpy()
+        fast_numeric = numeric.dtype == raw.dtype and (
+            numeric_values.dtype.kind == "i" or numeric_values.dtype == np.float64
+        )
+        raw_valid = raw.notna().to_numpy()
+
+        results = {}
+        for i, key in enumerate(self.keys):
+            start, end = self.offsets[i], self.offsets[i + 1]
+            if start == end:
+                results[key] = None
+                continue
+
+            if operation == AggregationOperation.COUNT:
+                results[key] = int(raw_valid[start:end].sum())
+            elif operation in (AggregationOperation.FIRST, AggregationOperation.LAST):
+                valid_positions = np.flatnonzero(raw_valid[start:end])
+                if len(valid_positions) == 0:
+                    results[key] = None
+                else:
+                    offset = valid_positions[
+                        0 if operation == AggregationOperation.FIRST else -1
+                    ]
+                    results[key] = self.aggregator_processor._convert_to_serializable(
+                        raw.iloc[start + offset]
+                    )
+            elif fast_numeric:
+                results[key] = self._reduce_numeric(
+                    raw.iloc[start:end],
+                    numeric_values[start:end],
+                    numeric_valid[start:end],
+                    operation,
+                )
+            else:
+                # object列（整列转换的dtype可能与逐组转换不同）、可空整数等扩展类型沿用逐索引的聚合逻辑
+                results[key] = self.aggregator_processor._perform_aggregation(
+                    pd.DataFrame({column: raw.iloc[start:end]}), column, operation
+                )
+        return results
+
+    def _column_arrays(self, column: str) -> Tuple[pd.Series, pd.Series, np.ndarray]:
+        """
+        按分组顺序取出列值并做一次数值转换，同一列在所有聚合节点间共享
+
+        Returns:
+            (原始值, 数值转换结果, 数值是否有效)
+        """
+        if column not in self._columns:
+            raw = self.df[column].take(self.order)
+            numeric = pd.to_numeric(raw, errors="coerce")
+            self._columns[column] = (raw, numeric, numeric.notna().to_numpy())
+        return self._columns[column]
+
+    @staticmethod
+    def _reduce_numeric(
+        raw: pd.Series,
+        values: np.ndarray,
+        valid: np.ndarray,
+        operation: AggregationOperation,
+    ) -> Any:
+        """
+        对一个分组的数值计算聚合，求和与均值的累加方式与pandas一致
+
+        Args:
+            raw: 分组的原始值（非数值列的最小/最大值使用）
+            values: 分组的数值转换结果（int64或float64）
+            valid: 数值是否有效
+            operation: 聚合操作
+
+        Returns:
+            聚合结果值
+        """
+        count = int(valid.sum())
+        if operation in (AggregationOperation.MIN, AggregationOperation.MAX):
+            if count == 0:
+                # 非数值数据按字符串比较
+                non_null_data = raw.dropna()
+                if len(non_null_data) == 0:
+                    return None
+                return str(
+                    non_null_data.min()
+                    if operation == AggregationOperation.MIN
+                    else non_null_data.max()
+                )
+            selected = values if count == len(values) else values[valid]
+            return float(
+                selected.min() if operation == AggregationOperation.MIN else selected.max()
+            )
+
+        if count == 0:
+            return None
+        if values.dtype.kind == "f":
+            filled = values if count == len(values) else np.where(valid, values, 0.0)
+            total = filled.sum(dtype=np.float64)
+        elif operation == AggregationOperation.SUM:
+            total = values.sum(dtype=np.int64)
+        else:
+            total = values.sum(dtype=np.float64)
+
+        if operation == AggregationOperation.SUM:
+            return float(total)
+        if operation == AggregationOperation.AVERAGE:
+            return float(total / count)
+        raise ValueError(f"Unsupported aggregation operation: {operation}")
@@ -1,20 +1,41 @@
 """
 批量预加载器
-并行加载多个Excel文件的多个Sheet，大幅减少IO次数和上下文切换开销
+按文件并行加载多个Excel文件，同一文件的多个Sheet在一次打开会话中读取，大幅减少IO次数和上下文切换开销
 专为性能优化设计，支持进度监控和错误处理
+可选在工作进程中解析文件，结果以pickle协议5的带外缓冲区传回主进程
+进程级内存缓存或持久化Sheet缓存命中时直接加载，跳过Excel解析
+下推了行过滤条件的Sheet在清洗后立即过滤，只缓存和保留过滤后的行
 """
 
 import logging
 import pandas as pd
 import time
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass
+import pickle
+import threading
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import Iterable, List, Dict, Tuple, Optional
+from dataclasses import dataclass, replace
 
 from .file_analyzer import FileBatchInfo
 from ..models import GlobalContext
 from ..performance.analyzer import get_performance_analyzer
+from ..utils.sheet_cache import (
+    FileFingerprint,
+    SheetDiskCache,
+    SheetMemoryCache,
+    dataframe_cache_key,
+    file_fingerprint,
+    get_sheet_cache,
+    get_sheet_memory_cache,
+    predicate_key,
+)
 
 
 @dataclass
@@ -43,6 +64,167 @@ class BatchPreloadSummary:
     io_reduction_count: int  # 减少的IO次数
 
 
+def _sheet_predicate(batch_info: FileBatchInfo, sheet_name: str) -> Optional[str]:
+    """Sheet下推的行过滤条件摘要，没有下推条件时返回None"""
+    row_filters = batch_info.sheet_filters.get(sheet_name)
+    return predicate_key(row_filters) if row_filters else None
+
+
+def _load_file_sheets(
+    batch_info: FileBatchInfo, sheet_cache: Optional[SheetDiskCache] = None
+) -> Tuple[List[PreloadResult], int]:
+    """
+    打开一次文件，读取并清洗该文件所有需要的Sheet
+
+    Args:
+        batch_info: 文件批量信息
+        sheet_cache: 持久化Sheet缓存，清洗后的Sheet会写入其中
+
+    Returns:
+        (每个Sheet的预加载结果, 实际读取的文件字节数)
+    """
+    from ..processors.row_filter import RowFilterProcessor
+    from ..utils.data_cleaner import clean_dataframe_with_smart_strategy
+    from ..utils.excel_reader import read_workbook_sheets
+
+    # 指纹必须在读取之前计算，避免读取期间文件被修改后缓存了旧内容
+    fingerprint = (
+        file_fingerprint(batch_info.file_path) if sheet_cache is not None else None
+    )
+
+    # 注意：批量预加载不计入常规Excel IO统计，避免重复计数
+    start_time = time.time()
+    raw_sheets = read_workbook_sheets(
+        batch_info.file_path,
+        batch_info.required_sheets,
+        batch_info.sheet_header_rows,
+        batch_info.sheet_columns,
+    )
+    read_time_ms = (time.time() - start_time) * 1000
+    per_sheet_read_ms = read_time_ms / max(1, len(raw_sheets))
+
+    results = []
+    for sheet_name, raw in raw_sheets.items():
+        if isinstance(raw, Exception):
+            results.append(
+                PreloadResult(
+                    file_id=batch_info.file_id,
+                    sheet_name=sheet_name,
+                    success=False,
+                    error=str(raw),
+                    load_time_ms=per_sheet_read_ms,
+                )
+            )
+            continue
+
+        clean_start = time.time()
+        try:
+            # 使用智能数据清理器进行清理
+            cleaned_df = clean_dataframe_with_smart_strategy(raw)
+            row_filters = batch_info.sheet_filters.get(sheet_name)
+            if row_filters:
+                cleaned_df = RowFilterProcessor().filter_dataframe(cleaned_df, row_filters)
+        except Exception as e:
+            results.append(
+                PreloadResult(
+                    file_id=batch_info.file_id,
+                    sheet_name=sheet_name,
+                    success=False,
+                    error=str(e),
+                    load_time_ms=per_sheet_read_ms,
+                )
+            )
+            continue
+
+        if sheet_cache is not None:
+            sheet_cache.store(
+                batch_info.file_path,
+                sheet_name,
+                batch_info.sheet_header_rows.get(sheet_name, 0),
+                fingerprint,
+                cleaned_df,
+                batch_info.sheet_columns.get(sheet_name),
+                _sheet_predicate(batch_info, sheet_name),
+            )
+
+        results.append(
+            PreloadResult(
+                file_id=batch_info.file_id,
+                sheet_name=sheet_name,
+                success=True,
+                dataframe=cleaned_df,
+                load_time_ms=per_sheet_read_ms + (time.time() - clean_start) * 1000,
+                rows=len(cleaned_df),
+            )
+        )
+
+    # 只有至少成功读取一个Sheet时才计入读取的字节数
+    bytes_read = 0
+    if any(result.success for result in results):
+        try:
+            bytes_read = os.path.getsize(batch_info.file_path)
+        except OSError:
+            bytes_read = 0
+
+    return results, bytes_read
+
+
+def _pack_dataframe(df: pd.DataFrame) -> Tuple[bytes, List[bytearray]]:
+    """
+    将DataFrame序列化为pickle协议5的数据流和带外缓冲区
+
+    数值列的内存块以原始字节的形式作为带外缓冲区传输，不经过逐元素的pickle编码
+
+    Args:
+        df: 待序列化的DataFrame
+
+    Returns:
+        (pickle数据流, 带外缓冲区列表)
+    """
+    buffers = []
+    payload = pickle.dumps(df, protocol=5, buffer_callback=buffers.append)
+    # PickleBuffer只能用协议5序列化，进程间管道使用的是默认协议，因此转为bytearray
+    return payload, [bytearray(buffer.raw()) for buffer in buffers]
+
+
+def _unpack_dataframe(payload: bytes, buffers: List[bytearray]) -> pd.DataFrame:
+    """
+    从pickle数据流和带外缓冲区还原DataFrame（直接引用缓冲区内存，不再复制）
+
+    Args:
+        payload: pickle数据流
+        buffers: 带外缓冲区列表
+
+    Returns:
+        还原的DataFrame
+    """
+    return pickle.loads(payload, buffers=buffers)
+
+
+def _load_file_sheets_packed(
+    batch_info: FileBatchInfo, sheet_cache: Optional[SheetDiskCache] = None
+) -> Tuple[List[PreloadResult], List[Optional[Tuple[bytes, List[bytearray]]]], int]:
+    """
+    在工作进程中读取并清洗文件的所有Sheet，DataFrame以二进制形式返回给主进程
+
+    Args:
+        batch_info: 文件批量信息
+        sheet_cache: 持久化Sheet缓存
+
+    Returns:
+        (不含DataFrame的预加载结果, 与结果一一对应的序列化DataFrame, 实际读取的文件字节数)
+    """
+    results, bytes_read = _load_file_sheets(batch_info, sheet_cache)
+    packed_frames = []
+    for result in results:
+        if result.dataframe is None:
+            packed_frames.append(None)
+            continue
+        packed_frames.append(_pack_dataframe(result.dataframe))
+        result.dataframe = None
+    return results, packed_frames, bytes_read
+
+
 class BatchPreloader:
     """批量预加载器 - 并行加载多个Excel文件"""
 
@@ -51,7 +233,10 @@ class BatchPreloader:
         self.analyzer = get_performance_analyzer()
 
     def preload_files(
-        self, batch_infos: List[FileBatchInfo], global_context: GlobalContext
+        self,
+        batch_infos: List[FileBatchInfo],
+        global_context: GlobalContext,
+        use_processes: bool = False,
     ) -> BatchPreloadSummary:
         """
         批量预加载文件
@@ -59,170 +244,211 @@ class BatchPreloader:
         Args:
             batch_infos: 文件批量加载信息列表
             global_context: 全局上下文（用于存储缓存）
+            use_processes: 是否在工作进程中解析文件（openpyxl解析持有GIL，线程无法并行）
 
         Returns:
             批量预加载摘要
         """
-        start_time = time.time()
-
-        # print(f"PERF: Starting batch preload for {len(batch_infos)} files...")
+        return self.submit_files(batch_infos, global_context, use_processes).wait()
 
-        # 准备所有需要加载的任务
-        load_tasks = []
-        for batch_info in batch_infos:
-            for sheet_name in batch_info.required_sheets:
-                load_tasks.append((batch_info, sheet_name))
-
-        # 计算估算的IO减少量
-        io_reduction = len(load_tasks) - len(batch_infos)
-
-        # print(
-        #     f"PERF: Will load {len(load_tasks)} sheets from {len(batch_infos)} files (IO reduction: {io_reduction})"
-        # )
-
-        # 并行执行加载任务
-        results = self._execute_parallel_loads(load_tasks, global_context)
-
-        # 生成摘要
-        total_time = (time.time() - start_time) * 1000
-        summary = self._create_summary(results, total_time, io_reduction)
-
-        # 打印摘要已在analyzer中包含
-        # self._print_summary(summary)
-
-        # 记录批量预加载统计（分开计算，避免与常规Excel IO混淆）
-        self.analyzer.onBatchPreloadComplete(
-            total_files=len(batch_infos),
-            total_sheets=summary.total_sheets,
-            successful_sheets=summary.successful_sheets,
-            failed_sheets=summary.failed_sheets,
-            total_time_ms=summary.total_time_ms,
-            total_rows=summary.total_rows,
-            total_io_reduction=io_reduction
-        )
-
-        return summary
-
-    def _execute_parallel_loads(
-        self, load_tasks: List[Tuple[FileBatchInfo, str]], global_context: GlobalContext
-    ) -> List[PreloadResult]:
+    def submit_files(
+        self,
+        batch_infos: List[FileBatchInfo],
+        global_context: GlobalContext,
+        use_processes: bool = False,
+    ) -> "PreloadHandle":
         """
-        并行执行加载任务
+        提交批量预加载任务，立即返回句柄，调用方可以在加载期间继续其他工作
+
+        优先级高的文件先提交，优先被工作线程/进程读取
 
         Args:
-            load_tasks: 加载任务列表
-            global_context: 全局上下文
+            batch_infos: 文件批量加载信息列表
+            global_context: 全局上下文（用于存储缓存）
+            use_processes: 是否在工作进程中解析文件
 
         Returns:
-            预加载结果列表
+            预加载句柄
         """
-        results = []
+        start_time = time.time()
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # 提交所有任务
-            future_to_task = {
-                executor.submit(self._load_single_sheet, batch_info, sheet_name): (
-                    batch_info,
-                    sheet_name,
-                )
-                for batch_info, sheet_name in load_tasks
-            }
+        # 每个文件的所有Sheet在一次打开会话中读取
+        total_sheet_count = sum(len(info.required_sheets) for info in batch_infos)
 
-            # 收集结果
-            for future in as_completed(future_to_task):
-                batch_info, sheet_name = future_to_task[future]
+        # 相比逐个Sheet打开文件减少的IO次数
+        io_reduction = total_sheet_count - len(batch_infos)
+        total_files = len(batch_infos)
 
-                try:
-                    result = future.result()
-                    results.append(result)
+        results = []
 
-                    # 如果成功，添加到缓存
-                    if result.success and result.dataframe is not None:
-                        cache_key = f"{batch_info.file_id}_{sheet_name}"
-                        global_context.loaded_dataframes[cache_key] = result.dataframe
+        # 已在全局上下文中的Sheet（如计算索引值时读取的Sheet）无需重复加载
+        batch_infos = self._skip_loaded_sheets(batch_infos, global_context)
 
-                except Exception as e:
-                    # 处理意外错误
-                    error_result = PreloadResult(
-                        file_id=batch_info.file_id,
-                        sheet_name=sheet_name,
-                        success=False,
-                        error=f"Unexpected error: {str(e)}",
-                    )
-                    results.append(error_result)
+        # 进程级缓存和持久化缓存命中的Sheet直接在主进程中加载，只解析剩余的Sheet
+        memory_cache = get_sheet_memory_cache()
+        sheet_cache = get_sheet_cache()
+        fingerprints = {}
+        if memory_cache is not None or sheet_cache is not None:
+            batch_infos, fingerprints = self._load_cached_sheets(
+                batch_infos, memory_cache, sheet_cache, global_context, results
+            )
 
-        return results
+        # 只有一个文件时没有可并行的任务，不值得启动工作进程
+        use_processes = use_processes and len(batch_infos) > 1
+        if use_processes:
+            executor = ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(batch_infos))
+            )
+            load_function = _load_file_sheets_packed
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            load_function = _load_file_sheets
+
+        # 每个文件一个任务，按优先级从高到低提交（排序稳定，同优先级保持原顺序）
+        ordered_batches = sorted(batch_infos, key=lambda info: -info.priority)
+        future_to_batch = {
+            executor.submit(load_function, batch_info, sheet_cache): batch_info
+            for batch_info in ordered_batches
+        }
+
+        return PreloadHandle(
+            preloader=self,
+            global_context=global_context,
+            executor=executor,
+            future_to_batch=future_to_batch,
+            results=results,
+            use_processes=use_processes,
+            memory_cache=memory_cache,
+            fingerprints=fingerprints,
+            start_time=start_time,
+            total_files=total_files,
+            io_reduction=io_reduction,
+        )
 
-    def _load_single_sheet(
-        self, batch_info: FileBatchInfo, sheet_name: str
-    ) -> PreloadResult:
+    def _skip_loaded_sheets(
+        self, batch_infos: List[FileBatchInfo], global_context: GlobalContext
+    ) -> List[FileBatchInfo]:
         """
-        加载单个Sheet
+        去掉已经加载到全局上下文中的Sheet
 
         Args:
-            batch_info: 文件批量信息
-            sheet_name: Sheet名称
+            batch_infos: 文件批量加载信息列表
+            global_context: 全局上下文
 
         Returns:
-            预加载结果
+            仍需加载的文件批量加载信息列表
         """
-        start_time = time.time()
-
-        # 注意：批量预加载不计入常规Excel IO统计，避免重复计数
-        # read_id = self.analyzer.onExcelReadStart(batch_info.file_path, sheet_name)
-
-        try:
-            # 获取header row信息
-            header_row = batch_info.sheet_header_rows.get(sheet_name, 0)
-
-            # 读取Excel
-            df = pd.read_excel(
-                batch_info.file_path, sheet_name=sheet_name, header=header_row
-            )
-            
-            # 使用智能数据清理器进行清理
-            from ..utils.data_cleaner import clean_dataframe_with_smart_strategy
-            cleaned_df = clean_dataframe_with_smart_strategy(df)
-
-            load_time_ms = (time.time() - start_time) * 1000
-
-            # 获取文件大小
-            try:
-                file_size = os.path.getsize(batch_info.file_path)
-            except:
-                file_size = None
-
-            # 批量预加载不计入常规Excel IO统计
-            # self.analyzer.onExcelReadFinish(read_id, len(cleaned_df), file_size)
-
-            return PreloadResult(
-                file_id=batch_info.file_id,
-                sheet_name=sheet_name,
-                success=True,
-                dataframe=cleaned_df,
-                load_time_ms=load_time_ms,
-                rows=len(cleaned_df),
-            )
+        remaining = []
+        for batch_info in batch_infos:
+            missing_sheets = [
+                sheet_name
+                for sheet_name in batch_info.required_sheets
+                if dataframe_cache_key(
+                    batch_info.file_id, sheet_name, _sheet_predicate(batch_info, sheet_name)
+                )
+                not in global_context.loaded_dataframes
+            ]
+            if len(missing_sheets) == len(batch_info.required_sheets):
+                remaining.append(batch_info)
+            elif missing_sheets:
+                remaining.append(replace(batch_info, required_sheets=missing_sheets))
+        return remaining
+
+    def _load_cached_sheets(
+        self,
+        batch_infos: List[FileBatchInfo],
+        memory_cache: Optional[SheetMemoryCache],
+        sheet_cache: Optional[SheetDiskCache],
+        global_context: GlobalContext,
+        results: List[PreloadResult],
+    ) -> Tuple[List[FileBatchInfo], Dict[str, FileFingerprint]]:
+        """
+        从进程级内存缓存和持久化缓存加载Sheet
 
-        except Exception as e:
-            load_time_ms = (time.time() - start_time) * 1000
+        Args:
+            batch_infos: 文件批量加载信息列表
+            memory_cache: 进程级Sheet内存缓存
+            sheet_cache: 持久化Sheet缓存
+            global_context: 全局上下文
+            results: 预加载结果列表，命中的Sheet结果追加到其中
 
-            # 批量预加载不计入常规Excel IO统计
-            # self.analyzer.onExcelReadFinish(read_id, 0, None)
+        Returns:
+            (仍需从Excel读取的文件批量加载信息列表, 文件ID -> 读取前计算的文件指纹)
+        """
+        remaining = []
+        fingerprints = {}
+        for batch_info in batch_infos:
+            fingerprint = file_fingerprint(batch_info.file_path)
+            fingerprints[batch_info.file_id] = fingerprint
+            missing_sheets = []
+            for sheet_name in batch_info.required_sheets:
+                start_time = time.time()
+                header_row = batch_info.sheet_header_rows.get(sheet_name, 0)
+                columns = batch_info.sheet_columns.get(sheet_name)
+                predicate = _sheet_predicate(batch_info, sheet_name)
+                cache_key = dataframe_cache_key(batch_info.file_id, sheet_name, predicate)
+
+                df = None
+                if memory_cache is not None:
+                    df = memory_cache.get(
+                        batch_info.file_path,
+                        sheet_name,
+                        header_row,
+                        fingerprint,
+                        columns,
+                        predicate,
+                    )
+                    if df is not None:
+                        self.analyzer.onCacheHit(cache_key)
+                    else:
+                        self.analyzer.onCacheMiss(cache_key)
+
+                if df is None and sheet_cache is not None:
+                    df = sheet_cache.load(
+                        batch_info.file_path,
+                        sheet_name,
+                        header_row,
+                        fingerprint,
+                        columns,
+                        predicate,
+                    )
+                    if df is not None and memory_cache is not None:
+                        memory_cache.put(
+                            batch_info.file_path,
+                            sheet_name,
+                            header_row,
+                            fingerprint,
+                            df,
+                            columns,
+                            predicate,
+                        )
+
+                if df is None:
+                    missing_sheets.append(sheet_name)
+                    continue
+
+                global_context.loaded_dataframes[cache_key] = df
+                results.append(
+                    PreloadResult(
+                        file_id=batch_info.file_id,
+                        sheet_name=sheet_name,
+                        success=True,
+                        dataframe=df,
+                        load_time_ms=(time.time() - start_time) * 1000,
+                        rows=len(df),
+                    )
+                )
 
-            return PreloadResult(
-                file_id=batch_info.file_id,
-                sheet_name=sheet_name,
-                success=False,
-                error=str(e),
-                load_time_ms=load_time_ms,
-            )
+            if missing_sheets:
+                remaining.append(replace(batch_info, required_sheets=missing_sheets))
+        return remaining, fingerprints
 
     def _create_summary(
         self,
         results: List[PreloadResult],
         total_time_ms: float,
         io_reduction_count: int,
+        bytes_read: int,
     ) -> BatchPreloadSummary:
         """
         创建批量预加载摘要
@@ -231,6 +457,7 @@ class BatchPreloader:
             results: 预加载结果列表
             total_time_ms: 总时间
             io_reduction_count: IO减少数量
+            bytes_read: 实际读取的文件字节数
 
         Returns:
             批量预加载摘要
@@ -240,16 +467,13 @@ class BatchPreloader:
 
         total_rows = sum(r.rows for r in successful_results)
 
-        # 估算文件大小（基于成功加载的数据）
-        estimated_size = total_rows * 50  # 粗略估算每行50字节
-
         return BatchPreloadSummary(
             total_sheets=len(results),
             successful_sheets=len(successful_results),
             failed_sheets=len(failed_results),
             total_time_ms=total_time_ms,
             total_rows=total_rows,
-            total_files_size_bytes=estimated_size,
+            total_files_size_bytes=bytes_read,
             io_reduction_count=io_reduction_count,
         )
 
@@ -268,7 +492,7 @@ class BatchPreloader:
         logging.info(f"❌ 加载失败: {summary.failed_sheets}")
         logging.info(f"⏱️ 总加载时间: {summary.total_time_ms:.2f}ms")
         logging.info(f"📋 总行数: {summary.total_rows}")
-        logging.info(f"💾 估算大小: {summary.total_files_size_bytes} bytes")
+        logging.info(f"💾 读取大小: {summary.total_files_size_bytes} bytes")
         logging.info(f"🚀 减少IO次数: {summary.io_reduction_count}")
 
         if summary.total_sheets > 0:
@@ -278,3 +502,166 @@ class BatchPreloader:
             logging.info(f"📊 平均加载时间: {avg_time:.2f}ms/sheet")
 
         logging.info("=" * 50)
+
+
+class PreloadHandle:
+    """异步批量预加载句柄 - 收集已完成的加载任务并写入全局上下文"""
+
+    def __init__(
+        self,
+        preloader: BatchPreloader,
+        global_context: GlobalContext,
+        executor,
+        future_to_batch: Dict[Future, FileBatchInfo],
+        results: List[PreloadResult],
+        use_processes: bool,
+        memory_cache: Optional[SheetMemoryCache],
+        fingerprints: Dict[str, FileFingerprint],
+        start_time: float,
+        total_files: int,
+        io_reduction: int,
+    ):
+        self.preloader = preloader
+        self.global_context = global_context
+        self._executor = executor
+        self._future_to_batch = future_to_batch
+        self._results = results
+        self._use_processes = use_processes
+        self._memory_cache = memory_cache
+        self._fingerprints = fingerprints
+        self._start_time = start_time
+        self._total_files = total_files
+        self._io_reduction = io_reduction
+        self._bytes_read = 0
+        self._collected = set()
+        self._summary: Optional[BatchPreloadSummary] = None
+        self._lock = threading.RLock()
+
+    def futures_for_files(self, file_ids: Iterable[str]) -> List[Future]:
+        """
+        获取指定文件的加载任务
+
+        Args:
+            file_ids: 文件ID列表
+
+        Returns:
+            加载任务列表（不在本次预加载计划中的文件没有对应任务）
+        """
+        file_ids = set(file_ids)
+        return [
+            future
+            for future, batch_info in self._future_to_batch.items()
+            if batch_info.file_id in file_ids
+        ]
+
+    def wait_for_files(self, file_ids: Iterable[str]):
+        """
+        等待指定文件的加载任务完成，并将结果写入全局上下文
+
+        Args:
+            file_ids: 文件ID列表
+        """
+        for future in self.futures_for_files(file_ids):
+            self._collect(future)
+
+    def wait_for_priority(self, priority: int):
+        """
+        等待优先级不低于指定值的文件加载完成，并将结果写入全局上下文
+
+        Args:
+            priority: 最低优先级
+        """
+        self.wait_for_files(
+            batch_info.file_id
+            for batch_info in self._future_to_batch.values()
+            if batch_info.priority >= priority
+        )
+
+    def wait(self) -> BatchPreloadSummary:
+        """
+        等待所有加载任务完成
+
+        Returns:
+            批量预加载摘要
+        """
+        with self._lock:
+            if self._summary is not None:
+                return self._summary
+
+            # 收集结果
+            for future in as_completed(self._future_to_batch):
+                self._collect(future)
+            self._executor.shutdown()
+
+            # 生成摘要
+            total_time = (time.time() - self._start_time) * 1000
+            summary = self.preloader._create_summary(
+                self._results, total_time, self._io_reduction, self._bytes_read
+            )
+
+            # 记录批量预加载统计（分开计算，避免与常规Excel IO混淆）
+            self.preloader.analyzer.onBatchPreloadComplete(
+                total_files=self._total_files,
+                total_sheets=summary.total_sheets,
+                successful_sheets=summary.successful_sheets,
+                failed_sheets=summary.failed_sheets,
+                total_time_ms=summary.total_time_ms,
+                total_rows=summary.total_rows,
+                total_io_reduction=self._io_reduction
+            )
+
+            self._summary = summary
+            return summary
+
+    def _collect(self, future: Future):
+        """收集一个文件的加载结果（每个任务只收集一次）"""
+        # 在锁外等待任务完成，避免等待一个文件时阻塞其他已完成文件的收集
+        wait([future])
+        with self._lock:
+            if future in self._collected:
+                return
+            self._collected.add(future)
+            batch_info = self._future_to_batch[future]
+
+            try:
+                if self._use_processes:
+                    file_results, packed_frames, file_bytes = future.result()
+                    for result, packed in zip(file_results, packed_frames):
+                        if packed is not None:
+                            result.dataframe = _unpack_dataframe(*packed)
+                else:
+                    file_results, file_bytes = future.result()
+                self._bytes_read += file_bytes
+
+                for result in file_results:
+                    self._results.append(result)
+
+                    # 如果成功，添加到缓存
+                    if result.success and result.dataframe is not None:
+                        predicate = _sheet_predicate(batch_info, result.sheet_name)
+                        cache_key = dataframe_cache_key(
+                            batch_info.file_id, result.sheet_name, predicate
+                        )
+                        self.global_context.loaded_dataframes[cache_key] = result.dataframe
+                        if self._memory_cache is not None:
+                            self._memory_cache.put(
+                                batch_info.file_path,
+                                result.sheet_name,
+                                batch_info.sheet_header_rows.get(result.sheet_name, 0),
+                                self._fingerprints.get(batch_info.file_id),
+                                result.dataframe,
+                                batch_info.sheet_columns.get(result.sheet_name),
+                                predicate,
+                            )
+
+            except Exception as e:
+                # 处理意外错误
+                for sheet_name in batch_info.required_sheets:
+                    self._results.append(
+                        PreloadResult(
+                            file_id=batch_info.file_id,
+                            sheet_name=sheet_name,
+                            success=False,
+                            error=f"Unexpected error: {str(e)}",
+                        )
+                    )
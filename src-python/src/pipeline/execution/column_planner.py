@@ -0,0 +1,150 @@
+"""
+列需求规划器
+在执行前分析流程节点，计算每个 (文件, Sheet) 实际用到的列，
+读取Excel时只解析和清洗这些列（列裁剪下推）
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from ..models import BaseNode, NodeType
+from .path_analyzer import ExecutionBranch
+
+# (文件ID, Sheet名)；Sheet名为None表示该文件的任意Sheet（按索引值或列匹配选择Sheet时）
+SheetKey = Tuple[str, Optional[str]]
+
+
+@dataclass
+class ColumnRequirements:
+    """列需求规划结果：None表示需要所有列"""
+
+    sheet_columns: Dict[SheetKey, Optional[FrozenSet[str]]] = field(default_factory=dict)
+
+    def add(self, file_id: str, sheet_name: Optional[str], columns: Optional[Iterable[str]]):
+        """
+        合并一个节点对Sheet的列需求
+
+        Args:
+            file_id: 文件ID
+            sheet_name: Sheet名，None表示该文件的任意Sheet
+            columns: 需要的列，None表示需要所有列
+        """
+        key = (file_id, sheet_name)
+        if columns is None:
+            self.sheet_columns[key] = None
+            return
+        if key in self.sheet_columns and self.sheet_columns[key] is None:
+            return
+        self.sheet_columns[key] = self.sheet_columns.get(key, frozenset()) | frozenset(
+            columns
+        )
+
+    def columns_for(self, file_id: str, sheet_name: str) -> Optional[FrozenSet[str]]:
+        """
+        获取读取某个Sheet时需要的列
+
+        Args:
+            file_id: 文件ID
+            sheet_name: Sheet名称
+
+        Returns:
+            需要的列集合；没有规划过或需要所有列时返回None
+        """
+        keys = [(file_id, sheet_name), (file_id, None)]
+        planned = [self.sheet_columns[key] for key in keys if key in self.sheet_columns]
+        if not planned or any(columns is None for columns in planned):
+            return None
+        return frozenset().union(*planned)
+
+
+class ColumnPlanner:
+    """列需求规划器 - 合并分支中所有节点引用的列"""
+
+    def plan(
+        self,
+        execution_branches: Dict[str, ExecutionBranch],
+        node_map: Dict[str, BaseNode],
+        target_node_id: str,
+    ) -> ColumnRequirements:
+        """
+        计算每个 (文件, Sheet) 需要读取的列
+
+        只有目标节点是输出节点时才裁剪：其他节点的执行结果会把中间DataFrame原样返回给调用方。
+        没有聚合节点的分支会把整张表写入输出，读取的Sheet需要所有列
+
+        Args:
+            execution_branches: 执行分支
+            node_map: 节点映射
+            target_node_id: 目标节点ID
+
+        Returns:
+            列需求规划结果
+        """
+        requirements = ColumnRequirements()
+        target_node = node_map.get(target_node_id)
+        if target_node is None or target_node.type != NodeType.OUTPUT:
+            return requirements
+
+        for branch in execution_branches.values():
+            nodes = [
+                node_map[node_id]
+                for node_id in branch.execution_nodes
+                if node_id in node_map
+            ]
+            aggregates = any(node.type == NodeType.AGGREGATOR for node in nodes)
+            branch_columns = self._referenced_columns(nodes) if aggregates else None
+
+            for node in nodes:
+                data = node.data
+                if node.type == NodeType.INDEX_SOURCE:
+                    # 索引源只读取索引列，与同一Sheet上的其他需求合并
+                    if data.get("byColumn", True) and data.get("sourceFileID"):
+                        requirements.add(
+                            data["sourceFileID"],
+                            data.get("sheetName"),
+                            [data["columnName"]] if data.get("columnName") else [],
+                        )
+                elif node.type == NodeType.SHEET_SELECTOR and data.get("targetFileID"):
+                    sheet_name = (
+                        data.get("manualSheetName")
+                        if data.get("mode") == "manual"
+                        else None
+                    )
+                    requirements.add(data["targetFileID"], sheet_name, branch_columns)
+
+        return requirements
+
+    @staticmethod
+    def _referenced_columns(nodes: Iterable[BaseNode]) -> FrozenSet[str]:
+        """
+        收集节点配置中引用的列名
+
+        Args:
+            nodes: 分支中的节点
+
+        Returns:
+            列名集合
+        """
+        columns = set()
+        for node in nodes:
+            data = node.data
+            if node.type == NodeType.SHEET_SELECTOR:
+                names = [data.get("matchColumn")] + [
+                    condition.get("column")
+                    for condition in data.get("pushedFilters") or []
+                    if isinstance(condition, dict)
+                ]
+            elif node.type == NodeType.ROW_FILTER:
+                names = [
+                    condition.get("column")
+                    for condition in data.get("conditions", [])
+                    if isinstance(condition, dict)
+                ]
+            elif node.type == NodeType.ROW_LOOKUP:
+                names = [data.get("matchColumn"), data.get("lookupColumn")]
+            elif node.type == NodeType.AGGREGATOR:
+                names = [data.get("statColumn")]
+            else:
+                names = []
+            columns.update(name for name in names if isinstance(name, str) and name)
+        return frozenset(columns)
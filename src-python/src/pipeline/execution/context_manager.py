@@ -6,6 +6,7 @@
 
 from typing import Dict, List
 import copy
+import threading
 
 from ..models import (
     GlobalContext, PathContext, BranchContext, FileInfo, IndexValue,
@@ -19,6 +20,8 @@ class ContextManager:
     def __init__(self):
         self.global_context: GlobalContext = None
         self.active_branch_contexts: Dict[str, BranchContext] = {}
+        # 分支可能并发执行，所有对active_branch_contexts的访问都需要持有此锁
+        self._lock = threading.RLock()
     
     def create_global_context(
         self,
@@ -74,21 +77,22 @@ class ContextManager:
         Returns:
             分支上下文
         """
-        if branch_id in self.active_branch_contexts:
-            # 如果分支上下文已经存在，直接返回
-            return self.active_branch_contexts[branch_id]
-        
-        branch_context = BranchContext(
-            branch_id=branch_id,
-            index_source_node_id=index_source_node_id,
-            aggregation_results={},
-            branch_metadata={}
-        )
-        
-        # 保存到活跃分支上下文中
-        self.active_branch_contexts[branch_id] = branch_context
-        
-        return branch_context
+        with self._lock:
+            if branch_id in self.active_branch_contexts:
+                # 如果分支上下文已经存在，直接返回
+                return self.active_branch_contexts[branch_id]
+            
+            branch_context = BranchContext(
+                branch_id=branch_id,
+                index_source_node_id=index_source_node_id,
+                aggregation_results={},
+                branch_metadata={}
+            )
+            
+            # 保存到活跃分支上下文中
+            self.active_branch_contexts[branch_id] = branch_context
+            
+            return branch_context
     
     def get_branch_context(self, branch_id: str) -> BranchContext:
         """
@@ -103,10 +107,11 @@ class ContextManager:
         Raises:
             ValueError: 如果分支上下文不存在
         """
-        if branch_id not in self.active_branch_contexts:
-            raise ValueError(f"Branch context '{branch_id}' not found")
-        
-        return self.active_branch_contexts[branch_id]
+        with self._lock:
+            if branch_id not in self.active_branch_contexts:
+                raise ValueError(f"Branch context '{branch_id}' not found")
+            
+            return self.active_branch_contexts[branch_id]
     
     def get_or_create_branch_context(self, branch_id: str, index_source_node_id: str = None) -> BranchContext:
         """
@@ -119,12 +124,13 @@ class ContextManager:
         Returns:
             分支上下文
         """
-        if branch_id in self.active_branch_contexts:
-            return self.active_branch_contexts[branch_id]
-        else:
-            if index_source_node_id is None:
-                raise ValueError(f"index_source_node_id is required when creating new branch context for {branch_id}")
-            return self.create_branch_context(branch_id, index_source_node_id)
+        with self._lock:
+            if branch_id in self.active_branch_contexts:
+                return self.active_branch_contexts[branch_id]
+            else:
+                if index_source_node_id is None:
+                    raise ValueError(f"index_source_node_id is required when creating new branch context for {branch_id}")
+                return self.create_branch_context(branch_id, index_source_node_id)
     
     def merge_branch_contexts(
         self, 
@@ -142,10 +148,11 @@ class ContextManager:
         merged_results = {}
         
         for branch_id in branch_ids:
-            if branch_id not in self.active_branch_contexts:
+            with self._lock:
+                branch_context = self.active_branch_contexts.get(branch_id)
+            if branch_context is None:
                 continue
             
-            branch_context = self.active_branch_contexts[branch_id]
             branch_final_results = branch_context.get_final_results()
             
             # 合并结果
@@ -177,29 +184,30 @@ class ContextManager:
         Returns:
             是否一致
         """
-        if not branch_ids:
-            return True
-        
-        # 获取第一个分支的索引值集合作为基准
-        first_branch_id = branch_ids[0]
-        if first_branch_id not in self.active_branch_contexts:
-            return False
-        
-        first_branch = self.active_branch_contexts[first_branch_id]
-        expected_indices = set(first_branch.aggregation_results.keys())
-        
-        # 检查其他分支是否有相同的索引值集合
-        for branch_id in branch_ids[1:]:
-            if branch_id not in self.active_branch_contexts:
+        with self._lock:
+            if not branch_ids:
+                return True
+            
+            # 获取第一个分支的索引值集合作为基准
+            first_branch_id = branch_ids[0]
+            if first_branch_id not in self.active_branch_contexts:
                 return False
             
-            branch_context = self.active_branch_contexts[branch_id]
-            branch_indices = set(branch_context.aggregation_results.keys())
+            first_branch = self.active_branch_contexts[first_branch_id]
+            expected_indices = set(first_branch.aggregation_results.keys())
             
-            if branch_indices != expected_indices:
-                return False
-        
-        return True
+            # 检查其他分支是否有相同的索引值集合
+            for branch_id in branch_ids[1:]:
+                if branch_id not in self.active_branch_contexts:
+                    return False
+                
+                branch_context = self.active_branch_contexts[branch_id]
+                branch_indices = set(branch_context.aggregation_results.keys())
+                
+                if branch_indices != expected_indices:
+                    return False
+            
+            return True
     
     def cleanup_branch_contexts(self, branch_ids: List[str] = None):
         """
@@ -208,16 +216,18 @@ class ContextManager:
         Args:
             branch_ids: 要清理的分支ID列表，如果为None则清理所有
         """
-        if branch_ids is None:
-            branch_ids = list(self.active_branch_contexts.keys())
-        
-        for branch_id in branch_ids:
-            if branch_id in self.active_branch_contexts:
-                del self.active_branch_contexts[branch_id]
+        with self._lock:
+            if branch_ids is None:
+                branch_ids = list(self.active_branch_contexts.keys())
+            
+            for branch_id in branch_ids:
+                if branch_id in self.active_branch_contexts:
+                    del self.active_branch_contexts[branch_id]
     
     def get_active_branch_count(self) -> int:
         """获取活跃分支上下文数量"""
-        return len(self.active_branch_contexts)
+        with self._lock:
+            return len(self.active_branch_contexts)
     
     def copy_path_context(self, source_context: PathContext) -> PathContext:
         """
@@ -255,27 +265,28 @@ class ContextManager:
         Returns:
             摘要信息字典
         """
-        summary = {
-            "global_context_exists": self.global_context is not None,
-            "active_branch_count": len(self.active_branch_contexts),
-            "active_branch_ids": list(self.active_branch_contexts.keys())
-        }
+        with self._lock:
+            summary = {
+                "global_context_exists": self.global_context is not None,
+                "active_branch_count": len(self.active_branch_contexts),
+                "active_branch_ids": list(self.active_branch_contexts.keys())
+            }
         
-        if self.global_context:
-            summary.update({
-                "execution_mode": self.global_context.execution_mode.value,
-                "loaded_files_count": len(self.global_context.files),
-                "cached_dataframes_count": len(self.global_context.loaded_dataframes)
-            })
+            if self.global_context:
+                summary.update({
+                    "execution_mode": self.global_context.execution_mode.value,
+                    "loaded_files_count": len(self.global_context.files),
+                    "cached_dataframes_count": len(self.global_context.loaded_dataframes)
+                })
         
-        # 添加分支上下文的详细信息
-        branch_details = {}
-        for branch_id, branch_context in self.active_branch_contexts.items():
-            branch_details[branch_id] = {
-                "aggregation_results_count": len(branch_context.aggregation_results),
-                "processed_indices": list(branch_context.aggregation_results.keys())
-            }
+            # 添加分支上下文的详细信息
+            branch_details = {}
+            for branch_id, branch_context in self.active_branch_contexts.items():
+                branch_details[branch_id] = {
+                    "aggregation_results_count": len(branch_context.aggregation_results),
+                    "processed_indices": list(branch_context.aggregation_results.keys())
+                }
         
-        summary["branch_details"] = branch_details
+            summary["branch_details"] = branch_details
         
-        return summary 
\ No newline at end of file
+            return summary 
\ No newline at end of file
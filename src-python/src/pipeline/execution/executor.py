@@ -5,7 +5,8 @@
 """
 
 import time
-from typing import Dict, List
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 import pandas as pd
 
 from pipeline.models import (
@@ -37,10 +38,15 @@ from pipeline.processors import (
     SheetSelectorProcessor,
 )
 
-from .batch_preloader import BatchPreloader
+from .batch_preloader import BatchPreloader, PreloadHandle
+from .column_planner import ColumnPlanner
 from .context_manager import ContextManager
-from .file_analyzer import FileAnalyzer
+from .file_analyzer import INDEX_SOURCE_PRIORITY, FileAnalyzer
+from .invariance_analyzer import InvarianceAnalyzer
+from .parallel_executor import ParallelBranchExecutor
 from .path_analyzer import ExecutionBranch, MultiInputNodeInfo, PathAnalyzer
+from .predicate_pushdown import PredicatePushdown
+from .vectorized_executor import VectorizedBranchExecutor
 
 
 class PipelineExecutor:
@@ -50,6 +56,8 @@ class PipelineExecutor:
         self.path_analyzer = PathAnalyzer()
         self.context_manager = ContextManager()
         self.file_analyzer = FileAnalyzer()
+        self.column_planner = ColumnPlanner()
+        self.predicate_pushdown = PredicatePushdown()
         self.batch_preloader = BatchPreloader()
 
         # 用于特殊节点的处理器
@@ -65,6 +73,13 @@ class PipelineExecutor:
             NodeType.OUTPUT: self.output_processor,
         }
 
+        self.invariance_analyzer = InvarianceAnalyzer(
+            self.processors, self.context_manager
+        )
+        self.vectorized_executor = VectorizedBranchExecutor(
+            self.processors, self.context_manager
+        )
+
     def execute_pipeline(
         self, request: ExecutePipelineRequest
     ) -> PipelineExecutionResult:
@@ -78,6 +93,15 @@ class PipelineExecutor:
             Pipeline执行结果
         """
         start_time = time.time()
+        preload_handles = []
+        parallel_executor = (
+            ParallelBranchExecutor(
+                request.max_workers,
+                wait_for_preload=lambda: self._wait_batch_preload(preload_handles),
+            )
+            if request.max_workers > 1
+            else None
+        )
 
         try:
             # 1. 创建全局上下文
@@ -95,11 +119,60 @@ class PipelineExecutor:
                 request.target_node_id,
             )
 
-            # 4. 批量预加载优化：分析并预加载所有需要的Excel文件
-            self._batch_preload_files(
-                execution_branches, request.workspace_config, global_context
+            # 列裁剪：读取Excel前规划每个sheet需要的列，预加载和按需加载都只读取这些列
+            if request.prune_columns:
+                global_context.column_requirements = self.column_planner.plan(
+                    execution_branches, node_map, request.target_node_id
+                )
+
+            # 延迟物化：行过滤和行查找只输出行选择向量，由输出节点物化；
+            # 其他目标节点的结果会把中间DataFrame返回给调用方，保持物化
+            target_node = node_map.get(request.target_node_id)
+            global_context.late_materialization = (
+                request.late_materialization
+                and target_node is not None
+                and target_node.type == NodeType.OUTPUT
             )
 
+            # 谓词下推：紧跟manual sheet选择的行过滤改在加载阶段执行，改写后的节点映射用于后续执行
+            preload_filters = {}
+            if request.pushdown_filters:
+                node_map, preload_filters = self.predicate_pushdown.rewrite(
+                    execution_branches,
+                    node_map,
+                    request.workspace_config.flow_edges,
+                    request.target_node_id,
+                )
+
+            # 4. 批量预加载优化：先提交不依赖索引值的Excel文件（索引源的sheet优先），
+            #    只等待索引源需要的文件，其余文件在求索引值期间继续加载
+            preload_handle = self._submit_batch_preload(
+                execution_branches,
+                request.workspace_config,
+                global_context,
+                use_processes=request.process_preload,
+                preload_filters=preload_filters,
+            )
+            if preload_handle is not None:
+                preload_handles.append(preload_handle)
+                preload_handle.wait_for_priority(INDEX_SOURCE_PRIORITY)
+
+            # 5. 求出每个分支的索引值，auto_by_index模式只预加载需要的sheet
+            branch_index_values = {
+                branch_id: self._get_branch_index_values(branch, node_map, global_context)
+                for branch_id, branch in execution_branches.items()
+            }
+            preload_handle = self._submit_batch_preload(
+                execution_branches,
+                request.workspace_config,
+                global_context,
+                use_processes=request.process_preload,
+                branch_index_values=branch_index_values,
+                preload_filters=preload_filters,
+            )
+            if preload_handle is not None:
+                preload_handles.append(preload_handle)
+
             if not execution_branches:
                 return PipelineExecutionResult(
                     success=False,
@@ -112,35 +185,69 @@ class PipelineExecutor:
                     output_data=None,
                 )
 
-            # 5. 为每个分支独立执行（避免笛卡尔积）
+            # 6. 为每个分支独立执行（避免笛卡尔积）
+            #    数据流调度：分支依赖的文件加载完成即可执行，不必等待所有文件
             all_branch_results = []
             all_index_results = []
 
-            for branch_id, branch in execution_branches.items():
-                # 4.1 获取该分支的索引值（仅限该分支）
-                index_values = self._get_branch_index_values(
-                    branch, node_map, global_context
-                )
-
-                if not index_values:
-                    continue  # 跳过没有索引值的分支
-
-                # 4.2 为每个索引值执行该分支（不是所有分支）
-                branch_index_results = []
-                for index_value in index_values:
-                    index_result = self._execute_single_branch_for_index(
-                        branch, index_value, node_map, global_context
+            branch_items = list(execution_branches.items())
+            branch_file_ids = {
+                branch_id: self._get_branch_file_ids(branch, node_map)
+                for branch_id, branch in branch_items
+            }
+            branch_workers = min(request.max_parallel_branches, len(branch_items))
+            if branch_workers > 1:
+                # 分支之间只共享只读的预加载数据，可以并发执行
+                with ThreadPoolExecutor(max_workers=branch_workers) as pool:
+                    futures = [
+                        pool.submit(
+                            self._execute_branch_when_ready,
+                            branch,
+                            branch_index_values[branch_id],
+                            branch_file_ids[branch_id],
+                            preload_handles,
+                            node_map,
+                            global_context,
+                            request,
+                            parallel_executor,
+                        )
+                        for branch_id, branch in branch_items
+                    ]
+                    branch_outcomes = [future.result() for future in futures]
+            else:
+                branch_outcomes = [None] * len(branch_items)
+                for position in self._iter_ready_branches(
+                    [branch_file_ids[branch_id] for branch_id, _ in branch_items],
+                    preload_handles,
+                ):
+                    branch_id, branch = branch_items[position]
+                    branch_outcomes[position] = self._execute_branch(
+                        branch,
+                        branch_index_values[branch_id],
+                        node_map,
+                        global_context,
+                        request,
+                        parallel_executor,
                     )
-                    branch_index_results.append(index_result)
-                    all_index_results.append(index_result)
 
-                # 4.3 创建分支执行结果
-                branch_result = self._create_branch_execution_result(
-                    branch_id, branch_index_results
-                )
+            # 按分支顺序汇总，保证结果与串行执行一致
+            for outcome in branch_outcomes:
+                if outcome is None:
+                    continue  # 跳过没有索引值的分支
+                branch_result, branch_index_results = outcome
                 all_branch_results.append(branch_result)
+                all_index_results.extend(branch_index_results)
+
+            # 列裁剪假定聚合分支只输出聚合结果；聚合全部失败时输出会回退到分支的DataFrame，
+            # 裁剪后的列不完整，改为读取所有列重新执行
+            if global_context.column_requirements is not None and self._has_dataframe_fallback(
+                execution_branches, node_map
+            ):
+                self._wait_batch_preload(preload_handles)
+                self.context_manager.cleanup_branch_contexts()
+                return self.execute_pipeline(request.copy(update={"prune_columns": False}))
 
-            # 5. 执行输出节点
+            # 7. 执行输出节点
             output_data = self._execute_output_node(
                 request.target_node_id,
                 node_map,
@@ -149,7 +256,7 @@ class PipelineExecutor:
                 global_context,
             )
 
-            # 6. 计算执行摘要
+            # 8. 计算执行摘要
             total_time = (time.time() - start_time) * 1000
             execution_summary = self._create_execution_summary(
                 all_index_results,
@@ -158,7 +265,7 @@ class PipelineExecutor:
                 request.execution_mode,
             )
 
-            # 7. 清理资源
+            # 9. 清理资源
             self.context_manager.cleanup_branch_contexts()
 
             return PipelineExecutionResult(
@@ -185,6 +292,179 @@ class PipelineExecutor:
                 output_data=None,
             )
 
+        finally:
+            # 提前失败时也要等待已提交的预加载任务结束，释放工作线程/进程
+            self._wait_batch_preload(preload_handles)
+            if parallel_executor is not None:
+                parallel_executor.shutdown()
+
+    def _get_branch_file_ids(
+        self, branch: ExecutionBranch, node_map: Dict[str, BaseNode]
+    ) -> Set[str]:
+        """
+        获取分支中的节点需要读取的文件ID
+
+        Args:
+            branch: 执行分支
+            node_map: 节点映射
+
+        Returns:
+            文件ID集合
+        """
+        file_ids = set()
+        for node_id in branch.execution_nodes:
+            node = node_map.get(node_id)
+            if node is None:
+                continue
+            if node.type == NodeType.INDEX_SOURCE and node.data.get("sourceFileID"):
+                file_ids.add(node.data["sourceFileID"])
+            elif node.type == NodeType.SHEET_SELECTOR and node.data.get("targetFileID"):
+                file_ids.add(node.data["targetFileID"])
+        return file_ids
+
+    def _iter_ready_branches(
+        self, branch_file_ids: List[Set[str]], preload_handles: List[PreloadHandle]
+    ) -> Iterator[int]:
+        """
+        按文件加载完成的顺序依次产出可以执行的分支
+
+        Args:
+            branch_file_ids: 每个分支依赖的文件ID（按分支顺序）
+            preload_handles: 预加载句柄列表
+
+        Returns:
+            分支位置的迭代器，产出前已将该分支依赖的文件写入全局上下文
+        """
+        pending = list(range(len(branch_file_ids)))
+        while pending:
+            pending_futures = set()
+            ready_position = None
+            for position in pending:
+                futures = [
+                    future
+                    for preload_handle in preload_handles
+                    for future in preload_handle.futures_for_files(branch_file_ids[position])
+                ]
+                unfinished = [future for future in futures if not future.done()]
+                if not unfinished:
+                    ready_position = position
+                    break
+                pending_futures.update(unfinished)
+
+            if ready_position is None:
+                # 没有可执行的分支，等待任意一个文件加载完成
+                wait(pending_futures, return_when=FIRST_COMPLETED)
+                continue
+
+            pending.remove(ready_position)
+            for preload_handle in preload_handles:
+                preload_handle.wait_for_files(branch_file_ids[ready_position])
+            yield ready_position
+
+    def _execute_branch_when_ready(
+        self,
+        branch: ExecutionBranch,
+        index_values: List[IndexValue],
+        file_ids: Set[str],
+        preload_handles: List[PreloadHandle],
+        node_map: Dict[str, BaseNode],
+        global_context,
+        request: ExecutePipelineRequest,
+        parallel_executor: Optional[ParallelBranchExecutor],
+    ) -> Optional[Tuple[BranchExecutionResult, List[IndexExecutionResult]]]:
+        """
+        等待分支依赖的文件加载完成后执行分支
+
+        Args:
+            branch: 执行分支
+            index_values: 该分支的索引值
+            file_ids: 分支依赖的文件ID
+            preload_handles: 预加载句柄列表
+            node_map: 节点映射
+            global_context: 全局上下文
+            request: Pipeline执行请求
+            parallel_executor: 多进程执行器（未启用时为None）
+
+        Returns:
+            (分支执行结果, 索引执行结果列表)；分支没有索引值时返回None
+        """
+        for preload_handle in preload_handles:
+            preload_handle.wait_for_files(file_ids)
+        return self._execute_branch(
+            branch, index_values, node_map, global_context, request, parallel_executor
+        )
+
+    def _execute_branch(
+        self,
+        branch: ExecutionBranch,
+        index_values: List[IndexValue],
+        node_map: Dict[str, BaseNode],
+        global_context,
+        request: ExecutePipelineRequest,
+        parallel_executor: Optional[ParallelBranchExecutor],
+    ) -> Optional[Tuple[BranchExecutionResult, List[IndexExecutionResult]]]:
+        """
+        执行单个分支的所有索引值
+
+        Args:
+            branch: 执行分支
+            index_values: 该分支的索引值（仅限该分支）
+            node_map: 节点映射
+            global_context: 全局上下文
+            request: Pipeline执行请求
+            parallel_executor: 多进程执行器（未启用时为None）
+
+        Returns:
+            (分支执行结果, 索引执行结果列表)；分支没有索引值时返回None
+        """
+        if not index_values:
+            return None
+
+        # 记录分支的全部索引值，供需要批量处理所有索引值的节点使用
+        self.context_manager.get_or_create_branch_context(
+            branch.branch_id, branch.index_source_id
+        ).branch_metadata["index_values"] = index_values
+
+        # 为每个索引值执行该分支（不是所有分支）
+        branch_index_results = None
+        if request.vectorized_execution and self.vectorized_executor.can_vectorize(
+            branch, node_map
+        ):
+            # 可向量化的分支：一次分组代替逐索引查找
+            branch_index_results = self.vectorized_executor.execute_branch(
+                branch, index_values, node_map, global_context
+            )
+
+        if (
+            branch_index_results is None
+            and parallel_executor is not None
+            and len(index_values) > 1
+        ):
+            # 多进程并行执行索引值分片，按顺序合并回分支上下文
+            branch_index_results = parallel_executor.execute_branch(
+                branch,
+                index_values,
+                node_map,
+                global_context,
+                self.context_manager.get_or_create_branch_context(
+                    branch.branch_id, branch.index_source_id
+                ),
+            )
+
+        if branch_index_results is None:
+            branch_index_results = [
+                self._execute_single_branch_for_index(
+                    branch, index_value, node_map, global_context
+                )
+                for index_value in index_values
+            ]
+
+        # 创建分支执行结果
+        branch_result = self._create_branch_execution_result(
+            branch.branch_id, branch_index_results
+        )
+        return branch_result, branch_index_results
+
     def _get_branch_index_values(
         self, branch: ExecutionBranch, node_map: Dict[str, BaseNode], global_context
     ) -> List[IndexValue]:
@@ -251,6 +531,11 @@ class PipelineExecutor:
                 branch.branch_id, branch.index_source_id
             )
 
+            # 与索引值无关的节点每个分支只执行一次
+            invariant_outputs = self._get_invariant_outputs(
+                branch, index_value, node_map, global_context, branch_context
+            )
+
             # 执行该分支的所有节点（按顺序）
             for node_id in branch.execution_nodes:
                 if node_id not in node_map:
@@ -266,16 +551,22 @@ class PipelineExecutor:
                 try:
                     start_time = time.time()
 
-                    # 根据节点类型准备输入
-                    node_input = self._prepare_node_input(
-                        node, index_value, path_context
-                    )
-
-                    # 执行节点处理器
-                    processor = self.processors[node.type]
-                    output = processor.process(
-                        node, node_input, global_context, path_context, branch_context
-                    )
+                    if node_id in invariant_outputs:
+                        # 复用分支级缓存的输出，只替换索引值
+                        output = invariant_outputs[node_id].copy(
+                            update={"index_value": index_value}
+                        )
+                    else:
+                        # 根据节点类型准备输入
+                        node_input = self._prepare_node_input(
+                            node, index_value, path_context
+                        )
+
+                        # 执行节点处理器
+                        processor = self.processors[node.type]
+                        output = processor.process(
+                            node, node_input, global_context, path_context, branch_context
+                        )
 
                     execution_time = (time.time() - start_time) * 1000
 
@@ -339,6 +630,38 @@ class PipelineExecutor:
                 total_execution_time_ms=total_time,
             )
 
+    def _get_invariant_outputs(
+        self,
+        branch: ExecutionBranch,
+        index_value: IndexValue,
+        node_map: Dict[str, BaseNode],
+        global_context,
+        branch_context: BranchContext,
+    ) -> Dict[str, object]:
+        """
+        获取分支中与索引值无关的节点输出，首次调用时执行并缓存到分支上下文
+
+        Args:
+            branch: 执行分支
+            index_value: 当前索引值（仅用于首次执行时构建输入）
+            node_map: 节点映射
+            global_context: 全局上下文
+            branch_context: 分支上下文
+
+        Returns:
+            节点ID到节点输出的映射
+        """
+        if "invariant_outputs" not in branch_context.branch_metadata:
+            prefix = self.invariance_analyzer.find_invariant_prefix(branch, node_map)
+            prefix_outputs = self.invariance_analyzer.evaluate_prefix(
+                prefix, index_value, global_context
+            )
+            branch_context.branch_metadata["invariant_outputs"] = {
+                node.id: output for node, output in prefix_outputs
+            }
+
+        return branch_context.branch_metadata["invariant_outputs"]
+
     def _create_branch_execution_result(
         self, branch_id: str, index_results: List[IndexExecutionResult]
     ) -> BranchExecutionResult:
@@ -449,19 +772,29 @@ class PipelineExecutor:
 
         return result
 
-    def _batch_preload_files(
+    def _submit_batch_preload(
         self,
         execution_branches: Dict[str, ExecutionBranch],
         workspace_config,
         global_context,
-    ):
+        use_processes: bool = False,
+        branch_index_values: Optional[Dict[str, List[IndexValue]]] = None,
+        preload_filters: Optional[Dict[Tuple[str, str], List[Dict[str, Any]]]] = None,
+    ) -> Optional[PreloadHandle]:
         """
-        批量预加载所有需要的Excel文件
+        分析并提交批量预加载任务
 
         Args:
             execution_branches: 执行分支字典
             workspace_config: 工作区配置
             global_context: 全局上下文
+            use_processes: 是否在工作进程中解析文件
+            branch_index_values: 分支ID -> 索引值；为None时只预加载不依赖索引值的sheet，
+                否则只预加载auto_by_index模式需要的sheet
+            preload_filters: (文件ID, Sheet名) -> 加载后立即执行的行过滤条件
+
+        Returns:
+            预加载句柄，没有需要加载的文件或预加载失败时返回None
         """
         try:
             # 收集所有执行节点
@@ -472,37 +805,71 @@ class PipelineExecutor:
             # 去重
             unique_nodes = list(set(all_execution_nodes))
 
+            # 节点ID -> 所在分支的索引值（一个节点可能属于多个分支）
+            node_index_values = None
+            if branch_index_values is not None:
+                node_index_values = {}
+                for branch_id, branch in execution_branches.items():
+                    values = {str(value) for value in branch_index_values.get(branch_id, [])}
+                    for node_id in branch.execution_nodes:
+                        node_index_values.setdefault(node_id, set()).update(values)
+
             # 分析文件需求
             batch_infos = self.file_analyzer.analyze_file_requirements(
-                workspace_config, unique_nodes
+                workspace_config,
+                unique_nodes,
+                node_index_values,
+                index_dependent=branch_index_values is not None,
             )
 
             if not batch_infos:
                 # print("PERF: No files to preload")
-                return
-
-            # 执行批量预加载
-            preload_summary = self.batch_preloader.preload_files(
-                batch_infos, global_context
+                return None
+
+            column_requirements = global_context.column_requirements
+            if column_requirements is not None:
+                for batch_info in batch_infos:
+                    batch_info.sheet_columns = {
+                        sheet_name: column_requirements.columns_for(
+                            batch_info.file_id, sheet_name
+                        )
+                        for sheet_name in batch_info.required_sheets
+                    }
+
+            if preload_filters:
+                for batch_info in batch_infos:
+                    batch_info.sheet_filters = {
+                        sheet_name: preload_filters[(batch_info.file_id, sheet_name)]
+                        for sheet_name in batch_info.required_sheets
+                        if (batch_info.file_id, sheet_name) in preload_filters
+                    }
+
+            # 提交批量预加载
+            return self.batch_preloader.submit_files(
+                batch_infos, global_context, use_processes=use_processes
             )
 
-            # 记录预加载结果到性能分析器
-            from ..performance.analyzer import get_performance_analyzer
-
-            analyzer = get_performance_analyzer()
-
-            # 这里可以添加预加载相关的性能统计
-            # print(
-            #     f"PERF: Batch preload completed - {preload_summary.successful_sheets}/{preload_summary.total_sheets} sheets loaded"
-            # )
-
         except Exception as e:
             # print(
             #     f"PERF WARNING: Batch preload failed - {str(e)}, falling back to on-demand loading"
             # )
-            pass
+            return None
             # 预加载失败不应该影响主流程，继续执行
 
+    def _wait_batch_preload(self, preload_handles: List[PreloadHandle]):
+        """
+        等待所有批量预加载任务完成
+
+        Args:
+            preload_handles: 预加载句柄列表
+        """
+        for preload_handle in preload_handles:
+            try:
+                preload_handle.wait()
+            except Exception:
+                # 预加载失败不应该影响主流程，未加载的sheet会按需加载
+                pass
+
     def _create_execution_summary(
         self,
         index_results: List[IndexExecutionResult],
@@ -728,6 +1095,33 @@ class PipelineExecutor:
             # print(f"Warning: Failed to get last dataframe for branch {branch_id}: {e}")
             return None
 
+    def _has_dataframe_fallback(
+        self, execution_branches: Dict[str, ExecutionBranch], node_map: Dict[str, BaseNode]
+    ) -> bool:
+        """
+        是否有包含聚合节点的分支没有聚合结果，输出时会回退到按索引值组织的DataFrame
+
+        Args:
+            execution_branches: 执行分支字典
+            node_map: 节点映射
+
+        Returns:
+            存在这样的分支时返回True
+        """
+        for branch_id, branch in execution_branches.items():
+            if not any(
+                node_id in node_map and node_map[node_id].type == NodeType.AGGREGATOR
+                for node_id in branch.execution_nodes
+            ):
+                continue
+            try:
+                branch_context = self.context_manager.get_branch_context(branch_id)
+            except ValueError:
+                continue  # 没有索引值的分支
+            if not branch_context.get_final_results() and branch_context.get_index_dataframes():
+                return True
+        return False
+
     def _get_index_dataframes_for_branch(self, branch_id: str) -> Dict[IndexValue, pd.DataFrame]:
         """
         获取分支的按索引值组织的dataframe输出
@@ -4,11 +4,15 @@
 用于批量预加载优化，减少IO次数和上下文切换开销
 """
 
-from typing import List, Dict, Set, Tuple
-from dataclasses import dataclass
+from typing import Any, List, Dict, FrozenSet, Optional, Set, Tuple
+from dataclasses import dataclass, field
 
 from ..models import BaseNode, NodeType, WorkspaceConfig, FileInfo
 
+# 预加载优先级：索引源读取的sheet决定后续所有分支的执行，最先加载
+DEFAULT_PRIORITY = 0
+INDEX_SOURCE_PRIORITY = 10
+
 
 @dataclass
 class FileSheetRequirement:
@@ -19,6 +23,7 @@ class FileSheetRequirement:
     node_id: str
     node_type: NodeType
     header_row: int = 0
+    priority: int = DEFAULT_PRIORITY
 
 
 @dataclass
@@ -28,6 +33,11 @@ class FileBatchInfo:
     file_path: str
     required_sheets: List[str]
     sheet_header_rows: Dict[str, int]  # sheet_name -> header_row
+    priority: int = DEFAULT_PRIORITY  # 文件内所有需求的最高优先级
+    # sheet_name -> 需要读取的列（列裁剪），未列出或为None的sheet读取所有列
+    sheet_columns: Dict[str, Optional[FrozenSet[str]]] = field(default_factory=dict)
+    # sheet_name -> 下推到加载阶段的行过滤条件（加载后立即过滤，只保留过滤后的sheet）
+    sheet_filters: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
 
 
 class FileAnalyzer:
@@ -39,7 +49,9 @@ class FileAnalyzer:
     def analyze_file_requirements(
         self,
         workspace_config: WorkspaceConfig,
-        execution_nodes: List[str]
+        execution_nodes: List[str],
+        node_index_values: Optional[Dict[str, Set[str]]] = None,
+        index_dependent: Optional[bool] = None
     ) -> List[FileBatchInfo]:
         """
         分析执行过程中需要的所有文件和Sheet
@@ -47,6 +59,10 @@ class FileAnalyzer:
         Args:
             workspace_config: 工作区配置
             execution_nodes: 执行节点列表
+            node_index_values: 节点ID -> 所在分支的索引值（字符串形式），
+                已知时auto_by_index模式只加载与索引值同名的sheet
+            index_dependent: None表示分析所有需求；False只分析不依赖索引值的需求
+                （索引源和固定sheet）；True只分析依赖索引值才能确定sheet的需求
             
         Returns:
             文件批量加载信息列表
@@ -62,19 +78,87 @@ class FileAnalyzer:
                 continue
                 
             node = node_map[node_id]
+            if index_dependent is not None and self._depends_on_index(node) != index_dependent:
+                continue
             
-            # 只有SheetSelector节点会读取Excel文件
-            if node.type == NodeType.SHEET_SELECTOR:
-                reqs = self._analyze_sheet_selector_node(node, workspace_config)
+            # IndexSource和SheetSelector节点会读取Excel文件
+            if node.type == NodeType.INDEX_SOURCE:
+                requirements.extend(
+                    self._analyze_index_source_node(node, workspace_config)
+                )
+            elif node.type == NodeType.SHEET_SELECTOR:
+                index_values = (
+                    node_index_values.get(node_id) if node_index_values is not None else None
+                )
+                reqs = self._analyze_sheet_selector_node(
+                    node, workspace_config, index_values
+                )
                 requirements.extend(reqs)  # 现在返回的是列表
         
         # 按文件分组，生成批量加载信息
         return self._group_requirements_by_file(requirements)
     
+    @staticmethod
+    def _depends_on_index(node: BaseNode) -> bool:
+        """节点读取的sheet是否要等索引值求出后才能确定"""
+        return (
+            node.type == NodeType.SHEET_SELECTOR
+            and node.data.get("mode", "manual") == "auto_by_index"
+        )
+
+    def _analyze_index_source_node(
+        self,
+        node: BaseNode,
+        workspace_config: WorkspaceConfig
+    ) -> List[FileSheetRequirement]:
+        """
+        分析IndexSource节点的文件需求
+
+        Args:
+            node: IndexSource节点
+            workspace_config: 工作区配置
+
+        Returns:
+            文件+Sheet需求信息列表，按sheet名提取索引值时不读取文件，返回空列表
+        """
+        data = node.data
+        source_file_id = data.get("sourceFileID")
+        sheet_name = data.get("sheetName")
+
+        # 按sheet名提取索引值只使用sheet元数据
+        if not data.get("byColumn", True) or not source_file_id or not sheet_name:
+            return []
+
+        file_info = None
+        for file in workspace_config.files:
+            if file.id == source_file_id:
+                file_info = file
+                break
+
+        if not file_info:
+            return []
+
+        header_row = 0
+        for sheet_meta in file_info.sheet_metas:
+            if sheet_meta.get("sheet_name") == sheet_name:
+                header_row = sheet_meta.get("header_row", 0)
+                break
+
+        return [FileSheetRequirement(
+            file_id=source_file_id,
+            file_path=file_info.path,
+            sheet_name=sheet_name,
+            node_id=node.id,
+            node_type=node.type,
+            header_row=header_row,
+            priority=INDEX_SOURCE_PRIORITY
+        )]
+
     def _analyze_sheet_selector_node(
         self, 
         node: BaseNode, 
-        workspace_config: WorkspaceConfig
+        workspace_config: WorkspaceConfig,
+        index_values: Optional[Set[str]] = None
     ) -> List[FileSheetRequirement]:
         """
         分析SheetSelector节点的文件需求
@@ -82,6 +166,7 @@ class FileAnalyzer:
         Args:
             node: SheetSelector节点
             workspace_config: 工作区配置
+            index_values: 节点所在分支的索引值（字符串形式），未知时为None
             
         Returns:
             文件+Sheet需求信息列表，如果无法解析则返回空列表
@@ -128,24 +213,24 @@ class FileAnalyzer:
             ))
             
         elif mode == "auto_by_index":
-            # auto_by_index模式：预加载该文件的所有sheet
-            # 因为我们在预加载阶段还不知道具体的索引值，所以预加载所有可能的sheet
-            # print(f"PERF: auto_by_index mode detected for node {node.id}, will preload all sheets from file {target_file_id}")
-            # print(f"PERF: this may cause performance issue, remain to be optimized by reading necessary sheets!!!")
-            
+            # auto_by_index模式：sheet名等于索引值
+            # 索引值已知时只预加载索引值与sheet名的交集，否则预加载该文件的所有sheet
             for sheet_meta in file_info.sheet_metas:
                 sheet_name = sheet_meta.get("sheet_name")
-                if sheet_name:
-                    header_row = sheet_meta.get("header_row", 0)
-                    
-                    requirements.append(FileSheetRequirement(
-                        file_id=target_file_id,
-                        file_path=file_info.path,
-                        sheet_name=sheet_name,
-                        node_id=node.id,
-                        node_type=node.type,
-                        header_row=header_row
-                    ))
+                if not sheet_name:
+                    continue
+                if index_values is not None and sheet_name not in index_values:
+                    continue
+
+                header_row = sheet_meta.get("header_row", 0)
+                requirements.append(FileSheetRequirement(
+                    file_id=target_file_id,
+                    file_path=file_info.path,
+                    sheet_name=sheet_name,
+                    node_id=node.id,
+                    node_type=node.type,
+                    header_row=header_row
+                ))
         
         return requirements
     
@@ -189,7 +274,8 @@ class FileAnalyzer:
                 file_id=file_id,
                 file_path=file_requirements[0].file_path,  # 同一文件的路径相同
                 required_sheets=unique_sheets,
-                sheet_header_rows=sheet_header_rows
+                sheet_header_rows=sheet_header_rows,
+                priority=max(req.priority for req in file_requirements)
             )
             
             batch_infos.append(batch_info)
@@ -0,0 +1,113 @@
+"""
+索引不变子计划分析器
+识别分支中与索引值无关的节点前缀（manual模式的SheetSelector及其下游的RowFilter），
+这些节点对每个索引值产生相同的DataFrame，每个分支只需执行一次
+"""
+
+from typing import Dict, List, Tuple
+
+from ..models import (
+    BaseNode,
+    IndexValue,
+    NodeOutput,
+    NodeType,
+    RowFilterInput,
+    SheetSelectorInput,
+)
+from .context_manager import ContextManager
+from .path_analyzer import ExecutionBranch
+
+
+class InvarianceAnalyzer:
+    """索引不变子计划分析器"""
+
+    def __init__(self, processors: Dict[NodeType, object], context_manager: ContextManager):
+        self.processors = processors
+        self.context_manager = context_manager
+
+    def is_index_invariant(self, node: BaseNode) -> bool:
+        """
+        判断节点自身的计算是否与索引值无关
+
+        Args:
+            node: 节点配置
+
+        Returns:
+            是否与索引值无关（前提是其输入也与索引值无关）
+        """
+        if node.type == NodeType.SHEET_SELECTOR:
+            # 只有manual模式不依赖索引值选择sheet
+            return node.data.get("mode", "auto_by_index") == "manual"
+        if node.type == NodeType.ROW_FILTER:
+            # 过滤条件只包含常量，结果只取决于输入DataFrame
+            return True
+        return False
+
+    def find_invariant_prefix(
+        self, branch: ExecutionBranch, node_map: Dict[str, BaseNode]
+    ) -> List[BaseNode]:
+        """
+        找出分支执行序列中与索引值无关的最长前缀
+
+        Args:
+            branch: 执行分支
+            node_map: 节点映射
+
+        Returns:
+            不变前缀的节点列表（按执行顺序）
+        """
+        prefix = []
+        for node_id in branch.execution_nodes:
+            node = node_map.get(node_id)
+            if node is None:
+                continue
+            if node.type in (NodeType.INDEX_SOURCE, NodeType.OUTPUT):
+                continue
+            if not self.is_index_invariant(node):
+                break
+            prefix.append(node)
+
+        # 第一个数据节点必须是sheet选择器，否则前缀没有与索引无关的数据来源
+        if prefix and prefix[0].type != NodeType.SHEET_SELECTOR:
+            return []
+        return prefix
+
+    def evaluate_prefix(
+        self,
+        prefix: List[BaseNode],
+        index_value: IndexValue,
+        global_context,
+    ) -> List[Tuple[BaseNode, NodeOutput]]:
+        """
+        执行一次不变前缀，遇到失败的节点即停止
+
+        Args:
+            prefix: 不变前缀的节点列表
+            index_value: 用于构建输入的索引值（不影响结果）
+            global_context: 全局上下文
+
+        Returns:
+            成功执行的 (节点, 节点输出) 列表，长度小于前缀长度表示中途失败
+        """
+        path_context = self.context_manager.create_path_context(index_value)
+        outputs = []
+        current_df = None
+
+        for node in prefix:
+            if node.type == NodeType.SHEET_SELECTOR:
+                node_input = SheetSelectorInput(index_value=index_value)
+            else:
+                node_input = RowFilterInput(dataframe=current_df, index_value=index_value)
+
+            try:
+                output = self.processors[node.type].process(
+                    node, node_input, global_context, path_context
+                )
+            except Exception:
+                # 失败的节点留给逐索引执行，保持原有的错误记录
+                break
+
+            outputs.append((node, output))
+            current_df = output.dataframe
+
+        return outputs
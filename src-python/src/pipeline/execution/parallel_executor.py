@@ -0,0 +1,223 @@
+"""
+并行分支执行器
+将一个分支的索引值切分为连续分片，在多进程中并行执行，
+按分片顺序合并回分支上下文，保证结果与串行执行完全一致
+进程池在所有预加载完成后才创建，工作进程不会重新读取主进程已加载的sheet
+"""
+
+import math
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from ..models import (
+    BaseNode,
+    BranchContext,
+    ExecutionMode,
+    FileInfo,
+    GlobalContext,
+    IndexExecutionResult,
+    IndexValue,
+)
+from .path_analyzer import ExecutionBranch
+
+
+# 工作进程内的执行状态，由进程池初始化函数设置一次
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(
+    files: Dict[str, FileInfo],
+    loaded_dataframes: Dict[str, pd.DataFrame],
+    execution_mode: ExecutionMode,
+    column_requirements: Any = None,
+):
+    """
+    工作进程初始化：预加载的sheet只随初始化参数传输一次
+
+    Args:
+        files: 文件信息映射
+        loaded_dataframes: 主进程已预加载的DataFrame缓存
+        execution_mode: 执行模式
+        column_requirements: 列裁剪规划，保证工作进程按需读取的sheet与主进程一致
+
+    工作进程不启用延迟物化：分片结果要序列化回主进程，物化后的匹配行比整张源sheet小
+    """
+    from .executor import PipelineExecutor
+
+    _worker_state["executor"] = PipelineExecutor()
+    _worker_state["global_context"] = GlobalContext(
+        files=files,
+        loaded_dataframes=loaded_dataframes,
+        execution_mode=execution_mode,
+        column_requirements=column_requirements,
+    )
+
+
+def _execute_shard(
+    branch: ExecutionBranch,
+    index_values: List[IndexValue],
+    node_map: Dict[str, BaseNode],
+) -> Dict[str, Any]:
+    """
+    在工作进程中串行执行一个分片的索引值
+
+    Args:
+        branch: 执行分支
+        index_values: 分片内的索引值（保持原始顺序）
+        node_map: 节点映射
+
+    Returns:
+        分片的索引执行结果和分支上下文增量
+    """
+    executor = _worker_state["executor"]
+    global_context = _worker_state["global_context"]
+
+    try:
+        executor.context_manager.get_or_create_branch_context(
+            branch.branch_id, branch.index_source_id
+        ).branch_metadata["index_values"] = index_values
+        index_results = [
+            executor._execute_single_branch_for_index(
+                branch, index_value, node_map, global_context
+            )
+            for index_value in index_values
+        ]
+        branch_context = executor.context_manager.get_or_create_branch_context(
+            branch.branch_id, branch.index_source_id
+        )
+        return {
+            "index_results": index_results,
+            "aggregation_results": branch_context.aggregation_results,
+            "index_dataframes": branch_context.index_dataframes,
+            "last_non_aggregated_dataframe": branch_context.last_non_aggregated_dataframe,
+        }
+    finally:
+        # 工作进程会被复用，每个分片都从干净的分支上下文开始
+        executor.context_manager.cleanup_branch_contexts()
+
+
+class ParallelBranchExecutor:
+    """并行分支执行器 - 多进程执行同一分支的不同索引值"""
+
+    def __init__(
+        self, max_workers: int, wait_for_preload: Optional[Callable[[], None]] = None
+    ):
+        """
+        Args:
+            max_workers: 工作进程数
+            wait_for_preload: 创建进程池前调用，等待所有预加载完成
+                （分支按文件就绪执行，首个并行分支开始时其他文件可能还在加载）
+        """
+        self.max_workers = max_workers
+        self.wait_for_preload = wait_for_preload
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def execute_branch(
+        self,
+        branch: ExecutionBranch,
+        index_values: List[IndexValue],
+        node_map: Dict[str, BaseNode],
+        global_context: GlobalContext,
+        branch_context: BranchContext,
+    ) -> Optional[List[IndexExecutionResult]]:
+        """
+        并行执行分支的所有索引值
+
+        Args:
+            branch: 执行分支
+            index_values: 该分支的索引值列表
+            node_map: 节点映射
+            global_context: 全局上下文（首次调用时用于初始化工作进程）
+            branch_context: 主进程中的分支上下文，分片结果按顺序合并到这里
+
+        Returns:
+            按索引值顺序排列的执行结果；进程池不可用时返回None，由调用方回退到串行执行
+        """
+        try:
+            pool = self._get_pool(global_context)
+            futures = [
+                pool.submit(_execute_shard, branch, shard, node_map)
+                for shard in self._split_shards(index_values)
+            ]
+            shard_results = [future.result() for future in futures]
+        except Exception:
+            # 进程池损坏或结果无法序列化时，丢弃整个分支的并行结果
+            self.shutdown()
+            return None
+
+        index_results = []
+        # 按分片顺序合并，保证合并结果与串行执行顺序一致
+        for shard_result in shard_results:
+            self._merge_shard_result(branch_context, shard_result)
+            index_results.extend(shard_result["index_results"])
+
+        return index_results
+
+    def shutdown(self):
+        """关闭进程池"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+    def _get_pool(self, global_context: GlobalContext) -> ProcessPoolExecutor:
+        """按需创建进程池，预加载的sheet通过初始化函数发送给每个工作进程一次"""
+        with self._pool_lock:
+            if self._pool is None:
+                # 初始化参数只在创建时快照一次，之后加载的sheet会被每个工作进程各自重新读取
+                if self.wait_for_preload is not None:
+                    self.wait_for_preload()
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(
+                        global_context.files,
+                        dict(global_context.loaded_dataframes),
+                        global_context.execution_mode,
+                        global_context.column_requirements,
+                    ),
+                )
+            return self._pool
+
+    def _split_shards(self, index_values: List[IndexValue]) -> List[List[IndexValue]]:
+        """
+        将索引值切分为连续分片（每个工作进程多个分片以平衡负载）
+
+        Args:
+            index_values: 索引值列表
+
+        Returns:
+            连续分片列表
+        """
+        shard_count = min(len(index_values), self.max_workers * 4)
+        shard_size = math.ceil(len(index_values) / shard_count)
+        return [
+            index_values[start : start + shard_size]
+            for start in range(0, len(index_values), shard_size)
+        ]
+
+    def _merge_shard_result(
+        self, branch_context: BranchContext, shard_result: Dict[str, Any]
+    ):
+        """
+        将分片的分支上下文增量合并到主分支上下文
+
+        Args:
+            branch_context: 主分支上下文
+            shard_result: 分片执行结果
+        """
+        for results in shard_result["aggregation_results"].values():
+            for result in results:
+                branch_context.add_aggregation_result(result)
+
+        for index_value, dataframe in shard_result["index_dataframes"].items():
+            branch_context.add_index_dataframe(index_value, dataframe)
+
+        if shard_result["last_non_aggregated_dataframe"] is not None:
+            branch_context.last_non_aggregated_dataframe = shard_result[
+                "last_non_aggregated_dataframe"
+            ]
@@ -0,0 +1,135 @@
+"""
+谓词下推
+将紧跟在manual模式SheetSelector之后的RowFilter条件下推到sheet加载阶段：
+sheet解析清洗后立即过滤，过滤后的sheet按条件摘要缓存，原过滤节点改写为空操作
+"""
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..models import BaseNode, Edge, NodeType
+from .path_analyzer import ExecutionBranch
+
+
+class PredicatePushdown:
+    """谓词下推改写器 - 改写执行计划中的节点映射"""
+
+    def rewrite(
+        self,
+        execution_branches: Dict[str, ExecutionBranch],
+        node_map: Dict[str, BaseNode],
+        edges: List[Edge],
+        target_node_id: str,
+    ) -> Tuple[Dict[str, BaseNode], Dict[Tuple[str, str], List[Dict[str, Any]]]]:
+        """
+        找出可以下推的过滤条件并改写节点映射
+
+        只有目标节点是输出节点时才下推：其他节点的执行结果会把sheet选择节点的DataFrame原样返回。
+        过滤节点的唯一上游必须是manual模式的sheet选择节点，且是该节点的唯一下游；
+        条件记录在sheet选择节点的pushedFilters中，过滤节点的条件清空
+
+        Args:
+            execution_branches: 执行分支
+            node_map: 节点映射
+            edges: 工作流的边
+            target_node_id: 目标节点ID
+
+        Returns:
+            (改写后的节点映射, (文件ID, Sheet名) -> 预加载时即可过滤的条件)；
+            后者只包含没有其他节点读取完整内容的sheet
+        """
+        target_node = node_map.get(target_node_id)
+        if target_node is None or target_node.type != NodeType.OUTPUT:
+            return node_map, {}
+
+        execution_nodes = {
+            node_id
+            for branch in execution_branches.values()
+            for node_id in branch.execution_nodes
+            if node_id in node_map
+        }
+        sources: Dict[str, List[str]] = {}
+        targets: Dict[str, List[str]] = {}
+        for edge in edges:
+            sources.setdefault(edge.target, []).append(edge.source)
+            targets.setdefault(edge.source, []).append(edge.target)
+
+        sheet_readers = self._count_sheet_readers(execution_nodes, node_map)
+
+        rewritten = dict(node_map)
+        preload_filters: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for node_id in sorted(execution_nodes):
+            node = node_map[node_id]
+            conditions = node.data.get("conditions", [])
+            if node.type != NodeType.ROW_FILTER or not conditions:
+                continue
+
+            upstream = sources.get(node_id, [])
+            if len(upstream) != 1 or upstream[0] not in execution_nodes:
+                continue
+            selector = node_map[upstream[0]]
+            sheet = self._manual_sheet(selector)
+            if sheet is None or targets.get(selector.id) != [node_id]:
+                continue
+
+            rewritten[selector.id] = BaseNode(
+                id=selector.id,
+                type=selector.type,
+                data={**selector.data, "pushedFilters": conditions},
+            )
+            rewritten[node_id] = BaseNode(
+                id=node.id, type=node.type, data={**node.data, "conditions": []}
+            )
+            if sheet_readers.get(sheet) == 1:
+                preload_filters[sheet] = conditions
+
+        return rewritten, preload_filters
+
+    @staticmethod
+    def _manual_sheet(node: BaseNode) -> Optional[Tuple[str, str]]:
+        """manual模式sheet选择节点读取的 (文件ID, Sheet名)，其他节点返回None"""
+        data = node.data
+        if (
+            node.type != NodeType.SHEET_SELECTOR
+            or data.get("mode") != "manual"
+            or not data.get("targetFileID")
+            or not data.get("manualSheetName")
+        ):
+            return None
+        return data["targetFileID"], data["manualSheetName"]
+
+    def _count_sheet_readers(
+        self, execution_nodes: Set[str], node_map: Dict[str, BaseNode]
+    ) -> Dict[Tuple[str, str], int]:
+        """
+        统计每个sheet被多少个节点读取
+
+        按索引值或列匹配选择sheet的节点可能读取文件中的任意sheet，
+        它们所在文件的sheet都视为有多个读取者
+
+        Args:
+            execution_nodes: 执行节点ID集合
+            node_map: 节点映射
+
+        Returns:
+            (文件ID, Sheet名) -> 读取该sheet的节点数
+        """
+        readers: Dict[Tuple[str, str], int] = {}
+        shared_files = set()
+        for node_id in execution_nodes:
+            node = node_map[node_id]
+            data = node.data
+            sheet = None
+            if node.type == NodeType.INDEX_SOURCE:
+                if data.get("byColumn", True) and data.get("sourceFileID"):
+                    sheet = (data["sourceFileID"], data.get("sheetName"))
+            elif node.type == NodeType.SHEET_SELECTOR:
+                sheet = self._manual_sheet(node)
+                if sheet is None and data.get("targetFileID"):
+                    shared_files.add(data["targetFileID"])
+            if sheet is not None:
+                readers[sheet] = readers.get(sheet, 0) + 1
+
+        for sheet in readers:
+            if sheet[0] in shared_files:
+                readers[sheet] += 1
+        return readers
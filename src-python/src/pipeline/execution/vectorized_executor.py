@@ -0,0 +1,298 @@
+"""
+向量化分支执行器
+识别 SheetSelector(manual) → RowFilter* → RowLookup(exact) → Aggregator* 形状的分支，
+用一次分组哈希替代逐索引值的行查找，并融合计算其后的所有聚合节点，结果与逐索引执行完全一致
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..models import (
+    AggregationOperation,
+    AggregationResult,
+    AggregatorOutput,
+    BaseNode,
+    IndexExecutionResult,
+    IndexValue,
+    NodeExecutionResult,
+    NodeType,
+    RowLookupOutput,
+)
+from .aggregation_fusion import AggregationFusion
+from .context_manager import ContextManager
+from .invariance_analyzer import InvarianceAnalyzer
+from .path_analyzer import ExecutionBranch
+
+
+class VectorizedBranchExecutor:
+    """向量化分支执行器 - 对整条分支的所有索引值做一次分组"""
+
+    def __init__(self, processors: Dict[NodeType, object], context_manager: ContextManager):
+        self.processors = processors
+        self.context_manager = context_manager
+        self.invariance_analyzer = InvarianceAnalyzer(processors, context_manager)
+
+    def can_vectorize(
+        self, branch: ExecutionBranch, node_map: Dict[str, BaseNode]
+    ) -> bool:
+        """
+        判断分支是否符合可向量化的形状
+
+        Args:
+            branch: 执行分支
+            node_map: 节点映射
+
+        Returns:
+            是否可以向量化执行
+        """
+        prefix, remaining = self._split_branch(branch, node_map)
+
+        # 不变前缀之后必须是 RowLookup(exact) → Aggregator*
+        if not prefix or not remaining:
+            return False
+
+        row_lookup = remaining[0]
+        if (
+            row_lookup.type != NodeType.ROW_LOOKUP
+            or row_lookup.data.get("matchMode", "exact") != "exact"
+        ):
+            return False
+
+        return all(node.type == NodeType.AGGREGATOR for node in remaining[1:])
+
+    def execute_branch(
+        self,
+        branch: ExecutionBranch,
+        index_values: List[IndexValue],
+        node_map: Dict[str, BaseNode],
+        global_context,
+    ) -> Optional[List[IndexExecutionResult]]:
+        """
+        向量化执行整条分支
+
+        Args:
+            branch: 执行分支（必须已通过can_vectorize检查）
+            index_values: 该分支的索引值列表
+            node_map: 节点映射
+            global_context: 全局上下文
+
+        Returns:
+            按索引值顺序排列的执行结果；如果准备阶段失败则返回None，由调用方回退到逐索引执行
+        """
+        if not index_values:
+            return []
+
+        prefix, remaining = self._split_branch(branch, node_map)
+        lookup_node = remaining[0]
+        aggregator_nodes = remaining[1:]
+
+        # 不变前缀只执行一次
+        prefix_outputs = self.invariance_analyzer.evaluate_prefix(
+            prefix, index_values[0], global_context
+        )
+        if len(prefix_outputs) < len(prefix):
+            return None
+
+        try:
+            base_df = prefix_outputs[-1][1].dataframe
+            groups = self._build_lookup_groups(base_df, lookup_node, global_context)
+            aggregator_specs = [
+                self._resolve_aggregator_spec(node, base_df) for node in aggregator_nodes
+            ]
+        except Exception:
+            return None
+
+        branch_context = self.context_manager.get_or_create_branch_context(
+            branch.branch_id, branch.index_source_id
+        )
+        case_sensitive = lookup_node.data.get("caseSensitive", False)
+        empty_positions = np.empty(0, dtype=np.intp)
+        lookup_processor = self.processors[NodeType.ROW_LOOKUP]
+        aggregator_processor = self.processors[NodeType.AGGREGATOR]
+
+        # 聚合融合：所有聚合节点共享同一上游，每列只转换一次，按分组一次算出全部索引值的结果
+        search_keys = [
+            str(value) if case_sensitive else str(value).lower()
+            for value in index_values
+        ]
+        fusion = AggregationFusion(
+            base_df,
+            {key: groups[key] for key in dict.fromkeys(search_keys) if key in groups},
+            aggregator_processor,
+        )
+        fused_results = []
+        for column, operation, _ in aggregator_specs:
+            try:
+                fused_results.append(fusion.evaluate(column, operation))
+            except Exception:
+                # 出错的聚合回退到逐索引计算，保持原有的错误信息
+                fused_results.append(None)
+
+        exec_id = lookup_processor.analyzer.onStart(
+            lookup_node.id, NodeType.ROW_LOOKUP.value
+        )
+        index_results = []
+        for index_value, search_value in zip(index_values, search_keys):
+            start_time = time.time()
+            node_results = []
+
+            # 不变前缀：复用一次计算的输出，只替换索引值
+            for node, output in prefix_outputs:
+                index_output = output.copy(update={"index_value": index_value})
+                node_results.append(
+                    self._make_node_result(node, index_output.dict(), 0.0)
+                )
+
+            # 行查找：直接按哈希分组取行
+            lookup_start = time.time()
+            matched_df = lookup_processor.select_rows(
+                base_df, groups.get(search_value, empty_positions), global_context
+            )
+            lookup_output = RowLookupOutput(
+                dataframe=matched_df,
+                index_value=index_value,
+                matched_count=len(matched_df),
+            )
+            node_results.append(
+                self._make_node_result(
+                    lookup_node,
+                    lookup_output.dict(),
+                    (time.time() - lookup_start) * 1000,
+                )
+            )
+            branch_context.last_non_aggregated_dataframe = matched_df
+            branch_context.add_index_dataframe(index_value, matched_df)
+
+            # 聚合：取融合计算的结果，未融合的聚合执行与逐索引路径相同的聚合逻辑
+            for node, spec, fused in zip(
+                aggregator_nodes, aggregator_specs, fused_results
+            ):
+                agg_start = time.time()
+                try:
+                    column, operation, output_column_name = spec
+                    if fused is not None:
+                        result_value = fused.get(search_value)
+                    else:
+                        result_value = aggregator_processor._perform_aggregation(
+                            matched_df, column, operation
+                        )
+                    aggregation_result = AggregationResult(
+                        index_value=index_value,
+                        column_name=output_column_name,
+                        operation=operation,
+                        result_value=result_value,
+                    )
+                    branch_context.add_aggregation_result(aggregation_result)
+                    node_results.append(
+                        self._make_node_result(
+                            node,
+                            AggregatorOutput(result=aggregation_result).dict(),
+                            (time.time() - agg_start) * 1000,
+                        )
+                    )
+                except Exception as e:
+                    node_results.append(
+                        NodeExecutionResult(
+                            node_id=node.id,
+                            node_type=node.type,
+                            success=False,
+                            output=None,
+                            error=str(e),
+                            execution_time_ms=0.0,
+                        )
+                    )
+
+            index_results.append(
+                IndexExecutionResult(
+                    index_value=index_value,
+                    success=True,
+                    node_results=node_results,
+                    error=None,
+                    total_execution_time_ms=(time.time() - start_time) * 1000,
+                )
+            )
+        lookup_processor.analyzer.onFinish(exec_id)
+
+        return index_results
+
+    def _split_branch(
+        self, branch: ExecutionBranch, node_map: Dict[str, BaseNode]
+    ) -> Tuple[List[BaseNode], List[BaseNode]]:
+        """
+        将分支的数据节点切分为不变前缀和其余节点
+
+        Returns:
+            (不变前缀节点列表, 其余节点列表)
+        """
+        prefix = self.invariance_analyzer.find_invariant_prefix(branch, node_map)
+        data_nodes = [
+            node_map[node_id]
+            for node_id in branch.execution_nodes
+            if node_id in node_map
+            and node_map[node_id].type not in (NodeType.INDEX_SOURCE, NodeType.OUTPUT)
+        ]
+        return prefix, data_nodes[len(prefix) :]
+
+    def _build_lookup_groups(
+        self, df: pd.DataFrame, lookup_node: BaseNode, global_context
+    ) -> Dict[str, np.ndarray]:
+        """
+        获取查找列的哈希分组，得到 {规范化键: 行位置数组}
+
+        Args:
+            df: 查找的源DataFrame
+            lookup_node: 行查找节点
+            global_context: 全局上下文
+
+        Returns:
+            键到行位置的映射
+        """
+        lookup_column = lookup_node.data.get("matchColumn")
+        if not lookup_column:
+            raise ValueError("lookupColumn is required for row lookup node")
+        if lookup_column not in df.columns:
+            raise ValueError(f"Lookup column '{lookup_column}' not found in DataFrame")
+
+        return self.processors[NodeType.ROW_LOOKUP].get_exact_match_index(
+            df,
+            lookup_column,
+            lookup_node.data.get("caseSensitive", False),
+            global_context,
+        )
+
+    def _resolve_aggregator_spec(self, node: BaseNode, df: pd.DataFrame):
+        """
+        解析聚合节点配置，配置不合法时抛出异常以回退到逐索引执行
+
+        Returns:
+            (目标列名, 聚合操作, 输出列名)
+        """
+        data = node.data
+        target_column = data.get("statColumn")
+        operation = data.get("method")
+        if not target_column or not operation:
+            raise ValueError(f"Aggregator node {node.id} is not fully configured")
+
+        output_column_name = data.get("outputAs") or operation + "_" + target_column
+        agg_operation = AggregationOperation(operation)
+
+        if target_column not in df.columns:
+            raise ValueError(f"Target column '{target_column}' not found in DataFrame")
+
+        return target_column, agg_operation, output_column_name
+
+    def _make_node_result(
+        self, node: BaseNode, output: Dict, execution_time_ms: float
+    ) -> NodeExecutionResult:
+        """创建成功的节点执行结果"""
+        return NodeExecutionResult(
+            node_id=node.id,
+            node_type=node.type,
+            success=True,
+            output=output,
+            error=None,
+            execution_time_ms=execution_time_ms,
+        )
@@ -12,6 +12,7 @@ import pandas as pd
 import time
 from threading import Lock
 from pipeline.performance.analyzer import get_performance_analyzer
+from pipeline.utils.index_cache import IndexCache
 import numpy as np
 
 
@@ -152,6 +153,55 @@ class DataFrame(BaseModel):
         )
 
 
+class RowSelection:
+    """
+    行选择向量 - 延迟物化的行子集
+
+    引用源DataFrame并记录选中行的位置（int32），过滤和查找只产生新的位置数组，
+    聚合时按列取值，只有写出结果时才物化为完整的DataFrame
+    """
+
+    def __init__(self, base: Union[pd.DataFrame, "RowSelection"], positions: np.ndarray):
+        """
+        Args:
+            base: 源DataFrame或行选择向量（嵌套选择会合并为对源DataFrame的一次选择）
+            positions: 选中行在base中的位置
+        """
+        positions = np.asarray(positions, dtype=np.int32)
+        if isinstance(base, RowSelection):
+            positions = base.positions[positions]
+            base = base.base
+        self.base = base
+        self.positions = positions
+
+    @property
+    def columns(self) -> pd.Index:
+        return self.base.columns
+
+    @property
+    def index(self) -> pd.Index:
+        return self.base.index[self.positions]
+
+    @property
+    def empty(self) -> bool:
+        return len(self.positions) == 0 or len(self.base.columns) == 0
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, column: str) -> pd.Series:
+        """按列取值，只物化这一列"""
+        return self.base[column].take(self.positions)
+
+    def take(self, positions: np.ndarray) -> "RowSelection":
+        """在当前选择中按位置再选择"""
+        return RowSelection(self, positions)
+
+    def to_pandas(self) -> pd.DataFrame:
+        """物化为DataFrame，与布尔掩码选择后复制的结果一致"""
+        return self.base.take(self.positions)
+
+
 # ==================== 节点输入输出基类 ====================
 
 
@@ -203,7 +253,7 @@ class SheetSelectorOutput(NodeOutput):
 class RowFilterInput(NodeInput):
     """行过滤节点输入"""
 
-    dataframe: pd.DataFrame = Field(..., description="待过滤的DataFrame")
+    dataframe: Union[pd.DataFrame, RowSelection] = Field(..., description="待过滤的DataFrame")
     index_value: IndexValue = Field(..., description="当前索引值")
 
     class Config:
@@ -213,7 +263,9 @@ class RowFilterInput(NodeInput):
 class RowFilterOutput(NodeOutput):
     """行过滤节点输出"""
 
-    dataframe: pd.DataFrame = Field(..., description="过滤后的DataFrame")
+    dataframe: Union[pd.DataFrame, RowSelection] = Field(
+        ..., description="过滤后的DataFrame（启用延迟物化时为行选择向量）"
+    )
     index_value: IndexValue = Field(..., description="对应的索引值")
     filtered_count: int = Field(..., description="过滤后的行数")
 
@@ -225,7 +277,7 @@ class RowFilterOutput(NodeOutput):
 class RowLookupInput(NodeInput):
     """行查找节点输入"""
 
-    dataframe: pd.DataFrame = Field(..., description="源DataFrame")
+    dataframe: Union[pd.DataFrame, RowSelection] = Field(..., description="源DataFrame")
     index_value: IndexValue = Field(..., description="用于匹配的索引值")
 
     class Config:
@@ -235,7 +287,9 @@ class RowLookupInput(NodeInput):
 class RowLookupOutput(NodeOutput):
     """行查找节点输出"""
 
-    dataframe: pd.DataFrame = Field(..., description="匹配的行组成的DataFrame")
+    dataframe: Union[pd.DataFrame, RowSelection] = Field(
+        ..., description="匹配的行组成的DataFrame（启用延迟物化时为行选择向量）"
+    )
     index_value: IndexValue = Field(..., description="对应的索引值")
     matched_count: int = Field(..., description="匹配的行数")
 
@@ -247,7 +301,7 @@ class RowLookupOutput(NodeOutput):
 class AggregatorInput(NodeInput):
     """聚合节点输入"""
 
-    dataframe: pd.DataFrame = Field(
+    dataframe: Union[pd.DataFrame, RowSelection] = Field(
         ..., description="完整的上游非聚合节点输出DataFrame"
     )
     index_value: IndexValue = Field(..., description="当前索引值")
@@ -283,7 +337,12 @@ class OutputInput(NodeInput):
     )
 
     branch_dataframes: Dict[
-        str, Union[pd.DataFrame, Dict[IndexValue, pd.DataFrame]]
+        str,
+        Union[
+            pd.DataFrame,
+            RowSelection,
+            Dict[IndexValue, Union[pd.DataFrame, RowSelection]],
+        ],
     ] = Field(
         default_factory=dict,
         description="按分支组织的非聚合 dataframe 结果，格式为 {分支ID: DataFrame} 或 {分支ID: {索引值: DataFrame}}",
@@ -332,9 +391,24 @@ class GlobalContext(BaseModel):
     loaded_dataframes: Dict[str, pd.DataFrame] = Field(
         default_factory=dict, description="已加载的DataFrame缓存"
     )
+    index_cache: IndexCache = Field(
+        default_factory=IndexCache, description="基于已加载DataFrame构建的查找索引缓存"
+    )
+    coercion_cache: IndexCache = Field(
+        default_factory=IndexCache, description="已加载DataFrame各列的数值转换结果缓存"
+    )
+    statistics_cache: IndexCache = Field(
+        default_factory=IndexCache, description="已加载DataFrame各列的统计信息缓存"
+    )
     execution_mode: ExecutionMode = Field(
         default=ExecutionMode.PRODUCTION, description="执行模式"
     )
+    column_requirements: Optional[Any] = Field(
+        None, description="列裁剪规划（ColumnRequirements），None表示读取所有列"
+    )
+    late_materialization: bool = Field(
+        default=False, description="行过滤和行查找是否输出行选择向量而不是复制的DataFrame"
+    )
 
     class Config:
         arbitrary_types_allowed = True  # 允许pandas DataFrame
@@ -344,10 +418,10 @@ class PathContext(BaseModel):
     """路径执行上下文 - 单个索引值执行期间的上下文"""
 
     current_index: IndexValue = Field(..., description="当前索引值")
-    last_non_aggregator_dataframe: Optional[pd.DataFrame] = Field(
+    last_non_aggregator_dataframe: Optional[Union[pd.DataFrame, RowSelection]] = Field(
         None, description="最近的非聚合节点输出DataFrame"
     )
-    current_dataframe: Optional[pd.DataFrame] = Field(
+    current_dataframe: Optional[Union[pd.DataFrame, RowSelection]] = Field(
         None, description="当前节点的DataFrame"
     )
     execution_trace: List[str] = Field(default_factory=list, description="执行轨迹")
@@ -367,10 +441,10 @@ class BranchContext(BaseModel):
     branch_metadata: Dict[str, Any] = Field(
         default_factory=dict, description="分支元数据"
     )
-    last_non_aggregated_dataframe: Optional[pd.DataFrame] = Field(
+    last_non_aggregated_dataframe: Optional[Union[pd.DataFrame, RowSelection]] = Field(
         None, description="最后一个非聚合节点的DataFrame输出"
     )
-    index_dataframes: Dict[IndexValue, pd.DataFrame] = Field(
+    index_dataframes: Dict[IndexValue, Union[pd.DataFrame, RowSelection]] = Field(
         default_factory=dict, description="按索引值组织的非聚合节点DataFrame输出"
     )
 
@@ -394,11 +468,13 @@ class BranchContext(BaseModel):
             }
         return final_results
 
-    def add_index_dataframe(self, index_value: IndexValue, dataframe: pd.DataFrame):
+    def add_index_dataframe(
+        self, index_value: IndexValue, dataframe: Union[pd.DataFrame, RowSelection]
+    ):
         """添加索引值对应的DataFrame"""
         self.index_dataframes[index_value] = dataframe
 
-    def get_index_dataframes(self) -> Dict[IndexValue, pd.DataFrame]:
+    def get_index_dataframes(self) -> Dict[IndexValue, Union[pd.DataFrame, RowSelection]]:
         """获取所有索引值对应的DataFrame"""
         return self.index_dataframes.copy()
 
@@ -517,6 +593,30 @@ class ExecutePipelineRequest(BaseModel):
         default=ExecutionMode.PRODUCTION, description="执行模式"
     )
     test_mode_max_rows: int = Field(default=100, description="测试模式最大行数限制")
+    vectorized_execution: bool = Field(
+        default=True, description="是否对可向量化的分支使用分组执行"
+    )
+    max_workers: int = Field(
+        default=1, ge=1, description="分支内索引值并行执行的进程数，1表示串行执行"
+    )
+    max_parallel_branches: int = Field(
+        default=1, ge=1, description="同时执行的分支数上限，1表示逐个分支执行"
+    )
+    process_preload: bool = Field(
+        default=False, description="是否在工作进程中并行解析预加载的Excel文件"
+    )
+    prune_columns: bool = Field(
+        default=False,
+        description="目标为输出节点时只读取流程中用到的列（中间节点结果中的DataFrame也只包含这些列）",
+    )
+    pushdown_filters: bool = Field(
+        default=False,
+        description="目标为输出节点时将紧跟manual sheet选择的行过滤下推到加载阶段",
+    )
+    late_materialization: bool = Field(
+        default=False,
+        description="行过滤和行查找输出行选择向量，写出结果时才物化（节点结果中的dataframe为RowSelection）",
+    )
 
 
 # ==================== 类型验证工具 ====================
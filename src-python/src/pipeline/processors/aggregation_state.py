@@ -0,0 +1,356 @@
+"""
+可合并的聚合中间状态
+每种聚合操作提供 init / update(chunk) / merge(other) / finalize 四个步骤，
+同一列可以分块、分进程或增量地聚合，最后合并出与整列一次聚合相同的结果
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, Optional, Type
+
+import numpy as np
+import pandas as pd
+
+from ..models import AggregationOperation
+
+
+def to_serializable(value: Any) -> float | int | str | None:
+    """
+    将值转换为JSON可序列化的格式
+
+    Args:
+        value: 原始值
+
+    Returns:
+        可序列化的值
+    """
+    if value is None or pd.isna(value):
+        return None
+
+    # 处理numpy类型
+    if isinstance(value, (np.integer, np.int64, np.int32)):
+        return int(value)
+    elif isinstance(value, (np.floating, np.float64, np.float32)):
+        return float(value)
+    elif isinstance(value, (np.bool_, bool)):
+        return bool(value)
+    else:
+        return str(value)
+
+
+def _coerce(chunk: pd.Series, numeric: Optional[pd.Series]) -> pd.Series:
+    """数值转换结果，未提供时转换chunk"""
+    return numeric if numeric is not None else pd.to_numeric(chunk, errors="coerce")
+
+
+class AggregationState(ABC):
+    """聚合中间状态基类：记录已处理的行数，没有处理过任何行时结果为None"""
+
+    operation: AggregationOperation
+
+    def __init__(self):
+        self.init()
+
+    def init(self) -> "AggregationState":
+        """重置为没有处理过任何行的初始状态"""
+        self.rows = 0
+        self._init()
+        return self
+
+    def update(
+        self, chunk: pd.Series, numeric: Optional[pd.Series] = None
+    ) -> "AggregationState":
+        """
+        累加一块列数据
+
+        Args:
+            chunk: 目标列的一段连续行
+            numeric: chunk的数值转换结果（已缓存时传入，避免重复转换）
+
+        Returns:
+            当前状态（便于链式调用）
+        """
+        if len(chunk) > 0:
+            self.rows += len(chunk)
+            self._update(chunk, numeric)
+        return self
+
+    def merge(self, other: "AggregationState") -> "AggregationState":
+        """
+        合并另一个状态，other中的行视为排在当前状态的行之后
+
+        Args:
+            other: 同一聚合操作的另一个状态
+
+        Returns:
+            当前状态（便于链式调用）
+        """
+        if other.operation != self.operation:
+            raise ValueError(
+                f"Cannot merge {other.operation.value} state "
+                f"into {self.operation.value} state"
+            )
+        if other.rows > 0:
+            self.rows += other.rows
+            self._merge(other)
+        return self
+
+    def finalize(self) -> float | int | str | None:
+        """
+        计算最终聚合结果
+
+        Returns:
+            聚合结果值；没有处理过任何行时为None
+        """
+        if self.rows == 0:
+            return None
+        return self._finalize()
+
+    @abstractmethod
+    def _init(self):
+        pass
+
+    @abstractmethod
+    def _update(self, chunk: pd.Series, numeric: Optional[pd.Series]):
+        pass
+
+    @abstractmethod
+    def _merge(self, other: "AggregationState"):
+        pass
+
+    @abstractmethod
+    def _finalize(self) -> float | int | str | None:
+        pass
+
+
+class SumState(AggregationState):
+    """求和 - 只对数值有效，没有有效数值时为None"""
+
+    operation = AggregationOperation.SUM
+
+    def _init(self):
+        self.total = 0
+        self.valid = 0
+
+    def _update(self, chunk: pd.Series, numeric: Optional[pd.Series]):
+        numeric_data = _coerce(chunk, numeric)
+        valid = int(numeric_data.notna().sum())
+        if valid:
+            self.total = self.total + numeric_data.sum()
+            self.valid += valid
+
+    def _merge(self, other: "SumState"):
+        self.total = self.total + other.total
+        self.valid += other.valid
+
+    def _finalize(self):
+        return float(self.total) if self.valid else None
+
+
+class CountState(AggregationState):
+    """计数 - 非空值的数量"""
+
+    operation = AggregationOperation.COUNT
+
+    def _init(self):
+        self.count = 0
+
+    def _update(self, chunk: pd.Series, numeric: Optional[pd.Series]):
+        self.count += int(chunk.notna().sum())
+
+    def _merge(self, other: "CountState"):
+        self.count += other.count
+
+    def _finalize(self):
+        return self.count
+
+
+class AverageState(AggregationState):
+    """平均值 - 有效数值的和与个数"""
+
+    operation = AggregationOperation.AVERAGE
+
+    def _init(self):
+        self.total = 0.0
+        self.valid = 0
+
+    def _update(self, chunk: pd.Series, numeric: Optional[pd.Series]):
+        numeric_data = _coerce(chunk, numeric)
+        valid = int(numeric_data.notna().sum())
+        if not valid:
+            return
+        values = numeric_data.to_numpy()
+        if values.dtype.kind in "iu":
+            # 与pandas求均值时相同，整数按float64累加
+            self.total = self.total + values.sum(dtype=np.float64)
+        else:
+            self.total = self.total + numeric_data.sum()
+        self.valid += valid
+
+    def _merge(self, other: "AverageState"):
+        self.total = self.total + other.total
+        self.valid += other.valid
+
+    def _finalize(self):
+        return float(self.total / self.valid) if self.valid else None
+
+
+class _ExtremumState(AggregationState):
+    """最小/最大值 - 有数值时取数值极值，否则按字符串取非空值的极值"""
+
+    def _init(self):
+        self.numeric = None
+        self.text = None
+
+    @abstractmethod
+    def _reduce(self, data: pd.Series):
+        """一块数据的极值"""
+
+    @abstractmethod
+    def _pick(self, a, b):
+        """两个极值中保留的一个"""
+
+    def _combine(self, current, value):
+        return value if current is None else self._pick(current, value)
+
+    def _update(self, chunk: pd.Series, numeric: Optional[pd.Series]):
+        numeric_data = _coerce(chunk, numeric)
+        if not numeric_data.isna().all():
+            self.numeric = self._combine(self.numeric, self._reduce(numeric_data))
+        elif self.numeric is None:
+            # 只有从未出现数值时才需要字符串极值
+            non_null_data = chunk.dropna()
+            if len(non_null_data) > 0:
+                self.text = self._combine(self.text, self._reduce(non_null_data))
+
+    def _merge(self, other: "_ExtremumState"):
+        if other.numeric is not None:
+            self.numeric = self._combine(self.numeric, other.numeric)
+        if other.text is not None:
+            self.text = self._combine(self.text, other.text)
+
+    def _finalize(self):
+        if self.numeric is not None:
+            return float(self.numeric)
+        return str(self.text) if self.text is not None else None
+
+
+class MinState(_ExtremumState):
+    """最小值"""
+
+    operation = AggregationOperation.MIN
+
+    def _reduce(self, data: pd.Series):
+        return data.min()
+
+    def _pick(self, a, b):
+        return b if b < a else a
+
+
+class MaxState(_ExtremumState):
+    """最大值"""
+
+    operation = AggregationOperation.MAX
+
+    def _reduce(self, data: pd.Series):
+        return data.max()
+
+    def _pick(self, a, b):
+        return b if b > a else a
+
+
+class FirstState(AggregationState):
+    """第一个非空值"""
+
+    operation = AggregationOperation.FIRST
+
+    def _init(self):
+        self.found = False
+        self.value = None
+
+    def _update(self, chunk: pd.Series, numeric: Optional[pd.Series]):
+        if not self.found:
+            non_null_data = chunk.dropna()
+            if len(non_null_data) > 0:
+                self.found = True
+                self.value = non_null_data.iloc[0]
+
+    def _merge(self, other: "FirstState"):
+        if not self.found and other.found:
+            self.found = True
+            self.value = other.value
+
+    def _finalize(self):
+        return to_serializable(self.value) if self.found else None
+
+
+class LastState(AggregationState):
+    """最后一个非空值"""
+
+    operation = AggregationOperation.LAST
+
+    def _init(self):
+        self.found = False
+        self.value = None
+
+    def _update(self, chunk: pd.Series, numeric: Optional[pd.Series]):
+        non_null_data = chunk.dropna()
+        if len(non_null_data) > 0:
+            self.found = True
+            self.value = non_null_data.iloc[-1]
+
+    def _merge(self, other: "LastState"):
+        if other.found:
+            self.found = True
+            self.value = other.value
+
+    def _finalize(self):
+        return to_serializable(self.value) if self.found else None
+
+
+_STATE_CLASSES: Dict[AggregationOperation, Type[AggregationState]] = {
+    state_class.operation: state_class
+    for state_class in (
+        SumState,
+        CountState,
+        AverageState,
+        MinState,
+        MaxState,
+        FirstState,
+        LastState,
+    )
+}
+
+
+def create_aggregation_state(operation: AggregationOperation) -> AggregationState:
+    """
+    创建聚合操作的初始状态
+
+    Args:
+        operation: 聚合操作
+
+    Returns:
+        没有处理过任何行的聚合状态
+    """
+    state_class = _STATE_CLASSES.get(operation)
+    if state_class is None:
+        raise ValueError(f"Unsupported aggregation operation: {operation}")
+    return state_class()
+
+
+def aggregate_chunks(
+    operation: AggregationOperation, chunks: Iterable[pd.Series]
+) -> Optional[float | int | str]:
+    """
+    按顺序逐块聚合一列数据
+
+    Args:
+        operation: 聚合操作
+        chunks: 按行顺序排列的列数据块
+
+    Returns:
+        聚合结果值
+    """
+    state = create_aggregation_state(operation)
+    for chunk in chunks:
+        state.update(chunk)
+    return state.finalize()
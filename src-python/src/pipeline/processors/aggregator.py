@@ -7,9 +7,11 @@
 3. 结果存储在分支上下文中，用于最终合并
 """
 
+from typing import Optional
+
 import pandas as pd
-import numpy as np
 
+from .aggregation_state import create_aggregation_state, to_serializable
 from .base import AbstractNodeProcessor
 from ..models import (
     BaseNode,
@@ -23,6 +25,16 @@ from ..models import (
     NodeType,
 )
 
+# 需要数值转换的聚合操作
+_NUMERIC_OPERATIONS = frozenset(
+    {
+        AggregationOperation.SUM,
+        AggregationOperation.AVERAGE,
+        AggregationOperation.MIN,
+        AggregationOperation.MAX,
+    }
+)
+
 
 class AggregatorProcessor(AbstractNodeProcessor[AggregatorInput, AggregatorOutput]):
     """聚合节点处理器"""
@@ -71,11 +83,8 @@ class AggregatorProcessor(AbstractNodeProcessor[AggregatorInput, AggregatorOutpu
             except ValueError:
                 raise ValueError(f"Invalid aggregation operation: {operation}")
 
-            # 获取pandas DataFrame（支持两种输入类型）
-            if hasattr(input_data.dataframe, "to_pandas"):
-                pandas_df = input_data.dataframe.to_pandas()
-            else:
-                pandas_df = input_data.dataframe  # 已经是pandas DataFrame
+            # 获取pandas DataFrame；行选择向量不物化，聚合时只取目标列
+            pandas_df = self.as_input_frame(input_data.dataframe)
 
             # 验证目标列存在
             if target_column not in pandas_df.columns:
@@ -85,7 +94,7 @@ class AggregatorProcessor(AbstractNodeProcessor[AggregatorInput, AggregatorOutpu
 
             # 执行聚合操作
             result_value = self._perform_aggregation(
-                pandas_df, target_column, agg_operation
+                pandas_df, target_column, agg_operation, global_context
             )
 
             # 创建聚合结果
@@ -112,7 +121,11 @@ class AggregatorProcessor(AbstractNodeProcessor[AggregatorInput, AggregatorOutpu
             raise e
 
     def _perform_aggregation(
-        self, df: pd.DataFrame, column: str, operation: AggregationOperation
+        self,
+        df: pd.DataFrame,
+        column: str,
+        operation: AggregationOperation,
+        global_context: Optional[GlobalContext] = None,
     ) -> float | int | str | None:
         """
         执行聚合操作
@@ -121,6 +134,7 @@ class AggregatorProcessor(AbstractNodeProcessor[AggregatorInput, AggregatorOutpu
             df: 源DataFrame
             column: 目标列名
             operation: 聚合操作
+            global_context: 全局上下文（提供列数值转换结果缓存）
 
         Returns:
             聚合结果值
@@ -140,67 +154,14 @@ class AggregatorProcessor(AbstractNodeProcessor[AggregatorInput, AggregatorOutpu
             pass
 
         try:
-            if operation == AggregationOperation.SUM:
-                # 求和 - 只对数值列有效
-                numeric_data = pd.to_numeric(column_data, errors="coerce")
-                return (
-                    float(numeric_data.sum()) if not numeric_data.isna().all() else None
-                )
-
-            elif operation == AggregationOperation.COUNT:
-                # 计数 - 计算非空值的数量
-                return int(column_data.notna().sum())
-
-            elif operation == AggregationOperation.AVERAGE:
-                # 平均值 - 只对数值列有效
-                numeric_data = pd.to_numeric(column_data, errors="coerce")
-                return (
-                    float(numeric_data.mean())
-                    if not numeric_data.isna().all()
-                    else None
-                )
-
-            elif operation == AggregationOperation.MIN:
-                # 最小值 - 先尝试数值，再尝试字符串
-                numeric_data = pd.to_numeric(column_data, errors="coerce")
-                if not numeric_data.isna().all():
-                    return float(numeric_data.min())
-                else:
-                    # 对于非数值数据，按字符串排序取最小值
-                    non_null_data = column_data.dropna()
-                    return str(non_null_data.min()) if len(non_null_data) > 0 else None
-
-            elif operation == AggregationOperation.MAX:
-                # 最大值 - 先尝试数值，再尝试字符串
-                numeric_data = pd.to_numeric(column_data, errors="coerce")
-                if not numeric_data.isna().all():
-                    return float(numeric_data.max())
-                else:
-                    # 对于非数值数据，按字符串排序取最大值
-                    non_null_data = column_data.dropna()
-                    return str(non_null_data.max()) if len(non_null_data) > 0 else None
-
-            elif operation == AggregationOperation.FIRST:
-                # 第一个非空值
-                first_value = (
-                    column_data.dropna().iloc[0]
-                    if len(column_data.dropna()) > 0
-                    else None
-                )
-                return self._convert_to_serializable(first_value)
-
-            elif operation == AggregationOperation.LAST:
-                # 最后一个非空值
-                last_value = (
-                    column_data.dropna().iloc[-1]
-                    if len(column_data.dropna()) > 0
-                    else None
-                )
-                return self._convert_to_serializable(last_value)
-
-            else:
-                raise ValueError(f"Unsupported aggregation operation: {operation}")
-
+            numeric_data = None
+            if global_context is not None and operation in _NUMERIC_OPERATIONS:
+                # 已加载sheet的列只做一次数值转换
+                numeric_data = self.numeric_column(df, column, global_context).numeric
+
+            # 整列作为一个数据块，与分块聚合共用同一套中间状态
+            state = create_aggregation_state(operation)
+            return state.update(column_data, numeric_data).finalize()
         except Exception as e:
             raise ValueError(f"Error performing {operation} on column '{column}': {e}")
 
@@ -214,18 +175,7 @@ class AggregatorProcessor(AbstractNodeProcessor[AggregatorInput, AggregatorOutpu
         Returns:
             可序列化的值
         """
-        if value is None or pd.isna(value):
-            return None
-
-        # 处理numpy类型
-        if isinstance(value, (np.integer, np.int64, np.int32)):
-            return int(value)
-        elif isinstance(value, (np.floating, np.float64, np.float32)):
-            return float(value)
-        elif isinstance(value, (np.bool_, bool)):
-            return bool(value)
-        else:
-            return str(value)
+        return to_serializable(value)
 
     def validate_node_config(self, node: BaseNode) -> bool:
         """验证节点配置"""
@@ -4,7 +4,8 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic, Optional
+from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar, Union
+import numpy as np
 import pandas as pd
 
 from pipeline.models import (
@@ -14,8 +15,25 @@ from pipeline.models import (
     BranchContext,
     NodeType,
     ExecutionMode,
+    RowSelection,
 )
 from pipeline.performance.analyzer import get_performance_analyzer
+from pipeline.utils.column_stats import ColumnStatistics
+from pipeline.utils.excel_reader import read_sheet
+from pipeline.utils.index_cache import IndexCache
+from pipeline.utils.numeric_cache import (
+    CoercedColumn,
+    DictionaryColumn,
+    SortedColumn,
+    StringColumn,
+)
+from pipeline.utils.sheet_cache import (
+    file_fingerprint,
+    get_sheet_cache,
+    dataframe_cache_key,
+    get_sheet_memory_cache,
+    predicate_key,
+)
 
 # 泛型类型变量
 InputType = TypeVar("InputType")
@@ -80,7 +98,11 @@ class AbstractNodeProcessor(ABC, Generic[InputType, OutputType]):
         return node.type == self.node_type and node.data is not None
 
     def load_dataframe_from_file(
-        self, global_context: GlobalContext, file_id: str, sheet_name: str
+        self,
+        global_context: GlobalContext,
+        file_id: str,
+        sheet_name: str,
+        row_filters: Optional[List[Dict[str, Any]]] = None,
     ) -> pd.DataFrame:
         """
         从文件加载DataFrame的辅助方法
@@ -89,6 +111,8 @@ class AbstractNodeProcessor(ABC, Generic[InputType, OutputType]):
             global_context: 全局上下文
             file_id: 文件ID
             sheet_name: Sheet名称
+            row_filters: 下推到加载阶段的行过滤条件，解析清洗后立即过滤，
+                过滤后的sheet按条件摘要单独缓存
 
         Returns:
             加载的pandas DataFrame
@@ -99,16 +123,22 @@ class AbstractNodeProcessor(ABC, Generic[InputType, OutputType]):
         file_info = global_context.files[file_id]
 
         # 检查缓存
-        cache_key = f"{file_id}_{sheet_name}"
+        predicate = predicate_key(row_filters) if row_filters else None
+        cache_key = dataframe_cache_key(file_id, sheet_name, predicate)
 
         if cache_key in global_context.loaded_dataframes:
             # 缓存命中
             self.analyzer.onCacheHit(cache_key)
             return global_context.loaded_dataframes[cache_key]
 
-        # 缓存未命中，需要加载文件
-        self.analyzer.onCacheMiss(cache_key)
-        
+        full_key = dataframe_cache_key(file_id, sheet_name)
+        if predicate is not None and full_key in global_context.loaded_dataframes:
+            # 完整的sheet已被其他节点加载，直接在内存中过滤
+            self.analyzer.onCacheHit(full_key)
+            df = self._filter_rows(global_context.loaded_dataframes[full_key], row_filters)
+            global_context.loaded_dataframes[cache_key] = df
+            return df
+
         # 获取header row信息
         header_row = 0
         for sheet_meta in file_info.sheet_metas:
@@ -116,34 +146,373 @@ class AbstractNodeProcessor(ABC, Generic[InputType, OutputType]):
                 header_row = sheet_meta.get("header_row", 0)
                 break
 
-        # 加载DataFrame with performance monitoring
-        read_id = self.analyzer.onExcelReadStart(file_info.path, sheet_name)
-        
-        try:
-            df = pd.read_excel(file_info.path, sheet_name=sheet_name, header=header_row)
-            
-            # 应用智能数据清洗逻辑
-            from ..utils.data_cleaner import clean_dataframe_with_smart_strategy
-            df = clean_dataframe_with_smart_strategy(df)
+        # 启用列裁剪时只读取流程中用到的列
+        columns = None
+        if global_context.column_requirements is not None:
+            columns = global_context.column_requirements.columns_for(file_id, sheet_name)
+
+        # 跨请求共享的进程级缓存，文件未变化时直接复用
+        memory_cache = get_sheet_memory_cache()
+        sheet_cache = get_sheet_cache()
+        fingerprint = None
+        if memory_cache is not None or sheet_cache is not None:
+            fingerprint = file_fingerprint(file_info.path)
+
+        if memory_cache is not None:
+            df = memory_cache.get(
+                file_info.path, sheet_name, header_row, fingerprint, columns, predicate
+            )
+            if df is not None:
+                self.analyzer.onCacheHit(cache_key)
+                global_context.loaded_dataframes[cache_key] = df
+                return df
+
+        # 缓存未命中，需要加载文件
+        self.analyzer.onCacheMiss(cache_key)
+
+        # 优先使用持久化的Sheet缓存，文件未变化时跳过Excel解析和清洗
+        df = None
+        if sheet_cache is not None:
+            df = sheet_cache.load(
+                file_info.path, sheet_name, header_row, fingerprint, columns, predicate
+            )
+
+        if df is None:
+            # 加载DataFrame with performance monitoring
+            read_id = self.analyzer.onExcelReadStart(file_info.path, sheet_name)
             
-            # 获取文件大小（可选，用于更详细的性能分析）
             try:
-                import os
-                file_size = os.path.getsize(file_info.path)
-            except:
-                file_size = None
-            
-            self.analyzer.onExcelReadFinish(read_id, len(df), file_size)
+                df = read_sheet(file_info.path, sheet_name, header_row, columns)
+                
+                # 应用智能数据清洗逻辑
+                from ..utils.data_cleaner import clean_dataframe_with_smart_strategy
+                df = clean_dataframe_with_smart_strategy(df)
+                
+                # 获取文件大小（可选，用于更详细的性能分析）
+                try:
+                    import os
+                    file_size = os.path.getsize(file_info.path)
+                except:
+                    file_size = None
+                
+                self.analyzer.onExcelReadFinish(read_id, len(df), file_size)
+
+            except Exception as e:
+                self.analyzer.onExcelReadFinish(read_id, 0, None)
+                raise e
+
+            if row_filters:
+                df = self._filter_rows(df, row_filters)
 
-        except Exception as e:
-            self.analyzer.onExcelReadFinish(read_id, 0, None)
-            raise e
+            if sheet_cache is not None:
+                sheet_cache.store(
+                    file_info.path, sheet_name, header_row, fingerprint, df, columns, predicate
+                )
+
+        if memory_cache is not None:
+            memory_cache.put(
+                file_info.path, sheet_name, header_row, fingerprint, df, columns, predicate
+            )
 
         # 缓存DataFrame
         global_context.loaded_dataframes[cache_key] = df
 
         return df
 
+    @staticmethod
+    def _filter_rows(
+        df: pd.DataFrame, row_filters: List[Dict[str, Any]]
+    ) -> pd.DataFrame:
+        """按下推的行过滤条件过滤，结果与行过滤节点一致"""
+        from .row_filter import RowFilterProcessor
+
+        return RowFilterProcessor().filter_dataframe(df, row_filters)
+
+    @staticmethod
+    def as_input_frame(df: Any) -> Union[pd.DataFrame, RowSelection]:
+        """
+        规范化节点输入：自定义DataFrame转换为pandas DataFrame，行选择向量保持不物化
+
+        Args:
+            df: 节点输入的dataframe
+
+        Returns:
+            pandas DataFrame或行选择向量
+        """
+        if hasattr(df, "to_pandas") and not isinstance(df, RowSelection):
+            return df.to_pandas()
+        return df
+
+    @staticmethod
+    def select_rows(
+        df: Union[pd.DataFrame, RowSelection],
+        positions: np.ndarray,
+        global_context: Optional[GlobalContext] = None,
+    ) -> Union[pd.DataFrame, RowSelection]:
+        """
+        按行位置选择行
+
+        输入已经是行选择向量或启用延迟物化时只记录位置，否则按位置复制出新的DataFrame
+
+        Args:
+            df: 源DataFrame或行选择向量
+            positions: 选中行的位置
+            global_context: 全局上下文
+
+        Returns:
+            选中的行
+        """
+        if isinstance(df, RowSelection) or (
+            global_context is not None and global_context.late_materialization
+        ):
+            return RowSelection(df, positions)
+        return df.take(positions)
+
+    def select_mask(
+        self,
+        df: Union[pd.DataFrame, RowSelection],
+        mask: Union[pd.Series, np.ndarray],
+        global_context: Optional[GlobalContext] = None,
+    ) -> Union[pd.DataFrame, RowSelection]:
+        """
+        按布尔掩码选择行，规则与select_rows相同
+
+        Args:
+            df: 源DataFrame或行选择向量
+            mask: 与df逐行对应的布尔掩码（Series或numpy数组）
+            global_context: 全局上下文
+
+        Returns:
+            选中的行
+        """
+        if isinstance(df, RowSelection) or (
+            global_context is not None and global_context.late_materialization
+        ):
+            if isinstance(mask, pd.Series):
+                mask = mask.to_numpy(dtype=bool, na_value=False)
+            return self.select_rows(df, np.flatnonzero(mask), global_context)
+        return df[mask].copy()
+
+    def numeric_column(
+        self,
+        df: Union[pd.DataFrame, RowSelection],
+        column: str,
+        global_context: Optional[GlobalContext] = None,
+    ) -> CoercedColumn:
+        """
+        获取列的数值转换结果
+
+        被多次使用的DataFrame（已加载的sheet）每列只转换一次，结果锚定在DataFrame上，
+        DataFrame被替换或回收时自动失效；行选择向量从源DataFrame的转换结果中按位置取子集
+
+        Args:
+            df: 源DataFrame或行选择向量
+            column: 列名
+            global_context: 全局上下文（提供转换结果缓存）
+
+        Returns:
+            数值转换结果
+        """
+        return self._derived_column(
+            df,
+            column,
+            "numeric_column",
+            CoercedColumn.from_series,
+            lambda coerced, positions: coerced.take(positions),
+            global_context,
+        )
+
+    def string_column(
+        self,
+        df: Union[pd.DataFrame, RowSelection],
+        column: str,
+        global_context: Optional[GlobalContext] = None,
+    ) -> StringColumn:
+        """
+        获取列按字符串比较时的取值（与 column_data.astype(str) 一致），缓存规则与numeric_column相同
+
+        Args:
+            df: 源DataFrame或行选择向量
+            column: 列名
+            global_context: 全局上下文（提供转换结果缓存）
+
+        Returns:
+            按不同取值编码的字符串转换结果
+        """
+        return self._derived_column(
+            df,
+            column,
+            "string_column",
+            StringColumn.from_series,
+            lambda strings, positions: strings.take(positions),
+            global_context,
+        )
+
+    def dictionary_column(
+        self,
+        df: Union[pd.DataFrame, RowSelection],
+        column: str,
+        global_context: Optional[GlobalContext] = None,
+    ) -> Optional[DictionaryColumn]:
+        """
+        获取object列的字典编码，等值比较和集合判断只需对每个不同取值计算一次
+
+        只为被多次使用的DataFrame（已加载的sheet）构建，缓存规则与numeric_column相同
+
+        Args:
+            df: 源DataFrame或行选择向量
+            column: 列名
+            global_context: 全局上下文（提供编码结果缓存）
+
+        Returns:
+            字典编码结果；临时DataFrame、非object列或不同取值太多的列为None
+        """
+        # 不适合编码的列缓存为False，避免每次重新判断
+        dictionary = self._derived_column(
+            df,
+            column,
+            "dictionary_column",
+            lambda column_data: DictionaryColumn.from_series(column_data) or False,
+            lambda dictionary, positions: dictionary and dictionary.take(positions),
+            global_context,
+            cache_only=True,
+        )
+        return dictionary or None
+
+    def sorted_column(
+        self,
+        df: Union[pd.DataFrame, RowSelection],
+        column: str,
+        global_context: Optional[GlobalContext] = None,
+    ) -> Optional[SortedColumn]:
+        """
+        获取数值列的排序索引，范围条件可以用二分查找代替逐行比较
+
+        只为被多次使用的DataFrame（已加载的sheet）在范围过滤时构建，与查找索引一起缓存；
+        行选择向量直接比较选中的行
+
+        Args:
+            df: 源DataFrame
+            column: 列名
+            global_context: 全局上下文（提供索引缓存）
+
+        Returns:
+            排序索引；临时DataFrame、行选择向量和数值转换结果不是int64/float64的列为None
+        """
+        if isinstance(df, RowSelection):
+            return None
+
+        def build(column_data: pd.Series) -> Union[SortedColumn, bool]:
+            values = self.numeric_column(df, column, global_context).numeric.to_numpy()
+            if values.dtype not in (np.int64, np.float64):
+                # 不适合建索引的列缓存为False，避免每次重新判断
+                return False
+            return SortedColumn.from_values(values)
+
+        sorted_column = self._derived_column(
+            df,
+            column,
+            "sorted_column",
+            build,
+            lambda sorted_column, positions: None,
+            global_context,
+            cache_only=True,
+            cache=global_context.index_cache if global_context is not None else None,
+        )
+        return sorted_column or None
+
+    def column_statistics(
+        self,
+        df: Union[pd.DataFrame, RowSelection],
+        column: str,
+        global_context: Optional[GlobalContext] = None,
+    ) -> Optional[ColumnStatistics]:
+        """
+        获取列的统计信息
+
+        统计信息只为被多次使用的DataFrame（已加载的sheet）收集，每列一次；
+        行选择向量使用源DataFrame的统计信息作为估计
+
+        Args:
+            df: 源DataFrame或行选择向量
+            column: 列名
+            global_context: 全局上下文（提供统计信息缓存）
+
+        Returns:
+            统计信息；只使用一次的临时DataFrame不收集，返回None
+        """
+        if global_context is None:
+            return None
+
+        cache = global_context.statistics_cache
+        if isinstance(df, RowSelection):
+            base = df.base
+        elif cache.is_reused(df):
+            base = df
+        else:
+            return None
+
+        return cache.get_or_build(
+            ("column_statistics", id(base), column),
+            lambda: ColumnStatistics.from_series(
+                base[column], self.numeric_column(base, column, global_context).numeric
+            ),
+            anchor=base,
+        )
+
+    @staticmethod
+    def _derived_column(
+        df: Union[pd.DataFrame, RowSelection],
+        column: str,
+        kind: str,
+        build: Callable[[pd.Series], Any],
+        take: Callable[[Any, np.ndarray], Any],
+        global_context: Optional[GlobalContext],
+        cache_only: bool = False,
+        cache: Optional[IndexCache] = None,
+    ) -> Any:
+        """
+        获取从列数据派生的结构，被多次使用的DataFrame每列只构建一次
+
+        Args:
+            df: 源DataFrame或行选择向量
+            column: 列名
+            kind: 派生结构的类型（缓存键的一部分）
+            build: 从列数据构建派生结构
+            take: 按行位置取派生结构的子集
+            global_context: 全局上下文（提供转换结果缓存）
+            cache_only: 只为可缓存的DataFrame构建，其余返回None
+            cache: 存放派生结构的缓存，默认为列转换结果缓存
+
+        Returns:
+            派生结构
+        """
+        if global_context is None:
+            return None if cache_only else build(df[column])
+
+        if cache is None:
+            cache = global_context.coercion_cache
+        if isinstance(df, RowSelection):
+            # 行选择向量的源DataFrame总是被多个选择共享
+            base = df.base
+        elif cache.is_reused(df):
+            base = df
+        else:
+            # 只使用一次的临时DataFrame直接转换，不占用缓存
+            return None if cache_only else build(df[column])
+
+        derived = cache.get_or_build(
+            (kind, id(base), column), lambda: build(base[column]), anchor=base
+        )
+        return take(derived, df.positions) if base is not df else derived
+
+    @staticmethod
+    def materialize(df: Any) -> Any:
+        """将行选择向量物化为DataFrame，其他输入原样返回"""
+        if isinstance(df, RowSelection):
+            return df.to_pandas()
+        return df
+
     def apply_test_mode_limit(
         self, df: pd.DataFrame, global_context: GlobalContext, max_rows: int = 100
     ) -> pd.DataFrame:
@@ -0,0 +1,715 @@
+"""
+行过滤条件编译
+过滤条件列表按配置摘要只解析一次，编译为逐条件的numpy比较内核：
+比较值的类型转换在编译时完成，列的数值转换和字符串转换从缓存获取，
+字符串条件对每个不同取值只计算一次，各条件的掩码原地合并。
+可交换的AND条件按列统计信息估计的代价和选择率排序，后续条件只在结果还可能改变的行上计算。
+已加载sheet中重复取值多的object列使用字典编码，等值和集合条件只对字典计算一次，再比较整数编码；
+只有一段AND条件且最先执行的是选择性高的数值范围条件时，用已加载sheet的排序索引二分查找出候选行，
+其余条件只在候选行上计算。
+内核覆盖不了的条件（扩展类型、非法配置等）交给 RowFilterProcessor 解释执行，结果与逐条解释完全一致
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import ExtensionDtype
+
+from ..utils.column_stats import ColumnStatistics
+from ..utils.numeric_cache import (
+    CoercedColumn,
+    DictionaryColumn,
+    SortedColumn,
+    StringColumn,
+)
+
+_ORDER_OPERATORS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+}
+
+# 比较操作对应的排序索引范围：(比较值是否为下界, 是否包含边界)
+_ORDER_RANGES = {
+    ">": (True, False),
+    ">=": (True, True),
+    "<": (False, False),
+    "<=": (False, True),
+}
+
+# 数值转换后可以直接用numpy比较的dtype
+_NUMERIC_KINDS = "biuf"
+
+# 比较值无法转换为数值
+_NOT_NUMERIC = object()
+
+# 每行的相对计算代价，解释执行的条件代价最高
+_OPERATOR_COST = {
+    "is_null": 1.0,
+    "is_not_null": 1.0,
+    ">": 1.0,
+    ">=": 1.0,
+    "<": 1.0,
+    "<=": 1.0,
+    "between": 1.5,
+    "==": 2.0,
+    "!=": 2.0,
+    "in": 3.0,
+    "not_in": 3.0,
+    "starts_with": 4.0,
+    "ends_with": 4.0,
+    "contains": 6.0,
+    "not_contains": 6.0,
+}
+_INTERPRETED_COST = 20.0
+
+# 没有列统计信息时的选择率估计（满足条件的行比例）
+_DEFAULT_SELECTIVITY = {
+    "is_null": 0.1,
+    "is_not_null": 0.9,
+    "==": 0.1,
+    "!=": 0.9,
+    "in": 0.2,
+    "not_in": 0.8,
+    "not_contains": 0.75,
+}
+_DEFAULT_RANGE_SELECTIVITY = 1 / 3
+_DEFAULT_STRING_SELECTIVITY = 0.25
+
+# 剩余行少于总行数的 1/_SUBSET_RATIO 时只在剩余行上计算条件，否则整列计算
+_SUBSET_RATIO = 4
+
+
+class _UnsupportedColumn(Exception):
+    """列数据的类型不适合numpy内核，回退到解释执行"""
+
+
+def _subset(values: np.ndarray, positions: Optional[np.ndarray]) -> np.ndarray:
+    return values if positions is None else values[positions]
+
+
+class _FrameColumns:
+    """一次过滤中按需获取的列数据，同一列的原始值、各种转换结果和统计信息只获取一次"""
+
+    def __init__(self, processor, df, global_context):
+        self.processor = processor
+        self.df = df
+        self.global_context = global_context
+        self._raw: Dict[str, pd.Series] = {}
+        self._numeric: Dict[str, CoercedColumn] = {}
+        self._strings: Dict[str, StringColumn] = {}
+        self._dictionaries: Dict[str, Optional[DictionaryColumn]] = {}
+        self._sorted: Dict[str, Optional[SortedColumn]] = {}
+        self._statistics: Dict[str, Optional[ColumnStatistics]] = {}
+
+    def raw(self, column: str, positions: Optional[np.ndarray] = None) -> pd.Series:
+        if column not in self._raw:
+            self._raw[column] = self.df[column]
+        column_data = self._raw[column]
+        return column_data if positions is None else column_data.take(positions)
+
+    def numeric(self, column: str) -> CoercedColumn:
+        if column not in self._numeric:
+            self._numeric[column] = self.processor.numeric_column(
+                self.df, column, self.global_context
+            )
+        return self._numeric[column]
+
+    def strings(self, column: str) -> StringColumn:
+        if column not in self._strings:
+            self._strings[column] = self.processor.string_column(
+                self.df, column, self.global_context
+            )
+        strings = self._strings[column]
+        if strings.uniques.dtype != object:
+            raise _UnsupportedColumn(column)
+        return strings
+
+    def dictionary(self, column: str) -> Optional[DictionaryColumn]:
+        if column not in self._dictionaries:
+            self._dictionaries[column] = self.processor.dictionary_column(
+                self.df, column, self.global_context
+            )
+        return self._dictionaries[column]
+
+    def sorted_column(self, column: str) -> Optional[SortedColumn]:
+        if column not in self._sorted:
+            self._sorted[column] = self.processor.sorted_column(
+                self.df, column, self.global_context
+            )
+        return self._sorted[column]
+
+    def statistics(self, column: str) -> Optional[ColumnStatistics]:
+        if column not in self._statistics:
+            self._statistics[column] = self.processor.column_statistics(
+                self.df, column, self.global_context
+            )
+        return self._statistics[column]
+
+    def numeric_values(self, column: str, converted_values: tuple) -> Optional[np.ndarray]:
+        """
+        数值比较使用的列数值，规则与 RowFilterProcessor._safe_numeric_conversion 相同
+        （按整列判断，只计算部分行时也不变）
+
+        Returns:
+            列数值；列中没有非空值、转换成功率低于80%或比较值不是数值时返回None（改用字符串比较）
+        """
+        if any(value is _NOT_NUMERIC for value in converted_values):
+            return None
+        coerced = self.numeric(column)
+        if coerced.non_null_count == 0 or coerced.success_rate < 0.8:
+            return None
+        values = coerced.numeric.to_numpy()
+        if values.dtype.kind not in _NUMERIC_KINDS:
+            raise _UnsupportedColumn(column)
+        return values
+
+
+# 内核：(列数据, 行位置) -> 这些行的布尔掩码；行位置为None表示所有行
+Kernel = Callable[[_FrameColumns, Optional[np.ndarray]], np.ndarray]
+
+
+@dataclass
+class CompiledCondition:
+    """编译后的单个过滤条件"""
+
+    column: str
+    operator: str
+    value: Any
+    logic: Optional[str]  # 与之前条件的连接方式；None表示第一个条件，直接作为掩码
+    kernel: Optional[Kernel]  # None表示解释执行
+    range_bounds: Optional[Dict[str, Any]] = None  # 数值范围条件在排序索引上的范围（SortedColumn.range_slice的参数）
+
+    @property
+    def bounds(self) -> Optional[Tuple[float, float]]:
+        """数值范围条件的取值范围 [lower, upper]，用于估计选择率"""
+        if self.range_bounds is None:
+            return None
+        try:
+            return (
+                float(self.range_bounds.get("lower", -math.inf)),
+                float(self.range_bounds.get("upper", math.inf)),
+            )
+        except (TypeError, ValueError, OverflowError):
+            return None
+
+    @property
+    def cost(self) -> float:
+        if self.kernel is None:
+            return _INTERPRETED_COST
+        return _OPERATOR_COST.get(self.operator, _INTERPRETED_COST)
+
+    def selectivity(self, statistics: Optional[ColumnStatistics]) -> float:
+        """
+        估计满足条件的行比例
+
+        Args:
+            statistics: 列统计信息；None时使用按操作符的默认估计
+
+        Returns:
+            0到1之间的比例
+        """
+        operator = self.operator
+        if operator in _DEFAULT_SELECTIVITY:
+            default = _DEFAULT_SELECTIVITY[operator]
+        elif operator in _ORDER_OPERATORS or operator == "between":
+            default = _DEFAULT_RANGE_SELECTIVITY
+        else:
+            default = _DEFAULT_STRING_SELECTIVITY
+        if statistics is None or statistics.rows == 0:
+            return default
+
+        non_null = statistics.non_null_fraction
+        if operator == "is_null":
+            return 1.0 - non_null
+        if operator == "is_not_null":
+            return non_null
+
+        distinct = max(statistics.distinct_count, 1)
+        if operator in ("==", "!="):
+            equal = non_null / distinct
+            return equal if operator == "==" else 1.0 - equal
+        if operator in ("in", "not_in") and isinstance(self.value, list):
+            matched = non_null * min(len(self.value) / distinct, 1.0)
+            return matched if operator == "in" else 1.0 - matched
+
+        if self.bounds is not None:
+            fraction = statistics.range_fraction(*self.bounds)
+            if fraction is not None:
+                return non_null * fraction
+        return default
+
+
+class CompiledFilter:
+    """编译后的过滤条件列表"""
+
+    def __init__(
+        self,
+        conditions: List[Dict[str, Any]],
+        processor,
+        compiled: Optional[List[CompiledCondition]],
+    ):
+        """
+        Args:
+            conditions: 原始过滤条件
+            processor: 行过滤节点处理器（解释执行和列数据缓存）
+            compiled: 编译后的条件；None表示条件列表结构不合法，整体解释执行以保持原有的错误
+        """
+        self.conditions = conditions
+        self.processor = processor
+        self.compiled = compiled
+        self.segments = self._split_segments(compiled) if compiled is not None else []
+
+    @classmethod
+    def compile(cls, conditions: List[Dict[str, Any]], processor) -> "CompiledFilter":
+        """
+        解析过滤条件列表
+
+        Args:
+            conditions: 过滤条件列表
+            processor: 行过滤节点处理器
+
+        Returns:
+            编译后的过滤条件
+        """
+        compiled = []
+        for i, condition in enumerate(conditions):
+            if not isinstance(condition, dict):
+                return cls(conditions, processor, None)
+            column = condition.get("column")
+            operator = condition.get("operator")
+            value = condition.get("value")
+            logic = condition.get("logic", "AND")
+            if not column or not operator:
+                continue
+
+            if i == 0:
+                logic = None
+            elif not isinstance(logic, str) or logic.upper() not in ("AND", "OR"):
+                return cls(conditions, processor, None)
+            else:
+                logic = logic.upper()
+
+            compiled.append(
+                CompiledCondition(
+                    column=column,
+                    operator=operator,
+                    value=value,
+                    logic=logic,
+                    kernel=cls._compile_kernel(column, operator, value),
+                    range_bounds=cls._range_bounds(operator, value),
+                )
+            )
+        return cls(conditions, processor, compiled)
+
+    @staticmethod
+    def _split_segments(
+        compiled: List[CompiledCondition],
+    ) -> List[List[CompiledCondition]]:
+        """
+        按OR拆分条件：条件从左到右依次合并，因此除第一段外每段以一个OR条件开头，
+        之后的AND条件只与前面的结果做交集，段内的AND条件可以任意交换顺序；
+        第一段的所有条件都是交集，整段可交换
+
+        Returns:
+            条件段列表
+        """
+        segments: List[List[CompiledCondition]] = []
+        for condition in compiled:
+            if condition.logic == "AND" and segments:
+                segments[-1].append(condition)
+            elif condition.logic == "OR" and not segments:
+                # 与全True的掩码做OR，结果仍为全True
+                continue
+            else:
+                segments.append([condition])
+        return segments
+
+    def evaluate(self, df, global_context=None) -> np.ndarray:
+        """
+        计算过滤掩码
+
+        Args:
+            df: 源DataFrame或行选择向量
+            global_context: 全局上下文（提供列转换结果和统计信息的缓存）
+
+        Returns:
+            与df逐行对应的布尔数组
+        """
+        if self.compiled is None:
+            return self.processor._build_filter_mask(
+                df, self.conditions, global_context
+            ).to_numpy(dtype=bool, na_value=False)
+
+        self._check_columns(df)
+        return self._evaluate_mask(_FrameColumns(self.processor, df, global_context))
+
+    def select(self, df, global_context=None) -> np.ndarray:
+        """
+        计算满足条件的行位置
+
+        Args:
+            df: 源DataFrame或行选择向量
+            global_context: 全局上下文（提供列转换结果、统计信息和排序索引的缓存）
+
+        Returns:
+            满足条件的行位置（升序）
+        """
+        if self.compiled is None:
+            return np.flatnonzero(self.evaluate(df, global_context))
+
+        self._check_columns(df)
+        frame = _FrameColumns(self.processor, df, global_context)
+        if len(self.segments) == 1:
+            first, *rest = self._order(self.segments[0], frame)
+            positions = self._range_positions(first, frame)
+            if positions is not None:
+                # 其余AND条件只在候选行上计算
+                for condition in rest:
+                    if len(positions) == 0:
+                        break
+                    positions = positions[self._condition_mask(condition, frame, positions)]
+                return positions
+        return np.flatnonzero(self._evaluate_mask(frame))
+
+    def _check_columns(self, df):
+        # 列检查按原始顺序进行，缺失列的报错与逐条解释一致
+        for condition in self.compiled:
+            if condition.column not in df.columns:
+                raise ValueError(f"Filter column '{condition.column}' not found in DataFrame")
+
+    def _evaluate_mask(self, frame: _FrameColumns) -> np.ndarray:
+        """按条件段计算整体掩码"""
+        if not self.segments:
+            return np.ones(len(frame.df), dtype=bool)
+
+        first, *rest = self._order(self.segments[0], frame)
+        mask = self._condition_mask(first, frame)
+        if not mask.flags.writeable:
+            mask = mask.copy()
+        for condition in rest:
+            self._combine(mask, condition, frame, conjunction=True)
+
+        for segment in self.segments[1:]:
+            self._combine(mask, segment[0], frame, conjunction=False)
+            for condition in self._order(segment[1:], frame):
+                self._combine(mask, condition, frame, conjunction=True)
+        return mask
+
+    @staticmethod
+    def _order(
+        conditions: List[CompiledCondition], frame: _FrameColumns
+    ) -> List[CompiledCondition]:
+        """
+        可交换的AND条件按 代价 / 排除的行比例 升序排列：便宜且排除行多的条件先执行，
+        后续条件需要计算的行更少。估计相同时保持原始顺序
+        """
+        if len(conditions) < 2:
+            return conditions
+
+        def rank(condition: CompiledCondition) -> float:
+            selectivity = condition.selectivity(frame.statistics(condition.column))
+            return condition.cost / max(1.0 - selectivity, 1e-6)
+
+        return sorted(conditions, key=rank)
+
+    @staticmethod
+    def _range_positions(
+        condition: CompiledCondition, frame: _FrameColumns
+    ) -> Optional[np.ndarray]:
+        """
+        用排序索引二分查找数值范围条件满足的行
+
+        Returns:
+            满足条件的行位置（升序）；不是数值比较、没有排序索引或满足的行太多时为None（改为整列比较）
+        """
+        if condition.kernel is None or condition.range_bounds is None:
+            return None
+        try:
+            # 比较值已确定是数值，是否按数值比较只取决于列的转换成功率
+            if frame.numeric_values(condition.column, ()) is None:
+                return None
+            sorted_column = frame.sorted_column(condition.column)
+            if sorted_column is None:
+                return None
+            start, end = sorted_column.range_slice(**condition.range_bounds)
+        except Exception:
+            return None
+
+        if (end - start) * _SUBSET_RATIO >= len(sorted_column.order):
+            return None
+        return sorted_column.positions(start, end)
+
+    def _combine(
+        self,
+        mask: np.ndarray,
+        condition: CompiledCondition,
+        frame: _FrameColumns,
+        conjunction: bool,
+    ):
+        """
+        将一个条件原地合并到掩码：AND只需计算仍为True的行，OR只需计算仍为False的行
+
+        Args:
+            mask: 当前掩码（原地修改）
+            condition: 要合并的条件
+            frame: 列数据
+            conjunction: True为AND，False为OR
+        """
+        pending = mask if conjunction else ~mask
+        pending_count = int(np.count_nonzero(pending))
+        if pending_count == 0:
+            return
+
+        if pending_count * _SUBSET_RATIO >= len(mask):
+            condition_mask = self._condition_mask(condition, frame)
+            if conjunction:
+                np.logical_and(mask, condition_mask, out=mask)
+            else:
+                np.logical_or(mask, condition_mask, out=mask)
+            return
+
+        positions = np.flatnonzero(pending)
+        mask[positions] = self._condition_mask(condition, frame, positions)
+
+    def _condition_mask(
+        self,
+        condition: CompiledCondition,
+        frame: _FrameColumns,
+        positions: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        计算单个条件在指定行上的掩码，内核不适用时解释执行
+
+        Args:
+            condition: 条件
+            frame: 列数据
+            positions: 行位置；None表示所有行
+
+        Returns:
+            与positions逐个对应的布尔数组
+        """
+        if condition.kernel is not None:
+            try:
+                return np.asarray(condition.kernel(frame, positions), dtype=bool)
+            except Exception:
+                # 内核处理不了的数据交给解释执行，解释执行的结果（含出错时的全False）才是标准
+                pass
+
+        # 解释执行的规则依赖整列数据，总是在整列上计算
+        mask = self.processor._build_condition_mask(
+            frame.raw(condition.column),
+            condition.operator,
+            condition.value,
+            partial(frame.numeric, condition.column),
+        )
+        return _subset(mask.to_numpy(dtype=bool, na_value=False), positions)
+
+    @classmethod
+    def _compile_kernel(cls, column: str, operator: str, value: Any) -> Optional[Kernel]:
+        """
+        为单个条件选择比较内核，比较值的转换在这里完成。
+        内核中依赖整列数据的判断（数值比较的转换成功率、直接比较是否全部为空）都在整列上进行，
+        只计算部分行时结果与整列计算后取这些行相同
+
+        Returns:
+            内核函数；None表示该条件需要解释执行
+        """
+        if operator == "is_null":
+            return lambda frame, positions: frame.raw(column, positions).isnull().to_numpy()
+        if operator == "is_not_null":
+            return lambda frame, positions: frame.raw(column, positions).notnull().to_numpy()
+
+        if operator in ("contains", "not_contains", "starts_with", "ends_with"):
+            return cls._string_kernel(column, operator, str(value))
+
+        if operator in ("in", "not_in"):
+            if not isinstance(value, list):
+                return None
+
+            def membership(frame: _FrameColumns, positions: Optional[np.ndarray]) -> np.ndarray:
+                dictionary = frame.dictionary(column)
+                if dictionary is None:
+                    mask = frame.raw(column, positions).isin(value).to_numpy()
+                else:
+                    value_mask = pd.Series(dictionary.dictionary, dtype=object).isin(value)
+                    mask = dictionary.map(value_mask.to_numpy(dtype=bool), False, positions)
+                    # 空值（None、NaN等）是否属于集合取决于具体的空值对象，逐行判断
+                    codes = dictionary.codes if positions is None else dictionary.codes[positions]
+                    null_rows = np.flatnonzero(codes < 0)
+                    if len(null_rows):
+                        null_positions = null_rows if positions is None else positions[null_rows]
+                        mask[null_rows] = frame.raw(column, null_positions).isin(value).to_numpy()
+                return mask if operator == "in" else ~mask
+
+            return membership
+
+        if operator == "between":
+            if not isinstance(value, list) or len(value) != 2:
+                return None
+            bounds = (cls._to_number(value[0]), cls._to_number(value[1]))
+            if bounds[0] is None or bounds[1] is None:
+                return None
+            str_min, str_max = str(value[0]), str(value[1])
+
+            def between(frame: _FrameColumns, positions: Optional[np.ndarray]) -> np.ndarray:
+                values = frame.numeric_values(column, bounds)
+                if values is not None:
+                    values = _subset(values, positions)
+                    return (values >= bounds[0]) & (values <= bounds[1])
+                strings = frame.strings(column)
+                uniques = strings.uniques
+                return strings.map((uniques >= str_min) & (uniques <= str_max), positions)
+
+            return between
+
+        if operator in _ORDER_OPERATORS:
+            compare = _ORDER_OPERATORS[operator]
+            number = cls._to_number(value)
+            if number is None:
+                return None
+            str_value = str(value)
+
+            def order(frame: _FrameColumns, positions: Optional[np.ndarray]) -> np.ndarray:
+                values = frame.numeric_values(column, (number,))
+                if values is not None:
+                    return compare(_subset(values, positions), number)
+                strings = frame.strings(column)
+                return strings.map(compare(strings.uniques, str_value), positions)
+
+            return order
+
+        if operator in ("==", "!="):
+            number = cls._to_number(value)
+            if number is None:
+                return None
+            str_value = str(value)
+            equal = operator == "=="
+
+            def equality(frame: _FrameColumns, positions: Optional[np.ndarray]) -> np.ndarray:
+                # 首先直接比较，结果全部为空时按数值或字符串比较
+                dictionary = frame.dictionary(column)
+                if dictionary is not None:
+                    try:
+                        return cls._dictionary_equality(dictionary, value, equal, positions)
+                    except (TypeError, ValueError):
+                        pass
+
+                column_data = frame.raw(column)
+                if positions is not None and not isinstance(column_data.dtype, ExtensionDtype):
+                    # numpy类型的直接比较结果不会为空，可以只比较部分行
+                    compared, compared_positions = frame.raw(column, positions), None
+                else:
+                    compared, compared_positions = column_data, positions
+                try:
+                    mask = compared == value if equal else compared != value
+                    if isinstance(mask, pd.Series) and not mask.isna().all():
+                        return _subset(
+                            mask.to_numpy(dtype=bool, na_value=False), compared_positions
+                        )
+                except (TypeError, ValueError):
+                    pass
+
+                values = frame.numeric_values(column, (number,))
+                if values is not None:
+                    values = _subset(values, positions)
+                    return values == number if equal else values != number
+                strings = frame.strings(column)
+                uniques = strings.uniques
+                return strings.map(
+                    uniques == str_value if equal else uniques != str_value, positions
+                )
+
+            return equality
+
+        return None
+
+    @staticmethod
+    def _dictionary_equality(
+        dictionary: DictionaryColumn,
+        value: Any,
+        equal: bool,
+        positions: Optional[np.ndarray],
+    ) -> np.ndarray:
+        """
+        字典编码列的直接比较：比较值只与每个不同取值比较一次，
+        只匹配一个取值时直接比较整数编码（object列直接比较时空值行 == 为False、!= 为True）
+        """
+        dictionary_values = pd.Series(dictionary.dictionary, dtype=object)
+        value_mask = dictionary_values == value if equal else dictionary_values != value
+        value_mask = value_mask.to_numpy(dtype=bool)
+
+        codes = dictionary.codes if positions is None else dictionary.codes[positions]
+        matched = np.flatnonzero(value_mask if equal else ~value_mask)
+        if len(matched) == 1:
+            return codes == matched[0] if equal else codes != matched[0]
+        return dictionary.map(value_mask, not equal, positions)
+
+    @staticmethod
+    def _string_kernel(column: str, operator: str, str_value: str) -> Optional[Kernel]:
+        """字符串条件内核，逐元素调用与pandas字符串方法相同的str操作"""
+        if operator in ("contains", "not_contains"):
+            try:
+                pattern = re.compile(str_value)
+            except re.error:
+                return None
+            matches = lambda text: pattern.search(text) is not None
+        elif operator == "starts_with":
+            matches = lambda text: text.startswith(str_value)
+        else:
+            matches = lambda text: text.endswith(str_value)
+
+        def kernel(frame: _FrameColumns, positions: Optional[np.ndarray]) -> np.ndarray:
+            # 每个不同的取值只匹配一次
+            strings = frame.strings(column)
+            uniques = strings.uniques
+            mask = np.fromiter(map(matches, uniques), dtype=bool, count=len(uniques))
+            return strings.map(~mask if operator == "not_contains" else mask, positions)
+
+        return kernel
+
+    @classmethod
+    def _range_bounds(cls, operator: str, value: Any) -> Optional[Dict[str, Any]]:
+        """数值范围条件在排序索引上的范围，比较值不是数值的条件为None"""
+        if operator == "between":
+            if not isinstance(value, list) or len(value) != 2:
+                return None
+            lower, upper = cls._to_number(value[0]), cls._to_number(value[1])
+            if not cls._is_number(lower) or not cls._is_number(upper):
+                return None
+            return {"lower": lower, "upper": upper}
+        if operator in _ORDER_RANGES:
+            number = cls._to_number(value)
+            if not cls._is_number(number):
+                return None
+            is_lower, inclusive = _ORDER_RANGES[operator]
+            if is_lower:
+                return {"lower": number, "lower_inclusive": inclusive}
+            return {"upper": number, "upper_inclusive": inclusive}
+        return None
+
+    @staticmethod
+    def _is_number(converted: Any) -> bool:
+        return converted is not None and converted is not _NOT_NUMERIC
+
+    @staticmethod
+    def _to_number(value: Any) -> Any:
+        """
+        在编译时转换比较值，与 pd.to_numeric(value, errors='raise') 相同
+
+        Returns:
+            转换后的数值标量；无法转换时为 _NOT_NUMERIC；转换结果不是标量时为None（需要解释执行）
+        """
+        try:
+            converted = pd.to_numeric(value, errors="raise")
+        except Exception:
+            return _NOT_NUMERIC
+        if isinstance(converted, (bool, int, float, np.bool_, np.number)):
+            return converted
+        return None
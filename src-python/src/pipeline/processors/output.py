@@ -257,7 +257,7 @@ class OutputProcessor(AbstractNodeProcessor[OutputInput, OutputResult]):
 
             sheet_data = SheetData(
                 sheet_name=sheet_name,
-                dataframe=dataframe,
+                dataframe=self.materialize(dataframe),
                 branch_id=branch_id,
                 source_name=f"{source_name}-{index_value}",
             )
@@ -277,7 +277,7 @@ class OutputProcessor(AbstractNodeProcessor[OutputInput, OutputResult]):
         """
         return SheetData(
             sheet_name=sheet_name,
-            dataframe=branch_dataframe,
+            dataframe=self.materialize(branch_dataframe),
             branch_id=branch_id,
             source_name=source_name,
         )
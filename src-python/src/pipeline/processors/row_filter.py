@@ -4,20 +4,30 @@
 """
 
 import pandas as pd
-from typing import List, Dict, Any, Tuple
+from functools import partial
+from typing import List, Dict, Any, Callable, Optional, Tuple, Union
 
 from .base import AbstractNodeProcessor
+from .compiled_filter import CompiledFilter
+from ..utils.index_cache import IndexCache
+from ..utils.numeric_cache import CoercedColumn
+from ..utils.sheet_cache import predicate_key
 from ..models import (
     BaseNode, RowFilterInput, RowFilterOutput, DataFrame,
-    GlobalContext, PathContext, BranchContext, NodeType
+    GlobalContext, PathContext, BranchContext, NodeType, RowSelection
 )
 
+# 获取列数值转换结果的无参函数
+NumericColumnProvider = Optional[Callable[[], CoercedColumn]]
+
 
 class RowFilterProcessor(AbstractNodeProcessor[RowFilterInput, RowFilterOutput]):
     """行过滤节点处理器"""
     
     def __init__(self):
         super().__init__(NodeType.ROW_FILTER)
+        # 按条件配置摘要缓存编译后的过滤条件
+        self._compiled_filters = IndexCache(max_entries=256)
     
     def process(
         self,
@@ -45,18 +55,17 @@ class RowFilterProcessor(AbstractNodeProcessor[RowFilterInput, RowFilterOutput])
             data = node.data
             conditions = data.get("conditions", [])
             
-            # 获取pandas DataFrame（支持两种输入类型）
-            if hasattr(input_data.dataframe, 'to_pandas'):
-                pandas_df = input_data.dataframe.to_pandas()
-            else:
-                pandas_df = input_data.dataframe  # 已经是pandas DataFrame
+            # 获取pandas DataFrame（支持自定义DataFrame和行选择向量）
+            pandas_df = self.as_input_frame(input_data.dataframe)
             
             if not conditions:
                 # 无过滤条件，返回原DataFrame
                 filtered_df = pandas_df
             else:
                 # 应用过滤条件
-                filtered_df = self._apply_filter_conditions(pandas_df, conditions)
+                filtered_df = self._apply_filter_conditions(
+                    pandas_df, conditions, global_context
+                )
             
             # 应用测试模式限制
             # filtered_df = self.apply_test_mode_limit(filtered_df, global_context)
@@ -79,17 +88,34 @@ class RowFilterProcessor(AbstractNodeProcessor[RowFilterInput, RowFilterOutput])
             self.analyzer.onError(exec_id, str(e))
             raise e
     
+    def filter_dataframe(
+        self, df: pd.DataFrame, conditions: List[Dict[str, Any]]
+    ) -> pd.DataFrame:
+        """
+        按过滤条件过滤DataFrame（供加载阶段的谓词下推复用，与节点执行结果一致）
+
+        Args:
+            df: 源DataFrame
+            conditions: 过滤条件列表
+
+        Returns:
+            过滤后的DataFrame
+        """
+        return self._apply_filter_conditions(df, conditions)
+
     def _apply_filter_conditions(
         self, 
-        df: pd.DataFrame, 
-        conditions: List[Dict[str, Any]]
-    ) -> pd.DataFrame:
+        df: Union[pd.DataFrame, RowSelection], 
+        conditions: List[Dict[str, Any]],
+        global_context: Optional[GlobalContext] = None
+    ) -> Union[pd.DataFrame, RowSelection]:
         """
         应用过滤条件
         
         Args:
-            df: 源DataFrame
+            df: 源DataFrame或行选择向量
             conditions: 过滤条件列表
+            global_context: 全局上下文（启用延迟物化时返回行选择向量）
             
         Returns:
             过滤后的DataFrame
@@ -97,6 +123,41 @@ class RowFilterProcessor(AbstractNodeProcessor[RowFilterInput, RowFilterOutput])
         if not conditions:
             return df
         
+        positions = self.compile_filter(conditions).select(df, global_context)
+        return self.select_rows(df, positions, global_context)
+    
+    def compile_filter(self, conditions: List[Dict[str, Any]]) -> CompiledFilter:
+        """
+        获取过滤条件的编译结果，相同配置的条件只编译一次
+        
+        Args:
+            conditions: 过滤条件列表
+            
+        Returns:
+            编译后的过滤条件
+        """
+        return self._compiled_filters.get_or_build(
+            ("row_filter", predicate_key(conditions)),
+            lambda: CompiledFilter.compile(conditions, self),
+        )
+    
+    def _build_filter_mask(
+        self,
+        df: Union[pd.DataFrame, RowSelection],
+        conditions: List[Dict[str, Any]],
+        global_context: Optional[GlobalContext] = None
+    ) -> pd.Series:
+        """
+        按条件及其逻辑连接构建整体的行掩码（逐条解释执行，编译结果无法处理的条件列表使用）
+        
+        Args:
+            df: 源DataFrame或行选择向量
+            conditions: 过滤条件列表（非空）
+            global_context: 全局上下文（提供列数值转换结果缓存）
+            
+        Returns:
+            与df逐行对应的布尔掩码
+        """
         # 初始化mask为全True
         mask = pd.Series([True] * len(df), index=df.index)
         
@@ -113,7 +174,11 @@ class RowFilterProcessor(AbstractNodeProcessor[RowFilterInput, RowFilterOutput])
                 raise ValueError(f"Filter column '{column}' not found in DataFrame")
             
             # 构建单个条件的mask
-            condition_mask = self._build_condition_mask(df[column], operator, value)
+            # 数值转换只在数值比较时按需获取，同一sheet的列只转换一次
+            numeric_column = partial(self.numeric_column, df, column, global_context)
+            condition_mask = self._build_condition_mask(
+                df[column], operator, value, numeric_column
+            )
             
             # 合并条件
             if i == 0:
@@ -126,14 +191,14 @@ class RowFilterProcessor(AbstractNodeProcessor[RowFilterInput, RowFilterOutput])
                 else:
                     raise ValueError(f"Unknown logic operator: {logic}")
         
-        # 应用过滤
-        return df[mask].copy()
+        return mask
     
     def _build_condition_mask(
         self, 
         column_data: pd.Series, 
         operator: str, 
-        value: Any
+        value: Any,
+        numeric_column: NumericColumnProvider = None
     ) -> pd.Series:
         """
         构建单个条件的mask（类型安全版本）
@@ -142,6 +207,7 @@ class RowFilterProcessor(AbstractNodeProcessor[RowFilterInput, RowFilterOutput])
             column_data: 列数据
             operator: 操作符
             value: 比较值
+            numeric_column: 获取列数值转换结果的函数，None表示直接转换column_data
             
         Returns:
             条件mask
@@ -163,11 +229,15 @@ class RowFilterProcessor(AbstractNodeProcessor[RowFilterInput, RowFilterOutput])
             
             # 范围操作符
             if operator == "between":
-                return self._build_range_condition_mask(column_data, value)
+                return self._build_range_condition_mask(
+                    column_data, value, numeric_column
+                )
             
             # 比较操作符（需要类型安全处理）
             if operator in ["==", "!=", ">", ">=", "<", "<="]:
-                return self._build_comparison_condition_mask(column_data, operator, value)
+                return self._build_comparison_condition_mask(
+                    column_data, operator, value, numeric_column
+                )
             
             else:
                 raise ValueError(f"Unknown filter operator: {operator}")
@@ -233,7 +303,8 @@ class RowFilterProcessor(AbstractNodeProcessor[RowFilterInput, RowFilterOutput])
     def _build_range_condition_mask(
         self, 
         column_data: pd.Series, 
-        value: Any
+        value: Any,
+        numeric_column: NumericColumnProvider = None
     ) -> pd.Series:
         """构建范围条件mask"""
         try:
@@ -244,7 +315,7 @@ class RowFilterProcessor(AbstractNodeProcessor[RowFilterInput, RowFilterOutput])
             
             # 尝试数值比较
             converted_data, converted_min, converted_max, success = self._safe_numeric_conversion(
-                column_data, min_val, max_val
+                column_data, min_val, max_val, numeric_column=numeric_column
             )
             
             if success:
@@ -262,14 +333,15 @@ class RowFilterProcessor(AbstractNodeProcessor[RowFilterInput, RowFilterOutput])
         self, 
         column_data: pd.Series, 
         operator: str, 
-        value: Any
+        value: Any,
+        numeric_column: NumericColumnProvider = None
     ) -> pd.Series:
         """构建比较条件mask（类型安全）"""
         try:
             # 尝试数值比较
             if operator in [">", ">=", "<", "<="]:
                 converted_data, converted_value, success = self._safe_numeric_comparison_conversion(
-                    column_data, value
+                    column_data, value, numeric_column
                 )
                 
                 if success:
@@ -297,7 +369,9 @@ class RowFilterProcessor(AbstractNodeProcessor[RowFilterInput, RowFilterOutput])
                         
                 except (TypeError, ValueError):
                     # 直接比较失败，尝试类型转换后比较
-                    return self._safe_equality_comparison(column_data, operator, value)
+                    return self._safe_equality_comparison(
+                        column_data, operator, value, numeric_column
+                    )
             
             else:
                 raise ValueError(f"Unknown comparison operator: {operator}")
@@ -308,29 +382,35 @@ class RowFilterProcessor(AbstractNodeProcessor[RowFilterInput, RowFilterOutput])
     def _safe_numeric_conversion(
         self, 
         column_data: pd.Series, 
-        *values
+        *values,
+        numeric_column: NumericColumnProvider = None
     ) -> Tuple:
         """
         安全的数值转换
         
+        Args:
+            column_data: 列数据
+            values: 比较值
+            numeric_column: 获取列数值转换结果（含成功率）的函数，None表示直接转换column_data
+        
         Returns:
             (converted_data, *converted_values, success)
         """
         try:
+            coerced = (
+                numeric_column()
+                if numeric_column is not None
+                else CoercedColumn.from_series(column_data)
+            )
+            
             # 检查是否有非空数据
-            non_null_count = column_data.notna().sum()
-            if non_null_count == 0:
+            if coerced.non_null_count == 0:
                 # 如果所有数据都是空值，无法进行数值转换
                 return (column_data, *values, False)
             
-            # 尝试转换列数据
-            converted_data = pd.to_numeric(column_data, errors='coerce')
-            
-            # 计算转换成功率
-            converted_count = converted_data.notna().sum()
-            success_rate = converted_count / non_null_count if non_null_count > 0 else 0.0
+            converted_data = coerced.numeric
             
-            if success_rate < 0.8:  # 成功率低于80%，认为不适合数值比较
+            if coerced.success_rate < 0.8:  # 成功率低于80%，认为不适合数值比较
                 return (column_data, *values, False)
             
             # 转换比较值
@@ -351,22 +431,26 @@ class RowFilterProcessor(AbstractNodeProcessor[RowFilterInput, RowFilterOutput])
     def _safe_numeric_comparison_conversion(
         self, 
         column_data: pd.Series, 
-        value: Any
+        value: Any,
+        numeric_column: NumericColumnProvider = None
     ) -> Tuple[pd.Series, Any, bool]:
         """安全的数值比较转换"""
-        return self._safe_numeric_conversion(column_data, value)[:3]
+        return self._safe_numeric_conversion(
+            column_data, value, numeric_column=numeric_column
+        )[:3]
     
     def _safe_equality_comparison(
         self, 
         column_data: pd.Series, 
         operator: str, 
-        value: Any
+        value: Any,
+        numeric_column: NumericColumnProvider = None
     ) -> pd.Series:
         """安全的等值比较"""
         try:
             # 尝试数值转换
             converted_data, converted_value, numeric_success = self._safe_numeric_comparison_conversion(
-                column_data, value
+                column_data, value, numeric_column
             )
             
             if numeric_success:
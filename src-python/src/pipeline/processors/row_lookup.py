@@ -3,9 +3,15 @@
 选择目标文件中的一个列，返回包含所有与索引项匹配的行的DataFrame
 """
 
+from typing import Dict, Optional, Union
+
+import numpy as np
 import pandas as pd
 
 from .base import AbstractNodeProcessor
+from ..utils.index_cache import IndexCache
+from ..utils.numeric_cache import StringColumn
+from ..utils.pattern_matcher import SUPPORTED_MODES, MultiPatternMatcher
 from ..models import (
     BaseNode,
     RowLookupInput,
@@ -15,9 +21,16 @@ from ..models import (
     PathContext,
     BranchContext,
     NodeType,
+    RowSelection,
 )
 
 
+_EMPTY_POSITIONS = np.empty(0, dtype=np.intp)
+
+# 索引值较少时逐个向量化扫描更快，批量匹配只在索引值足够多时启用
+_MIN_BATCH_PATTERNS = 16
+
+
 class RowLookupProcessor(AbstractNodeProcessor[RowLookupInput, RowLookupOutput]):
     """行查找节点处理器"""
 
@@ -57,11 +70,8 @@ class RowLookupProcessor(AbstractNodeProcessor[RowLookupInput, RowLookupOutput])
             if not lookup_column:
                 raise ValueError("lookupColumn is required for row lookup node")
 
-            # 获取pandas DataFrame（支持两种输入类型）
-            if hasattr(input_data.dataframe, "to_pandas"):
-                pandas_df = input_data.dataframe.to_pandas()
-            else:
-                pandas_df = input_data.dataframe  # 已经是pandas DataFrame
+            # 获取pandas DataFrame（支持自定义DataFrame和行选择向量）
+            pandas_df = self.as_input_frame(input_data.dataframe)
 
             # 验证查找列存在
             if lookup_column not in pandas_df.columns:
@@ -70,13 +80,35 @@ class RowLookupProcessor(AbstractNodeProcessor[RowLookupInput, RowLookupOutput])
                 )
 
             # 执行查找匹配
-            matched_df = self._find_matching_rows(
-                pandas_df,
-                lookup_column,
-                input_data.index_value,
-                match_mode,
-                case_sensitive,
-            )
+            if match_mode == "exact":
+                # 精确匹配使用按sheet缓存的哈希索引，避免逐个索引值扫描整列
+                matched_df = self._find_exact_matching_rows(
+                    pandas_df,
+                    lookup_column,
+                    input_data.index_value,
+                    case_sensitive,
+                    global_context,
+                )
+            else:
+                # 子串类匹配优先一次性匹配分支内的所有索引值
+                matched_df = self._find_batched_matching_rows(
+                    pandas_df,
+                    lookup_column,
+                    input_data.index_value,
+                    match_mode,
+                    case_sensitive,
+                    global_context,
+                    branch_context,
+                )
+                if matched_df is None:
+                    matched_df = self._find_matching_rows(
+                        pandas_df,
+                        lookup_column,
+                        input_data.index_value,
+                        match_mode,
+                        case_sensitive,
+                        global_context,
+                    )
 
             # 应用测试模式限制
             # matched_df = self.apply_test_mode_limit(matched_df, global_context)
@@ -98,6 +130,148 @@ class RowLookupProcessor(AbstractNodeProcessor[RowLookupInput, RowLookupOutput])
             self.analyzer.onError(exec_id, str(e))
             raise e
 
+    def get_exact_match_index(
+        self,
+        df: pd.DataFrame,
+        lookup_column: str,
+        case_sensitive: bool,
+        global_context: GlobalContext,
+    ) -> Dict[str, np.ndarray]:
+        """
+        获取查找列的哈希索引：规范化键 -> 行位置数组，每个DataFrame和列只构建一次
+
+        Args:
+            df: 源DataFrame
+            lookup_column: 查找列名
+            case_sensitive: 是否大小写敏感
+            global_context: 全局上下文（提供索引缓存）
+
+        Returns:
+            键到行位置的映射
+        """
+
+        def build_index() -> Dict[str, np.ndarray]:
+            # 与 _find_matching_rows 相同的规范化方式，只对每个不同取值规范化一次，再按整数编码分组
+            strings = self.string_column(df, lookup_column, global_context)
+            keys = self._normalized_keys(strings, case_sensitive)
+            key_codes, key_values = pd.factorize(keys)
+            row_codes = key_codes[strings.codes]
+            order = np.argsort(row_codes, kind="stable")
+            counts = np.bincount(row_codes, minlength=len(key_values))
+            return dict(zip(key_values, np.split(order, np.cumsum(counts)[:-1])))
+
+        cache_key = ("row_lookup_exact", id(df), lookup_column, case_sensitive)
+        return global_context.index_cache.get_or_build(cache_key, build_index, anchor=df)
+
+    @staticmethod
+    def _normalized_keys(strings: StringColumn, case_sensitive: bool) -> np.ndarray:
+        """查找列每个不同字符串取值规范化后的键"""
+        keys = pd.Series(strings.uniques, dtype=object)
+        if not case_sensitive:
+            keys = keys.str.lower()
+        return keys.to_numpy()
+
+    def _find_exact_matching_rows(
+        self,
+        df: pd.DataFrame,
+        lookup_column: str,
+        index_value: str,
+        case_sensitive: bool,
+        global_context: GlobalContext,
+    ) -> pd.DataFrame:
+        """
+        使用哈希索引查找精确匹配的行
+
+        Args:
+            df: 源DataFrame
+            lookup_column: 查找列名
+            index_value: 索引值（查找目标）
+            case_sensitive: 是否大小写敏感
+            global_context: 全局上下文
+
+        Returns:
+            匹配的行组成的DataFrame
+        """
+        if not global_context.index_cache.is_reused(df):
+            # 第一次出现的DataFrame可能是逐索引生成的临时结果，直接扫描比构建索引更快
+            return self._find_matching_rows(
+                df, lookup_column, index_value, "exact", case_sensitive, global_context
+            )
+
+        positions_by_key = self.get_exact_match_index(
+            df, lookup_column, case_sensitive, global_context
+        )
+        search_value = str(index_value)
+        if not case_sensitive:
+            search_value = search_value.lower()
+
+        positions = positions_by_key.get(search_value, _EMPTY_POSITIONS)
+        return self.select_rows(df, positions, global_context)
+
+    def _find_batched_matching_rows(
+        self,
+        df: pd.DataFrame,
+        lookup_column: str,
+        index_value: str,
+        match_mode: str,
+        case_sensitive: bool,
+        global_context: GlobalContext,
+        branch_context: Optional[BranchContext],
+    ) -> Optional[pd.DataFrame]:
+        """
+        使用多模式匹配器一次性计算分支内所有索引值的匹配行，再按当前索引值取行
+
+        Args:
+            df: 源DataFrame
+            lookup_column: 查找列名
+            index_value: 索引值（查找目标）
+            match_mode: 匹配模式
+            case_sensitive: 是否大小写敏感
+            global_context: 全局上下文
+            branch_context: 分支上下文（提供分支内的全部索引值）
+
+        Returns:
+            匹配的行组成的DataFrame；不适用批量匹配时返回None
+        """
+        if match_mode not in SUPPORTED_MODES or branch_context is None:
+            return None
+
+        index_values = branch_context.branch_metadata.get("index_values")
+        if not index_values or len(index_values) < _MIN_BATCH_PATTERNS:
+            return None
+
+        # 只对被多个索引值复用的DataFrame构建批量匹配结果
+        if not global_context.index_cache.is_reused(df):
+            return None
+
+        def normalize(value) -> str:
+            value = str(value)
+            return value if case_sensitive else value.lower()
+
+        def build_matches() -> Dict[str, np.ndarray]:
+            keys = df[lookup_column].astype(str)
+            if not case_sensitive:
+                keys = keys.str.lower()
+            matcher = MultiPatternMatcher(
+                [normalize(value) for value in index_values], match_mode
+            )
+            return matcher.match_series(keys)
+
+        lookup_cache = branch_context.branch_metadata.setdefault(
+            "lookup_cache", IndexCache()
+        )
+        matches = lookup_cache.get_or_build(
+            ("row_lookup_batch", id(df), lookup_column, match_mode, case_sensitive),
+            build_matches,
+            anchor=df,
+        )
+
+        positions = matches.get(normalize(index_value))
+        if positions is None:
+            # 含正则元字符等不支持批量匹配的模式
+            return None
+        return self.select_rows(df, positions, global_context)
+
     def _find_matching_rows(
         self,
         df: pd.DataFrame,
@@ -105,23 +279,35 @@ class RowLookupProcessor(AbstractNodeProcessor[RowLookupInput, RowLookupOutput])
         index_value: str,
         match_mode: str,
         case_sensitive: bool,
-    ) -> pd.DataFrame:
+        global_context: Optional[GlobalContext] = None,
+    ) -> Union[pd.DataFrame, RowSelection]:
         """
         查找匹配的行
 
         Args:
-            df: 源DataFrame
+            df: 源DataFrame或行选择向量
             lookup_column: 查找列名
             index_value: 索引值（查找目标）
             match_mode: 匹配模式
             case_sensitive: 是否大小写敏感
+            global_context: 全局上下文（启用延迟物化时返回行选择向量）
 
         Returns:
             匹配的行组成的DataFrame
         """
+        search_value = str(index_value)
+        if match_mode == "exact" and isinstance(df, RowSelection) and global_context is not None:
+            # 源sheet的查找列已按不同取值编码：比较值只与不同取值比较，再比较整数编码
+            strings = self.string_column(df, lookup_column, global_context)
+            if not case_sensitive:
+                search_value = search_value.lower()
+            matched = np.flatnonzero(
+                self._normalized_keys(strings, case_sensitive) == search_value
+            )
+            return self.select_mask(df, np.isin(strings.codes, matched), global_context)
+
         # 获取查找列数据
         column_data = df[lookup_column].astype(str)
-        search_value = str(index_value)
 
         # 处理大小写敏感性
         if not case_sensitive:
@@ -147,7 +333,7 @@ class RowLookupProcessor(AbstractNodeProcessor[RowLookupInput, RowLookupOutput])
             raise ValueError(f"Unknown match mode: {match_mode}")
 
         # 返回匹配的行
-        return df[mask].copy()
+        return self.select_mask(df, mask, global_context)
 
     def validate_node_config(self, node: BaseNode) -> bool:
         """验证节点配置"""
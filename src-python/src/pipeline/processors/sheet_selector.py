@@ -3,6 +3,8 @@ Sheet选择器节点处理器
 根据索引值选择对应的Sheet并返回DataFrame
 """
 
+from typing import Dict
+
 import pandas as pd
 
 from .base import AbstractNodeProcessor
@@ -94,8 +96,9 @@ class SheetSelectorProcessor(
                 )
 
             # 加载DataFrame
+            # 执行计划改写时下推到此的行过滤条件
             pandas_df = self.load_dataframe_from_file(
-                global_context, target_file_id, sheet_name
+                global_context, target_file_id, sheet_name, data.get("pushedFilters")
             )
 
             # 更新路径上下文
@@ -133,25 +136,54 @@ class SheetSelectorProcessor(
         Returns:
             匹配的sheet名
         """
+        value_to_sheet = global_context.index_cache.get_or_build(
+            ("sheet_column_match", file_info.id, match_column),
+            lambda: self._build_column_match_index(
+                file_info, match_column, global_context
+            ),
+        )
+
+        sheet_name = value_to_sheet.get(str(index_value))
+        if sheet_name is not None:
+            return sheet_name
+
+        raise ValueError(
+            f"No sheet found with column '{match_column}' containing value '{index_value}'"
+        )
+
+    def _build_column_match_index(
+        self,
+        file_info,
+        match_column: str,
+        global_context: GlobalContext,
+    ) -> Dict[str, str]:
+        """
+        构建文件的反向索引：匹配列中的值 -> 第一个包含该值的sheet名
+
+        Args:
+            file_info: 文件信息
+            match_column: 匹配列名
+            global_context: 全局上下文
+
+        Returns:
+            值到sheet名的映射（按sheet顺序，先出现的sheet优先）
+        """
+        value_to_sheet = {}
         for sheet_meta in file_info.sheet_metas:
             sheet_name = sheet_meta["sheet_name"]
             try:
-                # 加载sheet并检查是否包含匹配值
                 df = self.load_dataframe_from_file(
                     global_context, file_info.id, sheet_name
                 )
-
-                if match_column in df.columns:
-                    # 检查该列是否包含索引值
-                    if index_value in df[match_column].astype(str).values:
-                        return sheet_name
             except Exception:
                 # 如果加载失败，跳过这个sheet
                 continue
 
-        raise ValueError(
-            f"No sheet found with column '{match_column}' containing value '{index_value}'"
-        )
+            if match_column in df.columns:
+                for value in df[match_column].astype(str).unique():
+                    value_to_sheet.setdefault(value, sheet_name)
+
+        return value_to_sheet
 
     def validate_node_config(self, node: BaseNode) -> bool:
         """验证节点配置"""
@@ -8,10 +8,35 @@ from .data_cleaner import (
     clean_dataframe_with_smart_strategy, 
     create_conservative_cleaner
 )
+from .index_cache import IndexCache
+from .numeric_cache import CoercedColumn, DictionaryColumn, StringColumn
+from .column_stats import ColumnStatistics
+from .excel_reader import read_sheet, read_workbook_sheets
+from .sheet_cache import (
+    SheetDiskCache,
+    SheetMemoryCache,
+    configure_sheet_cache,
+    configure_sheet_memory_cache,
+    get_sheet_cache,
+    get_sheet_memory_cache
+)
 
 __all__ = [
     'SmartDataCleaner',
     'CleaningConfig', 
     'clean_dataframe_with_smart_strategy',
-    'create_conservative_cleaner'
+    'create_conservative_cleaner',
+    'IndexCache',
+    'CoercedColumn',
+    'StringColumn',
+    'DictionaryColumn',
+    'ColumnStatistics',
+    'read_sheet',
+    'read_workbook_sheets',
+    'SheetDiskCache',
+    'configure_sheet_cache',
+    'get_sheet_cache',
+    'SheetMemoryCache',
+    'configure_sheet_memory_cache',
+    'get_sheet_memory_cache'
 ] 
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+列统计信息
+已加载sheet的每列在首次被过滤时收集一次空值数、不同值个数和数值范围，
+用于估计过滤条件的选择率，决定AND条件的执行顺序
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+
+
+@dataclass
+class ColumnStatistics:
+    """一列的统计信息"""
+
+    rows: int
+    null_count: int
+    distinct_count: int  # 非空的不同取值个数
+    minimum: Optional[float]  # 数值转换后的最小值，没有数值时为None
+    maximum: Optional[float]  # 数值转换后的最大值，没有数值时为None
+
+    @classmethod
+    def from_series(
+        cls, column_data: pd.Series, numeric: Optional[pd.Series] = None
+    ) -> "ColumnStatistics":
+        """
+        收集一列数据的统计信息
+
+        Args:
+            column_data: 原始列数据
+            numeric: 列的数值转换结果（已缓存时传入，避免重复转换）
+
+        Returns:
+            统计信息
+        """
+        if numeric is None:
+            numeric = pd.to_numeric(column_data, errors="coerce")
+
+        minimum = maximum = None
+        if numeric.dtype.kind in "biuf" and numeric.notna().any():
+            minimum = float(numeric.min())
+            maximum = float(numeric.max())
+
+        return cls(
+            rows=len(column_data),
+            null_count=int(column_data.isna().sum()),
+            distinct_count=int(column_data.nunique(dropna=True)),
+            minimum=minimum,
+            maximum=maximum,
+        )
+
+    @property
+    def non_null_fraction(self) -> float:
+        """非空值所占比例"""
+        if self.rows == 0:
+            return 0.0
+        return 1.0 - self.null_count / self.rows
+
+    def range_fraction(self, lower: float, upper: float) -> Optional[float]:
+        """
+        估计数值落在 [lower, upper] 内的非空行比例（假设数值均匀分布）
+
+        Args:
+            lower: 下界（可为-inf）
+            upper: 上界（可为inf）
+
+        Returns:
+            比例估计；列中没有数值时为None
+        """
+        if self.minimum is None or self.maximum is None:
+            return None
+        if self.maximum == self.minimum:
+            return 1.0 if lower <= self.minimum <= upper else 0.0
+        overlap = min(upper, self.maximum) - max(lower, self.minimum)
+        return min(max(overlap / (self.maximum - self.minimum), 0.0), 1.0)
@@ -13,6 +13,9 @@ from abc import ABC, abstractmethod
 
 logger = logging.getLogger(__name__)
 
+# 清洗逻辑版本号，修改清洗结果的行为时递增，使持久化的Sheet缓存失效
+CLEANING_VERSION = 1
+
 @dataclass
 class CleaningConfig:
     """数据清洗配置"""
@@ -137,74 +140,141 @@ class SmartDataCleaner:
         return final_series
     
     def _basic_cleaning(self, series: pd.Series, log: Dict) -> pd.Series:
-        """基础清理：去空格、标准化null值，但不改变数据类型"""
-        cleaned = series.copy()
-        changes = 0
-        
-        if series.dtype == 'object':
-            # 只对object类型进行字符串清理
-            if self.config.trim_strings:
-                before_trim = cleaned.copy()
-                # 安全的字符串处理
-                string_mask = cleaned.notna() & (cleaned.astype(str) != 'nan')
-                if string_mask.any():
-                    cleaned.loc[string_mask] = cleaned.loc[string_mask].astype(str).str.strip()
-                    trim_changes = (before_trim != cleaned).sum()
-                    changes += trim_changes
-                    if trim_changes > 0:
-                        log['steps'].append({
-                            'step': 'trim_strings',
-                            'changes': trim_changes,
-                            'action': '去除首尾空格'
-                        })
-            
-            if self.config.normalize_whitespace:
-                before_normalize = cleaned.copy()
-                string_mask = cleaned.notna() & (cleaned.astype(str) != 'nan')
-                if string_mask.any():
-                    cleaned.loc[string_mask] = cleaned.loc[string_mask].astype(str).str.replace(r'\s+', ' ', regex=True)
-                    normalize_changes = (before_normalize != cleaned).sum()
-                    changes += normalize_changes
-                    if normalize_changes > 0:
-                        log['steps'].append({
-                            'step': 'normalize_whitespace',
-                            'changes': normalize_changes,
-                            'action': '标准化空白字符'
-                        })
-        
-        # 标准化null值（对所有类型）
+        """
+        基础清理：去空格、标准化null值，但不改变数据类型
+
+        object列只转换一次字符串：去空格、空白标准化和空值标记判断都在不同的字符串取值上计算一次，
+        再按编码展开到每一行；各步骤的变化数由布尔数组统计，与逐步修改整列后比较前后的结果一致
+        """
+        if series.dtype != 'object':
+            # 只对object类型进行字符串清理和空值标准化
+            return series.copy()
+
+        values = series.to_numpy(dtype=object, copy=True)
+        codes, strings = pd.factorize(series.astype(str).to_numpy())
+        strings = strings.astype(object)
+        null_mask = pd.isna(values)
+        null_count = int(null_mask.sum())
+
+        # 参与字符串清理的行：非空且字符串形式不是'nan'
+        string_mask = ~null_mask & (strings != 'nan')[codes]
+        # 已替换为清理后字符串的行，当前值为 current[codes]
+        replaced_mask = np.zeros(len(values), dtype=bool)
+        current = strings
+
+        if self.config.trim_strings and string_mask.any():
+            current = pd.Series(current, dtype=object).str.strip().to_numpy()
+            trim_changes = self._replace_strings(values, codes, current, string_mask, null_count)
+            replaced_mask |= string_mask
+            string_mask &= (current != 'nan')[codes]
+            if trim_changes > 0:
+                log['steps'].append({
+                    'step': 'trim_strings',
+                    'changes': trim_changes,
+                    'action': '去除首尾空格'
+                })
+
+        if self.config.normalize_whitespace and string_mask.any():
+            current = pd.Series(current, dtype=object).str.replace(r'\s+', ' ', regex=True).to_numpy()
+            normalize_changes = self._replace_strings(values, codes, current, string_mask, null_count)
+            replaced_mask |= string_mask
+            if normalize_changes > 0:
+                log['steps'].append({
+                    'step': 'normalize_whitespace',
+                    'changes': normalize_changes,
+                    'action': '标准化空白字符'
+                })
+
+        # 标准化null值
         if self.config.standardize_nulls:
-            null_changes = self._standardize_nulls(cleaned)
-            changes += null_changes
+            null_changes = self._standardize_nulls(values, codes, strings, current, replaced_mask)
             if null_changes > 0:
                 log['steps'].append({
                     'step': 'standardize_nulls',
                     'changes': null_changes,
                     'action': '标准化空值表示'
                 })
-        
-        return cleaned
-    
-    def _standardize_nulls(self, series: pd.Series) -> int:
-        """标准化空值表示, 并修改为None"""
-        if series.dtype != 'object':
-            return 0
-        
-        changes = 0
-        for null_val in self.config.null_values:
-            if null_val == '':
-                # 处理空字符串
-                mask = (series == '') | (series.astype(str).str.strip() == '')
-            else:
-                mask = (series.astype(str).str.strip() == null_val)
-            
-            if mask.any():
-                count = mask.sum()
-                # series.loc[mask] = np.nan
-                series.loc[mask] = None
-                changes += count
-        
+
+        return pd.Series(values, index=series.index, name=series.name, dtype=object)
+
+    @staticmethod
+    def _replace_strings(
+        values: np.ndarray,
+        codes: np.ndarray,
+        replacements: np.ndarray,
+        mask: np.ndarray,
+        null_count: int
+    ) -> int:
+        """
+        将mask中的行替换为其取值清理后的字符串
+
+        Args:
+            values: 列的值（原地修改）
+            codes: 每行字符串形式的编码
+            replacements: 每个编码清理后的字符串
+            mask: 需要替换的行
+            null_count: 列中的空值个数
+
+        Returns:
+            变化数：被修改的行数加上空值个数（空值与自身比较总是不相等，原有的逐元素比较会把空值计为变化）
+        """
+        replaced = replacements[codes[mask]]
+        changes = null_count + int(np.count_nonzero(values[mask] != replaced))
+        values[mask] = replaced
         return changes
+
+    def _standardize_nulls(
+        self,
+        values: np.ndarray,
+        codes: np.ndarray,
+        strings: np.ndarray,
+        cleaned: np.ndarray,
+        cleaned_mask: np.ndarray
+    ) -> int:
+        """
+        标准化空值表示, 并修改为None
+
+        去除首尾空白后的字符串形式是空值标记的值改为None，标记集合一次isin判断
+
+        Args:
+            values: 列的值（原地修改）
+            codes: 每行原始字符串形式的编码
+            strings: 每个编码的原始字符串形式
+            cleaned: 每个编码清理后的字符串
+            cleaned_mask: 已替换为清理后字符串的行
+
+        Returns:
+            变化数，与依次处理每个空值标记时的计数一致
+        """
+        null_tokens = frozenset(self.config.null_values)
+        token_weights = self._null_token_weights()
+
+        def weights_of(candidates: np.ndarray) -> np.ndarray:
+            tokens = pd.Series(candidates, dtype=object).str.strip()
+            is_null_token = tokens.isin(null_tokens).to_numpy()
+            weights = np.zeros(len(tokens), dtype=np.int64)
+            weights[is_null_token] = [token_weights[token] for token in tokens[is_null_token]]
+            return weights
+
+        row_weights = np.where(
+            cleaned_mask, weights_of(cleaned)[codes], weights_of(strings)[codes]
+        )
+        values[row_weights > 0] = None
+        return int(row_weights.sum())
+
+    def _null_token_weights(self) -> Dict[str, int]:
+        """
+        每个空值标记匹配一个值时计入的变化数
+
+        依次处理空值标记时，被替换为None的值在之后处理'None'标记时会再次被匹配，
+        因此每个标记的权重为1加上它之后'None'标记出现的次数
+        """
+        null_values = list(self.config.null_values)
+        weights = {}
+        for i, token in enumerate(null_values):
+            if token not in weights:
+                weights[token] = 1 + null_values[i + 1:].count('None')
+        return weights
     
     def _smart_type_inference(self, series: pd.Series, column_name: str, log: Dict) -> pd.Series:
         """智能类型推断 - 仅对object类型"""
@@ -329,7 +399,9 @@ class SmartDataCleaner:
         if series.dtype != 'object':
             return series
         
-        cleaned = series.astype(str)
+        # 每个不同的字符串取值只清理一次，再按编码展开
+        codes, strings = pd.factorize(series.astype(str).to_numpy())
+        cleaned = pd.Series(strings, dtype=object)
         
         # 移除货币符号
         for symbol in self.config.currency_symbols:
@@ -342,7 +414,9 @@ class SmartDataCleaner:
         # 清理空白字符
         cleaned = cleaned.str.strip()
         
-        return cleaned
+        return pd.Series(
+            cleaned.to_numpy()[codes], index=series.index, name=series.name, dtype=object
+        )
     
     def _try_datetime_conversion(self, series: pd.Series, column_name: str) -> ConversionResult:
         """尝试日期时间转换"""
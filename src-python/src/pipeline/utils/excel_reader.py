@@ -0,0 +1,89 @@
+"""
+Excel读取工具
+同一个工作簿的多个Sheet在一次打开会话中读取，避免重复解压和解析共享字符串表
+指定列集合时只解析这些列（列裁剪），未用到的列不会被转换和清洗
+"""
+
+from typing import Collection, Dict, Iterable, Optional, Union
+
+import pandas as pd
+
+
+def read_sheet(
+    io: Union[str, pd.ExcelFile],
+    sheet_name: str,
+    header_row: int = 0,
+    columns: Optional[Collection[str]] = None,
+) -> pd.DataFrame:
+    """
+    读取单个Sheet，可选只保留指定的列
+
+    Args:
+        io: Excel文件路径或已打开的工作簿
+        sheet_name: Sheet名称
+        header_row: 表头行号
+        columns: 需要的列名，None表示所有列
+
+    Returns:
+        读取的DataFrame，列顺序与Sheet中一致
+    """
+    if columns is None:
+        return pd.read_excel(io, sheet_name=sheet_name, header=header_row)
+
+    columns = frozenset(columns)
+    df = pd.read_excel(
+        io, sheet_name=sheet_name, header=header_row, usecols=lambda name: name in columns
+    )
+    if df.shape[1] == 0:
+        # 没有一列匹配时pandas会丢弃所有行，改为完整读取，缺列错误交由后续节点报告
+        df = pd.read_excel(io, sheet_name=sheet_name, header=header_row)
+    return df
+
+
+def read_workbook_sheets(
+    file_path: str,
+    sheet_names: Iterable[str],
+    sheet_header_rows: Dict[str, int] = None,
+    sheet_columns: Dict[str, Optional[Collection[str]]] = None,
+) -> Dict[str, Union[pd.DataFrame, Exception]]:
+    """
+    打开一次工作簿并读取其中的多个Sheet
+
+    Args:
+        file_path: Excel文件路径
+        sheet_names: 需要读取的Sheet名列表
+        sheet_header_rows: Sheet名 -> 表头行号，未指定的Sheet使用第0行
+        sheet_columns: Sheet名 -> 需要的列名，未指定或为None的Sheet读取所有列
+
+    Returns:
+        Sheet名 -> 读取的DataFrame；读取失败的Sheet对应其异常
+    """
+    sheet_names = list(sheet_names)
+    sheet_header_rows = sheet_header_rows or {}
+    sheet_columns = sheet_columns or {}
+    results: Dict[str, Union[pd.DataFrame, Exception]] = {}
+
+    try:
+        workbook = pd.ExcelFile(file_path)
+    except Exception as e:
+        # 文件无法打开时，所有Sheet都失败
+        return {sheet_name: e for sheet_name in sheet_names}
+
+    with workbook:
+        # 按工作簿中的顺序读取，不存在的Sheet放在最后并由parse报告错误
+        workbook_order = {name: i for i, name in enumerate(workbook.sheet_names)}
+        ordered_sheets = sorted(
+            sheet_names, key=lambda name: workbook_order.get(name, len(workbook_order))
+        )
+        for sheet_name in ordered_sheets:
+            try:
+                results[sheet_name] = read_sheet(
+                    workbook,
+                    sheet_name,
+                    sheet_header_rows.get(sheet_name, 0),
+                    sheet_columns.get(sheet_name),
+                )
+            except Exception as e:
+                results[sheet_name] = e
+
+    return results
@@ -0,0 +1,133 @@
+"""
+索引缓存
+缓存从已加载DataFrame派生的辅助结构（如查找列的哈希索引），
+按条目数量做LRU淘汰，并通过锚点对象的身份校验避免DataFrame被替换后命中过期结构
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class IndexCache:
+    """线程安全、容量有界的LRU派生结构缓存"""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+        # 已出现过的锚点对象：id -> 弱引用，对象被回收时自动移除
+        self._seen_anchors: dict = {}
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def get(self, key: Hashable, anchor: Any = None) -> Optional[Any]:
+        """
+        获取缓存值
+
+        Args:
+            key: 缓存键
+            anchor: 缓存值所依附的对象（通常是源DataFrame），必须与构建时是同一个对象
+
+        Returns:
+            缓存值，不存在或锚点已变化时返回None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            anchor_ref, value = entry
+            if anchor is not None and (anchor_ref is None or anchor_ref() is not anchor):
+                # 源对象已被回收或替换（id可能被复用），缓存值失效
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any, anchor: Any = None):
+        """
+        写入缓存值，超出容量时淘汰最久未使用的条目
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+            anchor: 缓存值所依附的对象
+        """
+        anchor_ref = weakref.ref(anchor) if anchor is not None else None
+        with self._lock:
+            self._entries[key] = (anchor_ref, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_build(
+        self, key: Hashable, builder: Callable[[], Any], anchor: Any = None
+    ) -> Any:
+        """
+        获取缓存值，不存在时调用builder构建并写入缓存
+
+        Args:
+            key: 缓存键
+            builder: 构建缓存值的无参函数
+            anchor: 缓存值所依附的对象
+
+        Returns:
+            缓存值
+        """
+        value = self.get(key, anchor)
+        if value is not None:
+            with self._lock:
+                self.hit_count += 1
+            return value
+
+        # 构建过程可能较慢，不持有锁；并发构建的结果相同，后写入者覆盖即可
+        value = builder()
+        with self._lock:
+            self.miss_count += 1
+        self.put(key, value, anchor)
+        return value
+
+    def is_reused(self, anchor: Any) -> bool:
+        """
+        记录一次锚点对象的出现，并返回它之前是否已经出现过
+
+        只被使用一次的临时对象（如逐索引生成的中间DataFrame）不值得构建派生结构，
+        调用方可以据此在第二次出现时才构建
+
+        Args:
+            anchor: 锚点对象
+
+        Returns:
+            是否已经出现过
+        """
+        anchor_id = id(anchor)
+        with self._lock:
+            anchor_ref = self._seen_anchors.get(anchor_id)
+            if anchor_ref is not None and anchor_ref() is anchor:
+                return True
+
+            seen_anchors = self._seen_anchors
+            self._seen_anchors[anchor_id] = weakref.ref(
+                anchor, lambda _ref: seen_anchors.pop(anchor_id, None)
+            )
+            return False
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._seen_anchors.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __getstate__(self):
+        # 锁和弱引用无法序列化，跨进程传输时只保留容量配置
+        return {"max_entries": self.max_entries}
+
+    def __setstate__(self, state):
+        self.__init__(state["max_entries"])
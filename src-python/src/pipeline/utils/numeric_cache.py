@@ -0,0 +1,251 @@
+"""
+列数值转换、字符串转换、字典编码和排序索引
+pd.to_numeric(errors="coerce") 的结果与转换成功率一起保存，astype(str) 的结果按不同取值编码保存，
+重复取值多的字符串列按原始值做字典编码（整数编码 + 不同取值的字典），
+数值列的排序置换用于二分查找范围条件，
+同一张已加载sheet的列只转换一次，供行过滤、行查找的比较和聚合的数值运算复用
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 不同取值个数超过行数的这个比例时不做字典编码，直接比较原始值更快
+DICTIONARY_MAX_CARDINALITY = 0.5
+
+
+def _narrow_codes(codes: np.ndarray, size: int) -> np.ndarray:
+    """不同取值不多时使用int32编码，减少内存和比较的开销"""
+    if size < np.iinfo(np.int32).max:
+        return codes.astype(np.int32, copy=False)
+    return codes
+
+
+@dataclass
+class CoercedColumn:
+    """一列的数值转换结果"""
+
+    numeric: pd.Series
+    non_null: np.ndarray  # 原始值非空
+    converted: np.ndarray  # 转换后的数值非空
+    # 转换改变了dtype时保留原始列：整列转换的dtype取决于所有值（一个非数值会使整数变为float64），
+    # 取子集时需要对子集重新转换
+    source: Optional[pd.Series] = None
+
+    @classmethod
+    def from_series(cls, column_data: pd.Series) -> "CoercedColumn":
+        """
+        转换一列数据
+
+        Args:
+            column_data: 原始列数据
+
+        Returns:
+            数值转换结果
+        """
+        numeric = pd.to_numeric(column_data, errors="coerce")
+        return cls(
+            numeric=numeric,
+            non_null=column_data.notna().to_numpy(),
+            converted=numeric.notna().to_numpy(),
+            source=column_data if numeric.dtype != column_data.dtype else None,
+        )
+
+    @cached_property
+    def non_null_count(self) -> int:
+        return int(self.non_null.sum())
+
+    @cached_property
+    def success_rate(self) -> float:
+        """非空原始值中成功转换为数值的比例，没有非空值时为0"""
+        non_null_count = self.non_null_count
+        if non_null_count == 0:
+            return 0.0
+        return int(self.converted.sum()) / non_null_count
+
+    def take(self, positions: np.ndarray) -> "CoercedColumn":
+        """
+        按行位置取子集，成功率按子集重新计算
+
+        原始列已是数值类型时转换不改变dtype，直接取子集；否则对子集重新转换，
+        保证结果与直接转换子集的DataFrame一致
+
+        Args:
+            positions: 行位置
+
+        Returns:
+            子集的数值转换结果
+        """
+        if self.source is not None:
+            return CoercedColumn.from_series(self.source.take(positions))
+        return CoercedColumn(
+            numeric=self.numeric.take(positions),
+            non_null=self.non_null[positions],
+            converted=self.converted[positions],
+        )
+
+
+@dataclass
+class StringColumn:
+    """一列按字符串比较时的取值（与 column_data.astype(str) 一致），按不同取值编码"""
+
+    codes: np.ndarray  # 每行取值在uniques中的位置
+    uniques: np.ndarray  # 不同的字符串取值
+
+    @classmethod
+    def from_series(cls, column_data: pd.Series) -> "StringColumn":
+        """
+        转换一列数据
+
+        Args:
+            column_data: 原始列数据
+
+        Returns:
+            字符串转换结果
+        """
+        codes, uniques = pd.factorize(column_data.astype(str).to_numpy())
+        return cls(codes=_narrow_codes(codes, len(uniques)), uniques=np.asarray(uniques))
+
+    def map(
+        self, unique_mask: np.ndarray, positions: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        将对每个不同取值计算的结果展开到每一行
+
+        Args:
+            unique_mask: 与uniques逐个对应的结果
+            positions: 只展开这些行；None表示所有行
+
+        Returns:
+            与行逐个对应的结果
+        """
+        codes = self.codes if positions is None else self.codes[positions]
+        return unique_mask[codes]
+
+    def take(self, positions: np.ndarray) -> "StringColumn":
+        """按行位置取子集"""
+        return StringColumn(codes=self.codes[positions], uniques=self.uniques)
+
+
+@dataclass
+class DictionaryColumn:
+    """重复取值多的object列的字典编码：空值编码为-1"""
+
+    codes: np.ndarray  # 每行取值在dictionary中的位置，空值为-1
+    dictionary: np.ndarray  # 不同的非空原始值
+
+    @classmethod
+    def from_series(cls, column_data: pd.Series) -> Optional["DictionaryColumn"]:
+        """
+        对一列数据做字典编码
+
+        Args:
+            column_data: 原始列数据
+
+        Returns:
+            字典编码结果；不是object列或不同取值太多时为None
+        """
+        if column_data.dtype != object or len(column_data) == 0:
+            return None
+        codes, dictionary = pd.factorize(column_data.to_numpy())
+        if len(dictionary) > len(column_data) * DICTIONARY_MAX_CARDINALITY:
+            return None
+        return cls(
+            codes=_narrow_codes(codes, len(dictionary)),
+            dictionary=np.asarray(dictionary, dtype=object),
+        )
+
+    def map(
+        self,
+        value_mask: np.ndarray,
+        null_value: bool,
+        positions: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        将对每个字典取值计算的结果展开到每一行
+
+        Args:
+            value_mask: 与dictionary逐个对应的结果
+            null_value: 空值行的结果
+            positions: 只展开这些行；None表示所有行
+
+        Returns:
+            与行逐个对应的结果
+        """
+        codes = self.codes if positions is None else self.codes[positions]
+        # 编码-1正好取到末尾追加的空值结果
+        return np.append(value_mask, null_value)[codes]
+
+    def take(self, positions: np.ndarray) -> "DictionaryColumn":
+        """按行位置取子集"""
+        return DictionaryColumn(codes=self.codes[positions], dictionary=self.dictionary)
+
+
+@dataclass
+class SortedColumn:
+    """数值列的排序置换：范围条件用二分查找在 O(log n + k) 内确定满足条件的行"""
+
+    order: np.ndarray  # 按数值升序排列的行位置，NaN排在最后
+    sorted_values: np.ndarray  # 升序排列的数值
+    valid_count: int  # 非NaN数值的个数
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> "SortedColumn":
+        """
+        为数值数组构建排序置换
+
+        Args:
+            values: int64或float64数值数组
+
+        Returns:
+            排序置换
+        """
+        order = np.argsort(values, kind="stable")
+        sorted_values = values[order]
+        valid_count = len(values)
+        if values.dtype.kind == "f":
+            valid_count -= int(np.isnan(values).sum())
+        return cls(order=order, sorted_values=sorted_values, valid_count=valid_count)
+
+    def range_slice(
+        self,
+        lower: Any = None,
+        upper: Any = None,
+        lower_inclusive: bool = True,
+        upper_inclusive: bool = True,
+    ) -> Tuple[int, int]:
+        """
+        数值落在范围内的行在order中的区间，与逐行比较的结果相同（NaN不满足任何比较）
+
+        Args:
+            lower: 下界；None表示没有下界
+            upper: 上界；None表示没有上界
+            lower_inclusive: 是否包含下界
+            upper_inclusive: 是否包含上界
+
+        Returns:
+            (start, end)，满足条件的行位置为 order[start:end]
+        """
+        if any(bound is not None and bound != bound for bound in (lower, upper)):
+            # 与NaN的比较总是False
+            return 0, 0
+
+        valid_values = self.sorted_values[: self.valid_count]
+        start = 0
+        if lower is not None:
+            start = int(
+                np.searchsorted(valid_values, lower, side="left" if lower_inclusive else "right")
+            )
+        end = self.valid_count
+        if upper is not None:
+            end = int(
+                np.searchsorted(valid_values, upper, side="right" if upper_inclusive else "left")
+            )
+        return start, max(start, end)
+
+    def positions(self, start: int, end: int) -> np.ndarray:
+        """order[start:end] 中的行位置，按行顺序排列"""
+        return np.sort(self.order[start:end])
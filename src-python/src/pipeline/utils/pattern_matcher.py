@@ -0,0 +1,171 @@
+"""
+多模式匹配器
+一次扫描列中的所有值，同时得到每个模式（索引值）的匹配行：
+- contains: Aho-Corasick 自动机
+- starts_with / ends_with: 按模式长度分桶的前缀/后缀哈希表
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Sequence, Set
+
+import numpy as np
+import pandas as pd
+
+# str.contains 默认按正则解释模式，含有这些字符的模式不能按字面子串匹配
+REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+
+SUPPORTED_MODES = ("contains", "starts_with", "ends_with")
+
+
+def is_literal_pattern(pattern: str) -> bool:
+    """判断模式在正则语义下是否等价于字面子串"""
+    return not any(char in REGEX_METACHARACTERS for char in pattern)
+
+
+class AhoCorasickAutomaton:
+    """Aho-Corasick 多模式子串匹配自动机"""
+
+    def __init__(self, patterns: Sequence[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                state = next_state
+            self._outputs[state].append(pattern_id)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        """广度优先构建失败链接，并合并后缀状态的输出"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._outputs[next_state] = (
+                    self._outputs[next_state] + self._outputs[self._fail[next_state]]
+                )
+
+    def find_all(self, text: str) -> Set[int]:
+        """
+        找出文本中出现的所有模式
+
+        Args:
+            text: 待匹配文本
+
+        Returns:
+            出现的模式ID集合
+        """
+        matched = set()
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                matched.update(outputs[state])
+        return matched
+
+
+class MultiPatternMatcher:
+    """多模式匹配器 - 对一列数据一次性计算所有模式的匹配行"""
+
+    def __init__(self, patterns: Iterable[str], mode: str):
+        """
+        Args:
+            patterns: 已规范化（大小写处理后）的模式列表
+            mode: 匹配模式，contains / starts_with / ends_with
+        """
+        if mode not in SUPPORTED_MODES:
+            raise ValueError(f"Unsupported batch match mode: {mode}")
+
+        self.mode = mode
+        unique_patterns = list(dict.fromkeys(patterns))
+        if mode == "contains":
+            # 含正则元字符的模式保持原有的逐个匹配语义
+            unique_patterns = [p for p in unique_patterns if is_literal_pattern(p)]
+        self.patterns = unique_patterns
+
+        # 空模式匹配所有值，单独处理
+        self._match_all = [i for i, p in enumerate(self.patterns) if p == ""]
+        indexed = [(i, p) for i, p in enumerate(self.patterns) if p != ""]
+
+        if mode == "contains":
+            self._automaton = AhoCorasickAutomaton([p for _, p in indexed])
+            self._automaton_ids = [i for i, _ in indexed]
+        else:
+            # 按长度分桶：长度 -> {模式: 模式ID}
+            self._tables: Dict[int, Dict[str, int]] = {}
+            for pattern_id, pattern in indexed:
+                self._tables.setdefault(len(pattern), {})[pattern] = pattern_id
+            self._lengths = sorted(self._tables)
+
+    def _match_value(self, value: str) -> List[int]:
+        """计算单个值匹配的模式ID"""
+        if self.mode == "contains":
+            matched = [self._automaton_ids[i] for i in self._automaton.find_all(value)]
+        else:
+            matched = []
+            value_length = len(value)
+            for length in self._lengths:
+                if length > value_length:
+                    break
+                part = value[:length] if self.mode == "starts_with" else value[-length:]
+                pattern_id = self._tables[length].get(part)
+                if pattern_id is not None:
+                    matched.append(pattern_id)
+        return matched + self._match_all
+
+    def match_series(self, keys: pd.Series) -> Dict[str, np.ndarray]:
+        """
+        对已规范化的字符串列一次性计算所有模式的匹配行位置
+
+        Args:
+            keys: 规范化后的字符串Series
+
+        Returns:
+            模式 -> 升序行位置数组（只包含本匹配器支持的模式）
+        """
+        codes, uniques = pd.factorize(keys, sort=False)
+
+        # 每个唯一值只匹配一次
+        rows_by_pattern: List[List[int]] = [[] for _ in self.patterns]
+        for unique_id, value in enumerate(uniques):
+            for pattern_id in self._match_value(value):
+                rows_by_pattern[pattern_id].append(unique_id)
+
+        # 按唯一值分组的行位置（组内升序）
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes, minlength=len(uniques))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+        result = {}
+        for pattern_id, pattern in enumerate(self.patterns):
+            unique_ids = rows_by_pattern[pattern_id]
+            if not unique_ids:
+                result[pattern] = np.empty(0, dtype=np.intp)
+                continue
+            positions = np.concatenate(
+                [order[starts[u] : starts[u] + counts[u]] for u in unique_ids]
+            )
+            positions.sort()
+            result[pattern] = positions.astype(np.intp, copy=False)
+        return result
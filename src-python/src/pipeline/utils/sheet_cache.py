@@ -0,0 +1,684 @@
+"""
+Sheet缓存
+- SheetMemoryCache: 进程级内存缓存，跨请求复用已加载的Sheet，按内存占用做LRU淘汰
+- SheetDiskCache: 持久化缓存，将解析并清洗后的Sheet按列存储为.npy文件，
+  再次加载时通过内存映射直接还原为DataFrame，跳过Excel解析和智能清洗
+两者都按文件内容指纹、Sheet名、表头行校验，文件变化后自动失效
+列裁剪读取的Sheet与完整Sheet分开缓存；请求部分列时也可以从完整Sheet的缓存中取出所需的列
+下推了行过滤条件的Sheet按条件摘要单独缓存
+持久化缓存的总大小有上限，超出时按最近使用时间淘汰；文件变化后同一文件的旧条目在写入新条目时删除
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data_cleaner import CLEANING_VERSION, CleaningConfig
+
+# 可以直接按numpy数组存储的dtype种类：布尔、整数、浮点、复数、时间差、日期时间
+_NUMPY_KINDS = frozenset("biufcmM")
+
+# 持久化Sheet缓存默认的磁盘占用上限
+DEFAULT_DISK_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+META_FILE = "meta.pkl"
+OBJECTS_FILE = "objects.pkl"
+
+FileFingerprint = Tuple[str, int, int]
+SheetColumns = Optional[FrozenSet[str]]
+
+
+def light_hash(path: str, head: int = 1024, tail: int = 1024) -> str:
+    """
+    计算文件的轻量哈希（只读取文件头尾）
+
+    Args:
+        path: 文件路径
+        head: 读取的文件头字节数
+        tail: 读取的文件尾字节数
+
+    Returns:
+        md5十六进制摘要
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        start = f.read(head)
+        if size > tail:
+            f.seek(-tail, os.SEEK_END)
+            end = f.read(tail)
+        else:
+            end = b""
+    return hashlib.md5(start + end).hexdigest()
+
+
+def file_fingerprint(path: str) -> Optional[FileFingerprint]:
+    """
+    计算文件内容指纹：轻量哈希 + 文件大小 + 修改时间
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        (轻量哈希, 文件大小, 修改时间纳秒)，文件无法访问时返回None
+    """
+    try:
+        stat = os.stat(path)
+        return light_hash(path), stat.st_size, stat.st_mtime_ns
+    except OSError:
+        return None
+
+
+def _cleaning_signature() -> str:
+    """清洗逻辑版本 + 默认清洗配置的摘要，任一变化都会使缓存失效"""
+    config_digest = hashlib.md5(repr(asdict(CleaningConfig())).encode("utf-8")).hexdigest()
+    return f"{CLEANING_VERSION}:{config_digest[:12]}"
+
+
+def predicate_key(conditions: List[Dict[str, Any]]) -> str:
+    """
+    计算行过滤条件的摘要，作为过滤后Sheet的缓存键的一部分
+
+    Args:
+        conditions: 行过滤条件列表
+
+    Returns:
+        条件摘要
+    """
+    payload = json.dumps(conditions, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.md5(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def dataframe_cache_key(
+    file_id: str, sheet_name: str, predicate: Optional[str] = None
+) -> str:
+    """
+    全局上下文中已加载DataFrame的缓存键
+
+    Args:
+        file_id: 文件ID
+        sheet_name: Sheet名称
+        predicate: 下推的行过滤条件摘要，None表示未过滤的完整Sheet
+
+    Returns:
+        缓存键
+    """
+    cache_key = f"{file_id}_{sheet_name}"
+    if predicate is not None:
+        cache_key += f"#{predicate}"
+    return cache_key
+
+
+def select_columns(df: pd.DataFrame, columns: SheetColumns) -> pd.DataFrame:
+    """
+    从完整的Sheet中取出列裁剪读取时会得到的列
+
+    Args:
+        df: 完整读取的DataFrame
+        columns: 需要的列，None表示所有列
+
+    Returns:
+        按Sheet中的顺序保留所需列的DataFrame；没有一列匹配时与裁剪读取一致，返回完整的DataFrame
+    """
+    if columns is None:
+        return df
+    positions = [i for i, name in enumerate(df.columns) if name in columns]
+    if not positions or len(positions) == df.shape[1]:
+        return df
+    return df.iloc[:, positions]
+
+
+class SheetMemoryCache:
+    """线程安全、按内存占用淘汰的进程级LRU Sheet缓存"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        # (文件路径, Sheet名, 表头行, 裁剪后的列, 过滤条件摘要) -> (文件指纹, DataFrame, 内存占用字节数)
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hit_count = 0
+        self.miss_count = 0
+
+    @staticmethod
+    def _key(
+        file_path: str,
+        sheet_name: str,
+        header_row: int,
+        columns: SheetColumns = None,
+        predicate: Optional[str] = None,
+    ) -> tuple:
+        return os.path.abspath(file_path), sheet_name, header_row, columns, predicate
+
+    def _lookup(self, key: tuple, fingerprint: FileFingerprint) -> Optional[pd.DataFrame]:
+        """查找条目并校验指纹（调用方持有锁）"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        cached_fingerprint, df, nbytes = entry
+        if cached_fingerprint != fingerprint:
+            # 源文件的大小、修改时间或哈希已变化
+            del self._entries[key]
+            self.total_bytes -= nbytes
+            return None
+
+        self._entries.move_to_end(key)
+        return df
+
+    def get(
+        self,
+        file_path: str,
+        sheet_name: str,
+        header_row: int,
+        fingerprint: Optional[FileFingerprint],
+        columns: SheetColumns = None,
+        predicate: Optional[str] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        获取缓存的Sheet
+
+        Args:
+            file_path: Excel文件路径
+            sheet_name: Sheet名称
+            header_row: 表头行号
+            fingerprint: 当前的文件指纹
+            columns: 需要的列，None表示完整的Sheet
+            predicate: 下推的行过滤条件摘要，None表示未过滤
+
+        Returns:
+            缓存的DataFrame，未命中或文件已变化时返回None
+        """
+        with self._lock:
+            df = None
+            if fingerprint is not None:
+                df = self._lookup(
+                    self._key(file_path, sheet_name, header_row, columns, predicate),
+                    fingerprint,
+                )
+                if df is None and columns is not None and predicate is None:
+                    # 完整Sheet的缓存包含所有需要的列
+                    df = self._lookup(
+                        self._key(file_path, sheet_name, header_row), fingerprint
+                    )
+                    if df is not None:
+                        df = select_columns(df, columns)
+
+            if df is None:
+                self.miss_count += 1
+            else:
+                self.hit_count += 1
+            return df
+
+    def put(
+        self,
+        file_path: str,
+        sheet_name: str,
+        header_row: int,
+        fingerprint: Optional[FileFingerprint],
+        df: pd.DataFrame,
+        columns: SheetColumns = None,
+        predicate: Optional[str] = None,
+    ):
+        """
+        写入缓存，总占用超出上限时淘汰最久未使用的条目
+
+        Args:
+            file_path: Excel文件路径
+            sheet_name: Sheet名称
+            header_row: 表头行号
+            fingerprint: 读取前计算的文件指纹
+            df: 清洗后的DataFrame
+            columns: 读取时裁剪的列，None表示完整的Sheet
+            predicate: 下推的行过滤条件摘要，None表示未过滤
+        """
+        if fingerprint is None:
+            return
+
+        nbytes = int(df.memory_usage(deep=True).sum())
+        if nbytes > self.max_bytes:
+            # 单个Sheet超过上限时不缓存，避免清空其他所有条目
+            return
+
+        key = self._key(file_path, sheet_name, header_row, columns, predicate)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[2]
+
+            self._entries[key] = (fingerprint, df, nbytes)
+            self.total_bytes += nbytes
+            while self.total_bytes > self.max_bytes:
+                _, (_, _, evicted_bytes) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_bytes
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SheetDiskCache:
+    """按列存储、内存映射加载的持久化Sheet缓存"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_DISK_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.cleaning_signature = _cleaning_signature()
+        self._lock = threading.Lock()
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # 进程池中的工作进程会收到缓存的副本，锁无法pickle，在工作进程中重新创建
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _entry_dir(
+        self,
+        file_path: str,
+        sheet_name: str,
+        header_row: int,
+        columns: SheetColumns = None,
+        predicate: Optional[str] = None,
+    ) -> str:
+        """每个 (文件, Sheet, 表头行, 裁剪后的列, 过滤条件) 只保留一个缓存条目，指纹变化时覆盖"""
+        path_key = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()
+        entry_name = f"{sheet_name}\0{header_row}"
+        if columns is not None:
+            entry_name += "\0" + "\0".join(sorted(columns))
+        if predicate is not None:
+            entry_name += f"\0#{predicate}"
+        entry_key = hashlib.sha1(entry_name.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, path_key[:16], entry_key[:16])
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hit_count += 1
+            else:
+                self.miss_count += 1
+
+    def load(
+        self,
+        file_path: str,
+        sheet_name: str,
+        header_row: int,
+        fingerprint: Optional[FileFingerprint],
+        columns: SheetColumns = None,
+        predicate: Optional[str] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        加载缓存的Sheet
+
+        Args:
+            file_path: Excel文件路径
+            sheet_name: Sheet名称
+            header_row: 表头行号
+            fingerprint: 读取前计算的文件指纹
+            columns: 需要的列，None表示完整的Sheet
+            predicate: 下推的行过滤条件摘要，None表示未过滤
+
+        Returns:
+            清洗后的DataFrame，未命中或缓存已失效时返回None
+        """
+        if fingerprint is None:
+            return None
+
+        df = self._load_entry(
+            self._entry_dir(file_path, sheet_name, header_row, columns, predicate),
+            sheet_name,
+            header_row,
+            fingerprint,
+        )
+        if df is None and columns is not None and predicate is None:
+            # 完整Sheet的缓存条目只映射需要的列
+            df = self._load_entry(
+                self._entry_dir(file_path, sheet_name, header_row),
+                sheet_name,
+                header_row,
+                fingerprint,
+                columns,
+            )
+
+        self._count(df is not None)
+        return df
+
+    def _load_entry(
+        self,
+        entry_dir: str,
+        sheet_name: str,
+        header_row: int,
+        fingerprint: FileFingerprint,
+        columns: SheetColumns = None,
+    ) -> Optional[pd.DataFrame]:
+        """加载一个缓存条目，条目不存在、已失效或无法读取时返回None"""
+        try:
+            with open(os.path.join(entry_dir, META_FILE), "rb") as f:
+                meta = pickle.load(f)
+            if (
+                meta["fingerprint"] != fingerprint
+                or meta["cleaning_signature"] != self.cleaning_signature
+                or meta["sheet_name"] != sheet_name
+                or meta["header_row"] != header_row
+            ):
+                return None
+            df = self._read_columns(entry_dir, meta, columns)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # 损坏或被并发覆盖的条目视为未命中，随后会被重新写入
+            logging.debug(f"Sheet cache entry unreadable ({entry_dir}): {e}")
+            return None
+
+        try:
+            # 元数据文件的修改时间记录最近一次使用，淘汰时最久未使用的条目先被删除
+            os.utime(os.path.join(entry_dir, META_FILE))
+        except OSError:
+            pass
+        return df
+
+    def store(
+        self,
+        file_path: str,
+        sheet_name: str,
+        header_row: int,
+        fingerprint: Optional[FileFingerprint],
+        df: pd.DataFrame,
+        columns: SheetColumns = None,
+        predicate: Optional[str] = None,
+    ):
+        """
+        写入缓存（失败时静默跳过，缓存只影响性能不影响结果）
+
+        Args:
+            file_path: Excel文件路径
+            sheet_name: Sheet名称
+            header_row: 表头行号
+            fingerprint: 读取前计算的文件指纹
+            df: 清洗后的DataFrame
+            columns: 读取时裁剪的列，None表示完整的Sheet
+            predicate: 下推的行过滤条件摘要，None表示未过滤
+        """
+        if fingerprint is None:
+            return
+
+        entry_dir = self._entry_dir(file_path, sheet_name, header_row, columns, predicate)
+        temp_dir = f"{entry_dir}.tmp-{uuid.uuid4().hex}"
+        try:
+            os.makedirs(temp_dir)
+            layout = self._write_columns(temp_dir, df)
+            meta = {
+                "fingerprint": fingerprint,
+                "cleaning_signature": self.cleaning_signature,
+                "sheet_name": sheet_name,
+                "header_row": header_row,
+                "columns": df.columns,
+                "index": df.index,
+                "layout": layout,
+            }
+            with open(os.path.join(temp_dir, META_FILE), "wb") as f:
+                pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            # 先写临时目录再整体替换，读取方不会看到写了一半的条目
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.rename(temp_dir, entry_dir)
+        except Exception as e:
+            logging.debug(f"Failed to write sheet cache entry ({entry_dir}): {e}")
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return
+
+        self._remove_stale_entries(entry_dir, fingerprint)
+        self._evict(entry_dir)
+
+    def _remove_stale_entries(self, entry_dir: str, fingerprint: FileFingerprint):
+        """
+        删除同一文件指纹已变化的条目（其他列裁剪、过滤条件或表头行的旧版本）
+
+        Args:
+            entry_dir: 刚写入的条目目录
+            fingerprint: 文件当前的指纹
+        """
+        file_dir = os.path.dirname(entry_dir)
+        for entry in self._scan_entries(file_dir):
+            if entry.path == entry_dir:
+                continue
+            try:
+                with open(os.path.join(entry.path, META_FILE), "rb") as f:
+                    stale = pickle.load(f)["fingerprint"] != fingerprint
+            except FileNotFoundError:
+                continue
+            except Exception:
+                # 无法读取的条目不会再被命中
+                stale = True
+            if stale:
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    def _evict(self, keep_dir: str):
+        """
+        缓存总大小超出上限时，按最近使用时间从旧到新删除条目
+
+        Args:
+            keep_dir: 刚写入的条目目录，不会被删除
+        """
+        entries = []
+        total_bytes = 0
+        for file_dir in self._scan_entries(self.cache_dir):
+            file_entries = self._scan_entries(file_dir.path)
+            if not file_entries:
+                # 所有条目都已删除的文件目录
+                shutil.rmtree(file_dir.path, ignore_errors=True)
+                continue
+            for entry in file_entries:
+                nbytes, last_used = self._entry_usage(entry.path)
+                entries.append((last_used, nbytes, entry.path))
+                total_bytes += nbytes
+
+        if total_bytes <= self.max_bytes:
+            return
+        for _, nbytes, path in sorted(entries):
+            if path == keep_dir:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total_bytes -= nbytes
+            if total_bytes <= self.max_bytes:
+                break
+
+    @staticmethod
+    def _scan_entries(directory: str) -> List[os.DirEntry]:
+        """目录下已写入完成的子目录（跳过正在写入的临时目录）"""
+        try:
+            with os.scandir(directory) as it:
+                return [
+                    entry
+                    for entry in it
+                    if entry.is_dir(follow_symlinks=False) and ".tmp-" not in entry.name
+                ]
+        except OSError:
+            return []
+
+    @staticmethod
+    def _entry_usage(entry_dir: str) -> Tuple[int, int]:
+        """
+        条目的磁盘占用和最近使用时间
+
+        Returns:
+            (字节数, 元数据文件的修改时间纳秒)，条目已被删除时为 (0, 0)
+        """
+        nbytes = 0
+        last_used = 0
+        try:
+            with os.scandir(entry_dir) as it:
+                for item in it:
+                    stat = item.stat(follow_symlinks=False)
+                    nbytes += stat.st_size
+                    if item.name == META_FILE:
+                        last_used = stat.st_mtime_ns
+        except OSError:
+            pass
+        return nbytes, last_used
+
+    def clear(self):
+        """删除所有缓存条目"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    @staticmethod
+    def _write_columns(entry_dir: str, df: pd.DataFrame) -> List[Tuple[str, Any]]:
+        """
+        逐列写入缓存文件
+
+        Returns:
+            每列的存储方式：("numpy", None) / ("masked", dtype) / ("object", None)
+        """
+        layout = []
+        objects: Dict[int, Any] = {}
+        for position in range(df.shape[1]):
+            column = df.iloc[:, position]
+            dtype = column.dtype
+            if isinstance(dtype, np.dtype) and dtype.kind in _NUMPY_KINDS:
+                np.save(os.path.join(entry_dir, f"col_{position}.npy"), column.to_numpy())
+                layout.append(("numpy", None))
+            elif pd.api.types.is_extension_array_dtype(dtype) and hasattr(dtype, "numpy_dtype"):
+                # 可空整数/浮点/布尔：数据和缺失掩码分别存储
+                values = column.to_numpy(dtype=dtype.numpy_dtype, na_value=0)
+                np.save(os.path.join(entry_dir, f"col_{position}.npy"), values)
+                np.save(
+                    os.path.join(entry_dir, f"col_{position}_mask.npy"),
+                    column.isna().to_numpy(),
+                )
+                layout.append(("masked", dtype))
+            else:
+                # 字符串等对象列无法内存映射，合并到一个pickle文件中
+                objects[position] = column.array
+                layout.append(("object", None))
+
+        if objects:
+            with open(os.path.join(entry_dir, OBJECTS_FILE), "wb") as f:
+                pickle.dump(objects, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return layout
+
+    @staticmethod
+    def _read_columns(
+        entry_dir: str, meta: Dict[str, Any], selected: SheetColumns = None
+    ) -> pd.DataFrame:
+        """
+        按存储布局还原DataFrame，数值列以写时复制的方式内存映射
+
+        Args:
+            entry_dir: 缓存条目目录
+            meta: 条目元数据
+            selected: 只还原这些列，None表示所有列（没有一列匹配时同样还原所有列）
+
+        Returns:
+            还原的DataFrame
+        """
+        positions = list(range(len(meta["layout"])))
+        if selected is not None:
+            matched = [i for i in positions if meta["columns"][i] in selected]
+            positions = matched or positions
+
+        objects = {}
+        if any(meta["layout"][i][0] == "object" for i in positions):
+            with open(os.path.join(entry_dir, OBJECTS_FILE), "rb") as f:
+                objects = pickle.load(f)
+
+        columns = {}
+        for position in positions:
+            kind, dtype = meta["layout"][position]
+            if kind == "object":
+                columns[position] = objects[position]
+                continue
+            # 以普通ndarray视图引用映射内存，避免memmap子类传播到后续计算结果中
+            values = np.load(
+                os.path.join(entry_dir, f"col_{position}.npy"), mmap_mode="c"
+            ).view(np.ndarray)
+            if kind == "masked":
+                mask = np.load(os.path.join(entry_dir, f"col_{position}_mask.npy"))
+                columns[position] = dtype.construct_array_type()(values, mask)
+            else:
+                columns[position] = values
+
+        df = pd.DataFrame(columns, index=meta["index"], copy=False)
+        df.columns = meta["columns"][positions]
+        return df
+
+
+_sheet_cache: Optional[SheetDiskCache] = None
+_sheet_memory_cache: Optional[SheetMemoryCache] = None
+_sheet_cache_lock = threading.Lock()
+
+
+def configure_sheet_cache(
+    cache_dir: Optional[str], max_bytes: int = DEFAULT_DISK_CACHE_MAX_BYTES
+) -> Optional[SheetDiskCache]:
+    """
+    设置进程级的持久化Sheet缓存目录
+
+    Args:
+        cache_dir: 缓存目录，None表示关闭缓存
+        max_bytes: 缓存的最大磁盘占用（字节），超出时淘汰最久未使用的条目
+
+    Returns:
+        当前的缓存实例
+    """
+    global _sheet_cache
+    with _sheet_cache_lock:
+        if cache_dir is None:
+            _sheet_cache = None
+        elif _sheet_cache is None or _sheet_cache.cache_dir != cache_dir:
+            _sheet_cache = SheetDiskCache(cache_dir, max_bytes)
+        else:
+            _sheet_cache.max_bytes = max_bytes
+        return _sheet_cache
+
+
+def get_sheet_cache() -> Optional[SheetDiskCache]:
+    """获取当前的持久化Sheet缓存，未配置时返回None"""
+    return _sheet_cache
+
+
+def configure_sheet_memory_cache(max_bytes: Optional[int]) -> Optional[SheetMemoryCache]:
+    """
+    设置进程级Sheet内存缓存的内存上限
+
+    Args:
+        max_bytes: 缓存的最大内存占用（字节），None或0表示关闭缓存
+
+    Returns:
+        当前的缓存实例
+    """
+    global _sheet_memory_cache
+    with _sheet_cache_lock:
+        if not max_bytes:
+            _sheet_memory_cache = None
+        elif _sheet_memory_cache is None:
+            _sheet_memory_cache = SheetMemoryCache(max_bytes)
+        else:
+            # 调整上限时保留已缓存的条目，超出部分在下一次写入时淘汰
+            _sheet_memory_cache.max_bytes = max_bytes
+        return _sheet_memory_cache
+
+
+def get_sheet_memory_cache() -> Optional[SheetMemoryCache]:
+    """获取进程级Sheet内存缓存，未配置时返回None"""
+    return _sheet_memory_cache
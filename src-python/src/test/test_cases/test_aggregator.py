@@ -3,9 +3,19 @@ Aggregator节点测试类
 从aggregator.json加载测试用例并执行
 """
 
+import pickle
 import unittest
+
+import numpy as np
+import pandas as pd
+
 from .test_base import BaseTestFramework, TestSuiteResult
-from pipeline.models import NodeType
+from pipeline.execution.aggregation_fusion import AggregationFusion
+from pipeline.models import AggregationOperation, NodeType
+from pipeline.processors.aggregation_state import (
+    aggregate_chunks,
+    create_aggregation_state,
+)
 
 
 class TestAggregator(BaseTestFramework):
@@ -74,6 +84,103 @@ class TestAggregatorUnittest(unittest.TestCase):
             "没有找到Aggregator测试用例"
         )
 
+    def test_fused_aggregation_matches_single_node(self):
+        """融合聚合对每个分组的结果与单个聚合节点逐组计算一致"""
+        rng = np.random.default_rng(7)
+        size = 400
+        amounts = rng.normal(1000, 300, size)
+        amounts[rng.random(size) < 0.1] = np.nan
+        df = pd.DataFrame(
+            {
+                "amount": amounts,
+                "quantity": rng.integers(0, 50, size),
+                "mixed": rng.choice(["12.5", "n/a", None, 7, "3"], size),
+                "name": rng.choice(["alice", "bob", None], size),
+                "date": pd.Timestamp("2024-01-01")
+                + pd.to_timedelta(rng.integers(0, 365, size), unit="D"),
+            }
+        )
+        df.loc[:9, "amount"] = np.nan  # 全部为空的分组
+        keys = rng.choice(["a", "b", "c", "d"], size)
+        keys[:10] = "empty_numeric"
+        groups = {
+            key: np.flatnonzero(keys == key)
+            for key in ["a", "b", "c", "d", "empty_numeric"]
+        }
+        groups["no_rows"] = np.empty(0, dtype=np.intp)
+
+        processor = self.test_framework.processor
+        fusion = AggregationFusion(df, groups, processor)
+        for column in df.columns:
+            for operation in AggregationOperation:
+                fused = fusion.evaluate(column, operation)
+                for key, positions in groups.items():
+                    expected = processor._perform_aggregation(
+                        df.take(positions), column, operation
+                    )
+                    self.assertEqual(
+                        repr(fused[key]), repr(expected), (column, operation, key)
+                    )
+
+        # object列的数值转换dtype取决于组内的值：其他分组中的非数值不影响本组
+        stamp = pd.Timestamp("2024-01-01")
+        mixed = pd.DataFrame(
+            {
+                "large": pd.Series([2**53 + 1, 1, 1, "x"], dtype=object),
+                "stamped": pd.Series(
+                    [stamp, pd.NaT, stamp + pd.Timedelta(days=1), "a"], dtype=object
+                ),
+            }
+        )
+        mixed_groups = {"head": np.array([0, 1, 2]), "tail": np.array([3])}
+        fusion = AggregationFusion(mixed, mixed_groups, processor)
+        for column in mixed.columns:
+            for operation in AggregationOperation:
+                fused = fusion.evaluate(column, operation)
+                for key, positions in mixed_groups.items():
+                    expected = processor._perform_aggregation(
+                        mixed.take(positions), column, operation
+                    )
+                    self.assertEqual(
+                        repr(fused[key]), repr(expected), (column, operation, key)
+                    )
+
+    def test_chunked_states_match_whole_column(self):
+        """分块更新、跨进程合并的聚合状态与整列一次聚合的结果一致"""
+        df = pd.DataFrame(
+            {
+                "quantity": [3, None, 7, 1, 9, None, 4, 2],
+                "amount": [1.5, np.nan, 2.25, 8.0, np.nan, 0.5, 4.0, 3.75],
+                "name": [None, "carol", "alice", None, "bob", "dave", None, "eve"],
+                "mixed": ["n/a", None, "x", "12", None, "y", "3.5", None],
+            }
+        )
+        processor = self.test_framework.processor
+        for column in df.columns:
+            for operation in AggregationOperation:
+                expected = processor._perform_aggregation(df, column, operation)
+                data = df[column]
+
+                chunked = aggregate_chunks(operation, [data[:3], data[3:3], data[3:]])
+                self.assertEqual(chunked, expected, (column, operation))
+
+                # 两个工作进程各聚合一半，序列化后在主进程合并
+                left = create_aggregation_state(operation).update(data[:5])
+                right = pickle.loads(
+                    pickle.dumps(create_aggregation_state(operation).update(data[5:]))
+                )
+                self.assertEqual(
+                    left.merge(right).finalize(), expected, (column, operation)
+                )
+
+                # 没有处理过任何行时与空DataFrame一致
+                self.assertIsNone(create_aggregation_state(operation).finalize())
+
+        with self.assertRaises(ValueError):
+            create_aggregation_state(AggregationOperation.SUM).merge(
+                create_aggregation_state(AggregationOperation.MAX)
+            )
+
 
 if __name__ == "__main__":
     # 直接运行测试
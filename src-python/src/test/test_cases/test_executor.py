@@ -0,0 +1,813 @@
+"""
+PipelineExecutor执行测试类
+构建完整的工作区配置，验证不同执行策略下的执行结果与逐索引执行完全一致
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import Future
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from .test_base import BaseTestFramework
+from pipeline.execution import PipelineExecutor
+from pipeline.execution.batch_preloader import BatchPreloader
+from pipeline.execution.column_planner import ColumnPlanner
+from pipeline.execution.parallel_executor import ParallelBranchExecutor
+from pipeline.execution.predicate_pushdown import PredicatePushdown
+from pipeline.execution.file_analyzer import (
+    INDEX_SOURCE_PRIORITY,
+    FileAnalyzer,
+    FileBatchInfo,
+)
+from pipeline.models import (
+    AggregatorInput,
+    BaseNode,
+    Edge,
+    ExecutePipelineRequest,
+    ExecutionMode,
+    IndexValue,
+    NodeType,
+    PathContext,
+    PipelineExecutionResult,
+    RowFilterInput,
+    RowLookupInput,
+    RowSelection,
+    SheetSelectorInput,
+    WorkspaceConfig,
+)
+from pipeline.performance.analyzer import get_performance_analyzer
+from pipeline.utils.data_cleaner import clean_dataframe_with_smart_strategy
+from pipeline.utils.sheet_cache import (
+    META_FILE,
+    SheetDiskCache,
+    SheetMemoryCache,
+    configure_sheet_cache,
+    configure_sheet_memory_cache,
+    dataframe_cache_key,
+    file_fingerprint,
+)
+
+
+TEST_FILE_ID = "test-file-93fac9a3-f4b3-410a-932c-32620bd11122"
+SALES_SHEET = "Sheet7_Real_World_Sales"
+
+
+class ExecutorTestFramework(BaseTestFramework):
+    """执行器测试框架 - 负责构建工作区配置和比较执行结果"""
+
+    def build_workspace(
+        self, nodes: List[Dict[str, Any]], edges: List[tuple]
+    ) -> WorkspaceConfig:
+        """根据节点和边配置构建工作区"""
+        file_info = self.setup_global_context().files[TEST_FILE_ID]
+        return WorkspaceConfig(
+            id="executor-test-workspace",
+            name="executor-test",
+            files=[file_info],
+            flow_nodes=[
+                BaseNode(id=node["id"], type=NodeType(node["type"]), data=node["data"])
+                for node in nodes
+            ],
+            flow_edges=[Edge(source=source, target=target) for source, target in edges],
+        )
+
+    def execute(
+        self, workspace: WorkspaceConfig, target_node_id: str, **options
+    ) -> PipelineExecutionResult:
+        """使用新的执行器实例执行pipeline"""
+        request = ExecutePipelineRequest(
+            workspace_config=workspace,
+            target_node_id=target_node_id,
+            execution_mode=ExecutionMode.TEST,
+            **options,
+        )
+        return PipelineExecutor().execute_pipeline(request)
+
+    def summarize(self, result: PipelineExecutionResult) -> Dict[str, Any]:
+        """提取用于比较的执行结果（去除耗时等不稳定字段）"""
+        index_results = []
+        for index_result in result.index_results:
+            node_results = []
+            for node_result in index_result.node_results:
+                output = dict(node_result.output or {})
+                dataframe = output.pop("dataframe", None)
+                if isinstance(dataframe, RowSelection):
+                    dataframe = dataframe.to_pandas()
+                if isinstance(dataframe, pd.DataFrame):
+                    output["dataframe"] = dataframe.to_dict("split")
+                node_results.append(
+                    (node_result.node_id, node_result.success, node_result.error, output)
+                )
+            index_results.append(
+                (str(index_result.index_value), index_result.success, node_results)
+            )
+
+        sheets = []
+        if result.output_data is not None:
+            for sheet in result.output_data.sheets:
+                sheets.append((sheet.sheet_name, sheet.dataframe.to_dict("split")))
+
+        return {
+            "success": result.success,
+            "error": result.error,
+            "branches": [
+                (branch.branch_id, branch.final_aggregations, branch.processed_indices)
+                for branch in result.branch_results
+            ],
+            "index_results": index_results,
+            "sheets": sheets,
+        }
+
+
+def lookup_aggregate_nodes(filter_conditions: List[Dict[str, Any]] = None):
+    """构建 IndexSource → SheetSelector → RowFilter? → RowLookup → Aggregator* → Output 的工作流"""
+    nodes = [
+        {
+            "id": "index",
+            "type": "indexSource",
+            "data": {
+                "sourceFileID": TEST_FILE_ID,
+                "sheetName": SALES_SHEET,
+                "columnName": "Region",
+                "byColumn": True,
+            },
+        },
+        {
+            "id": "selector",
+            "type": "sheetSelector",
+            "data": {
+                "targetFileID": TEST_FILE_ID,
+                "mode": "manual",
+                "manualSheetName": SALES_SHEET,
+            },
+        },
+        {
+            "id": "lookup",
+            "type": "rowLookup",
+            "data": {"matchColumn": "Region"},
+        },
+        {
+            "id": "sum",
+            "type": "aggregator",
+            "data": {"statColumn": "Final Amount", "method": "sum"},
+        },
+        {
+            "id": "max",
+            "type": "aggregator",
+            "data": {"statColumn": "Sales Rep", "method": "max"},
+        },
+        {
+            "id": "last",
+            "type": "aggregator",
+            "data": {"statColumn": "Sale Date", "method": "last"},
+        },
+        {"id": "output", "type": "output", "data": {}},
+    ]
+    chain = ["index", "selector", "lookup", "sum", "max", "last", "output"]
+
+    if filter_conditions is not None:
+        nodes.append(
+            {
+                "id": "filter",
+                "type": "rowFilter",
+                "data": {"conditions": filter_conditions},
+            }
+        )
+        chain.insert(2, "filter")
+
+    edges = list(zip(chain[:-1], chain[1:]))
+    return nodes, edges
+
+
+def multi_branch_nodes():
+    """构建两个独立分支（按Region和按Category）汇入同一个输出节点的工作流"""
+    all_nodes = []
+    all_edges = []
+    branch_specs = [("region-", "Region", None), ("category-", "Category", [])]
+    for prefix, column, filter_conditions in branch_specs:
+        nodes, edges = lookup_aggregate_nodes(filter_conditions)
+        rename = lambda node_id: node_id if node_id == "output" else prefix + node_id
+        for node in nodes:
+            if node["id"] == "output":
+                continue
+            data = dict(node["data"])
+            if node["type"] == "indexSource":
+                data["columnName"] = column
+            elif node["type"] == "rowLookup":
+                data["matchColumn"] = column
+            all_nodes.append({"id": rename(node["id"]), "type": node["type"], "data": data})
+        all_edges.extend((rename(source), rename(target)) for source, target in edges)
+
+    all_nodes.append({"id": "output", "type": "output", "data": {}})
+    return all_nodes, all_edges
+
+
+class TestPipelineExecutorUnittest(unittest.TestCase):
+    """PipelineExecutor单元测试类 - 兼容unittest"""
+
+    def setUp(self):
+        self.test_framework = ExecutorTestFramework()
+
+    def assert_same_as_serial(self, nodes, edges, **options):
+        workspace = self.test_framework.build_workspace(nodes, edges)
+        serial = self.test_framework.execute(
+            workspace, "output", vectorized_execution=False
+        )
+        optimized = self.test_framework.execute(workspace, "output", **options)
+
+        self.assertTrue(serial.success, serial.error)
+        self.assertEqual(
+            self.test_framework.summarize(serial),
+            self.test_framework.summarize(optimized),
+        )
+        return optimized
+
+    def test_vectorized_lookup_aggregate_matches_serial(self):
+        """向量化执行的结果与逐索引执行一致"""
+        nodes, edges = lookup_aggregate_nodes()
+        result = self.assert_same_as_serial(nodes, edges, vectorized_execution=True)
+        self.assertGreater(len(result.index_results), 1)
+
+    def test_vectorized_with_filter_matches_serial(self):
+        """带行过滤前缀的向量化执行与逐索引执行一致"""
+        nodes, edges = lookup_aggregate_nodes(
+            [
+                {"column": "Order Status", "operator": "==", "value": "Completed"},
+                {"column": "Quantity", "operator": ">", "value": 5, "logic": "OR"},
+            ]
+        )
+        self.assert_same_as_serial(nodes, edges, vectorized_execution=True)
+
+    def test_vectorized_falls_back_on_invalid_config(self):
+        """配置错误时回退到逐索引执行，保持相同的错误记录"""
+        nodes, edges = lookup_aggregate_nodes()
+        nodes[2]["data"]["matchColumn"] = "Missing Column"
+        self.assert_same_as_serial(nodes, edges, vectorized_execution=True)
+
+    def test_parallel_execution_matches_serial(self):
+        """多进程并行执行的结果与串行执行一致"""
+        nodes, edges = lookup_aggregate_nodes(
+            [{"column": "Quantity", "operator": ">=", "value": 3}]
+        )
+        nodes[2]["data"]["matchMode"] = "contains"
+        result = self.assert_same_as_serial(
+            nodes, edges, vectorized_execution=False, max_workers=2
+        )
+        self.assertGreater(len(result.index_results), 2)
+
+    def test_parallel_workers_use_sheets_preloaded_after_branch_start(self):
+        """进程池在所有预加载完成后才创建，工作进程使用主进程已加载的sheet而不重新读取Excel"""
+        nodes, edges = lookup_aggregate_nodes()
+        workspace = self.test_framework.build_workspace(nodes, edges)
+        request = ExecutePipelineRequest(
+            workspace_config=workspace,
+            target_node_id="output",
+            execution_mode=ExecutionMode.TEST,
+            vectorized_execution=False,
+        )
+        executor = PipelineExecutor()
+        global_context = executor.context_manager.create_global_context(
+            workspace, ExecutionMode.TEST
+        )
+        node_map = {node.id: node for node in workspace.flow_nodes}
+        branches, _ = executor.path_analyzer.analyze(
+            workspace.flow_nodes, workspace.flow_edges, "output"
+        )
+        branch = next(iter(branches.values()))
+        index_values = executor._get_branch_index_values(branch, node_map, global_context)
+
+        # 模拟分支开始时sheet还在预加载：只在等待预加载时写入全局上下文，
+        # 且内容与Excel文件不同，工作进程重新读取文件时聚合结果会不一致
+        cache_key = dataframe_cache_key(TEST_FILE_ID, SALES_SHEET, None)
+        preloaded = global_context.loaded_dataframes.pop(cache_key).copy()
+        preloaded["Final Amount"] = preloaded["Final Amount"] * 10
+
+        def finish_preload():
+            global_context.loaded_dataframes[cache_key] = preloaded
+
+        parallel_executor = ParallelBranchExecutor(2, wait_for_preload=finish_preload)
+        try:
+            parallel_result, _ = executor._execute_branch(
+                branch, index_values, node_map, global_context, request, parallel_executor
+            )
+        finally:
+            parallel_executor.shutdown()
+        serial_result, _ = PipelineExecutor()._execute_branch(
+            branch, index_values, node_map, global_context, request, None
+        )
+
+        self.assertGreater(len(index_values), 2)
+        self.assertEqual(parallel_result.final_aggregations, serial_result.final_aggregations)
+
+    def test_concurrent_branches_match_serial(self):
+        """多个分支并发执行的结果与逐个分支执行一致"""
+        nodes, edges = multi_branch_nodes()
+        result = self.assert_same_as_serial(nodes, edges, max_parallel_branches=2)
+        self.assertEqual(len(result.branch_results), 2)
+
+    def test_invariant_nodes_execute_once_per_branch(self):
+        """与索引值无关的节点每个分支只执行一次，结果与逐节点执行一致"""
+        nodes, edges = lookup_aggregate_nodes(
+            [{"column": "Order Status", "operator": "!=", "value": "Cancelled"}]
+        )
+        nodes[2]["data"]["matchMode"] = "contains"
+        workspace = self.test_framework.build_workspace(nodes, edges)
+
+        analyzer = get_performance_analyzer()
+        analyzer.reset()
+        result = self.test_framework.execute(workspace, "output")
+        node_stats = analyzer.get_stats()["node_stats"]
+
+        self.assertTrue(result.success, result.error)
+        self.assertGreater(len(result.index_results), 1)
+        self.assertEqual(node_stats["selector"]["execution_count"], 1)
+        self.assertEqual(node_stats["filter"]["execution_count"], 1)
+        self.assertEqual(
+            node_stats["lookup"]["execution_count"], len(result.index_results)
+        )
+
+        # 直接调用各处理器得到参照结果
+        framework = self.test_framework
+        global_context = framework.setup_global_context()
+        node_by_id = {node["id"]: framework.create_node_from_config(node) for node in nodes}
+        for index_value, aggregations in result.branch_results[0].final_aggregations.items():
+            index_value = IndexValue(index_value)
+            path_context = PathContext(current_index=index_value)
+            df = framework.processors[NodeType.SHEET_SELECTOR].process(
+                node_by_id["selector"], SheetSelectorInput(index_value=index_value),
+                global_context, path_context,
+            ).dataframe
+            df = framework.processors[NodeType.ROW_FILTER].process(
+                node_by_id["filter"], RowFilterInput(dataframe=df, index_value=index_value),
+                global_context, path_context,
+            ).dataframe
+            df = framework.processors[NodeType.ROW_LOOKUP].process(
+                node_by_id["lookup"], RowLookupInput(dataframe=df, index_value=index_value),
+                global_context, path_context,
+            ).dataframe
+            expected = {}
+            for node_id in ("sum", "max", "last"):
+                aggregation = framework.processors[NodeType.AGGREGATOR].process(
+                    node_by_id[node_id], AggregatorInput(dataframe=df, index_value=index_value),
+                    global_context, path_context,
+                ).result
+                expected[aggregation.column_name] = aggregation.result_value
+            self.assertEqual(aggregations, expected)
+
+    def test_column_pruning_matches_full_read(self):
+        """列裁剪只读取流程中用到的列，输出结果与读取所有列一致"""
+        nodes, edges = lookup_aggregate_nodes(
+            [{"column": "Order Status", "operator": "!=", "value": "Cancelled"}]
+        )
+        workspace = self.test_framework.build_workspace(nodes, edges)
+        full = self.test_framework.execute(workspace, "output")
+        pruned = self.test_framework.execute(workspace, "output", prune_columns=True)
+
+        self.assertTrue(pruned.success, pruned.error)
+        full_summary = self.test_framework.summarize(full)
+        pruned_summary = self.test_framework.summarize(pruned)
+        self.assertEqual(full_summary["sheets"], pruned_summary["sheets"])
+        self.assertEqual(full_summary["branches"], pruned_summary["branches"])
+
+        # 聚合全部失败时输出回退到分支的DataFrame，仍然包含所有列
+        failing_nodes, failing_edges = lookup_aggregate_nodes()
+        failing_nodes = [node for node in failing_nodes if node["id"] not in ("max", "last")]
+        failing_nodes[3]["data"] = {"statColumn": "Typo Column", "method": "sum"}
+        failing_edges = [("index", "selector"), ("selector", "lookup"),
+                         ("lookup", "sum"), ("sum", "output")]
+        failing_workspace = self.test_framework.build_workspace(failing_nodes, failing_edges)
+        full = self.test_framework.execute(failing_workspace, "output")
+        pruned = self.test_framework.execute(failing_workspace, "output", prune_columns=True)
+        full_sheets = self.test_framework.summarize(full)["sheets"]
+        self.assertGreater(len(full_sheets), 1)
+        self.assertGreater(len(full_sheets[0][1]["columns"]), 1)
+        self.assertEqual(full_sheets, self.test_framework.summarize(pruned)["sheets"])
+
+        executor = PipelineExecutor()
+        node_map = {node.id: node for node in workspace.flow_nodes}
+        branches, _ = executor.path_analyzer.analyze(
+            workspace.flow_nodes, workspace.flow_edges, "output"
+        )
+        requirements = ColumnPlanner().plan(branches, node_map, "output")
+        self.assertEqual(
+            requirements.columns_for(TEST_FILE_ID, SALES_SHEET),
+            {"Region", "Order Status", "Final Amount", "Sales Rep", "Sale Date"},
+        )
+
+        # 没有聚合节点的分支把整张表写入输出，需要所有列
+        no_aggregate = [node for node in nodes if node["type"] != "aggregator"]
+        workspace = self.test_framework.build_workspace(
+            no_aggregate, [("index", "selector"), ("selector", "filter"),
+                           ("filter", "lookup"), ("lookup", "output")]
+        )
+        node_map = {node.id: node for node in workspace.flow_nodes}
+        branches, _ = executor.path_analyzer.analyze(
+            workspace.flow_nodes, workspace.flow_edges, "output"
+        )
+        requirements = ColumnPlanner().plan(branches, node_map, "output")
+        self.assertIsNone(requirements.columns_for(TEST_FILE_ID, SALES_SHEET))
+
+    def test_filter_pushdown_matches_filter_node(self):
+        """下推到加载阶段的行过滤与过滤节点的结果一致"""
+        for index_sheet in (SALES_SHEET, "Sheet1_Perfect_Clean"):
+            nodes, edges = lookup_aggregate_nodes(
+                [
+                    {"column": "Order Status", "operator": "==", "value": "Completed"},
+                    {"column": "Quantity", "operator": ">", "value": 5, "logic": "OR"},
+                ]
+            )
+            nodes[0]["data"]["sheetName"] = index_sheet
+            workspace = self.test_framework.build_workspace(nodes, edges)
+            full = self.test_framework.execute(workspace, "output")
+            pushed = self.test_framework.execute(
+                workspace, "output", pushdown_filters=True, prune_columns=True
+            )
+
+            self.assertTrue(pushed.success, pushed.error)
+            full_summary = self.test_framework.summarize(full)
+            pushed_summary = self.test_framework.summarize(pushed)
+            self.assertEqual(full_summary["sheets"], pushed_summary["sheets"])
+            self.assertEqual(full_summary["branches"], pushed_summary["branches"])
+
+            node_map = {node.id: node for node in workspace.flow_nodes}
+            branches, _ = PipelineExecutor().path_analyzer.analyze(
+                workspace.flow_nodes, workspace.flow_edges, "output"
+            )
+            rewritten, preload_filters = PredicatePushdown().rewrite(
+                branches, node_map, workspace.flow_edges, "output"
+            )
+            self.assertEqual(rewritten["filter"].data["conditions"], [])
+            self.assertEqual(
+                rewritten["selector"].data["pushedFilters"],
+                node_map["filter"].data["conditions"],
+            )
+            # 索引源读取同一个sheet时需要完整内容，不能在预加载时过滤
+            self.assertEqual(
+                (TEST_FILE_ID, SALES_SHEET) in preload_filters, index_sheet != SALES_SHEET
+            )
+
+    def test_late_materialization_matches_copied_rows(self):
+        """行选择向量只在输出时物化，结果与每个节点复制DataFrame一致"""
+        conditions = [{"column": "Order Status", "operator": "!=", "value": "Cancelled"}]
+        for match_mode in ("exact", "contains"):
+            nodes, edges = lookup_aggregate_nodes(conditions)
+            nodes[2]["data"]["matchMode"] = match_mode
+            # 不带聚合节点的分支按索引值输出匹配行，覆盖输出节点的物化
+            no_aggregate = [node for node in nodes if node["type"] != "aggregator"]
+            for workspace in (
+                self.test_framework.build_workspace(nodes, edges),
+                self.test_framework.build_workspace(
+                    no_aggregate,
+                    [("index", "selector"), ("selector", "filter"),
+                     ("filter", "lookup"), ("lookup", "output")],
+                ),
+            ):
+                copied = self.test_framework.execute(workspace, "output")
+                late = self.test_framework.execute(
+                    workspace, "output", late_materialization=True
+                )
+
+                self.assertTrue(late.success, late.error)
+                self.assertEqual(
+                    self.test_framework.summarize(copied),
+                    self.test_framework.summarize(late),
+                )
+
+                # 过滤和查找的结果引用同一张源sheet
+                selections = [
+                    node_result.output["dataframe"]
+                    for index_result in late.index_results
+                    for node_result in index_result.node_results
+                    if node_result.node_id in ("filter", "lookup")
+                ]
+                self.assertTrue(selections)
+                self.assertTrue(all(isinstance(df, RowSelection) for df in selections))
+                self.assertEqual(len({id(df.base) for df in selections}), 1)
+
+    def test_branches_run_in_file_completion_order(self):
+        """数据流调度：分支在其依赖的文件加载完成后立即执行，不等待其他文件"""
+        futures = {"slow": Future(), "fast": Future()}
+
+        class StubPreloadHandle:
+            def futures_for_files(self, file_ids):
+                return [futures[file_id] for file_id in file_ids if file_id in futures]
+
+            def wait_for_files(self, file_ids):
+                for future in self.futures_for_files(file_ids):
+                    future.result()
+
+        threading.Timer(0.05, futures["fast"].set_result, args=(None,)).start()
+        order = []
+        for position in PipelineExecutor()._iter_ready_branches(
+            [{"slow"}, {"fast"}, {"unplanned"}], [StubPreloadHandle()]
+        ):
+            order.append(position)
+            if len(order) == 2:
+                futures["slow"].set_result(None)
+
+        self.assertEqual(order, [2, 1, 0])
+
+
+class TestBatchPreloaderUnittest(unittest.TestCase):
+    """BatchPreloader单元测试类 - 兼容unittest"""
+
+    def test_single_open_preload_matches_read_excel(self):
+        """一次打开文件读取的多个Sheet与逐个read_excel的结果一致，并报告实际读取字节数"""
+        global_context = BaseTestFramework().setup_global_context()
+        global_context.loaded_dataframes.clear()
+        file_path = global_context.files[TEST_FILE_ID].path
+        sheets = [SALES_SHEET, "Missing Sheet"] + [
+            meta["sheet_name"] for meta in global_context.files[TEST_FILE_ID].sheet_metas[:2]
+        ]
+        batch_info = FileBatchInfo(
+            file_id=TEST_FILE_ID,
+            file_path=file_path,
+            required_sheets=sheets,
+            sheet_header_rows={},
+        )
+
+        summary = BatchPreloader().preload_files([batch_info], global_context)
+
+        self.assertEqual(summary.total_files_size_bytes, os.path.getsize(file_path))
+        self.assertEqual(summary.failed_sheets, 1)
+        self.assertEqual(summary.successful_sheets, len(set(sheets)) - 1)
+        for sheet_name in set(sheets) - {"Missing Sheet"}:
+            expected = clean_dataframe_with_smart_strategy(
+                pd.read_excel(file_path, sheet_name=sheet_name)
+            )
+            pd.testing.assert_frame_equal(
+                global_context.loaded_dataframes[f"{TEST_FILE_ID}_{sheet_name}"], expected
+            )
+
+    def test_process_preload_matches_thread_preload(self):
+        """进程池解析并以二进制形式传回的DataFrame与线程池加载的结果一致"""
+        loaded = []
+        for use_processes in (False, True):
+            global_context = BaseTestFramework().setup_global_context()
+            global_context.loaded_dataframes.clear()
+            file_info = global_context.files[TEST_FILE_ID]
+            batch_infos = [
+                FileBatchInfo(
+                    file_id=file_id,
+                    file_path=file_info.path,
+                    required_sheets=[meta["sheet_name"] for meta in file_info.sheet_metas],
+                    sheet_header_rows={},
+                )
+                for file_id in (TEST_FILE_ID, TEST_FILE_ID + "-copy")
+            ]
+            summary = BatchPreloader(max_workers=2).preload_files(
+                batch_infos, global_context, use_processes=use_processes
+            )
+            self.assertEqual(summary.failed_sheets, 0)
+            loaded.append(global_context.loaded_dataframes)
+
+        thread_frames, process_frames = loaded
+        self.assertEqual(sorted(thread_frames), sorted(process_frames))
+        for cache_key, expected in thread_frames.items():
+            actual = process_frames[cache_key]
+            pd.testing.assert_frame_equal(actual, expected)
+            # 还原的DataFrame可以原地修改
+            if len(actual):
+                actual.iloc[0, 0] = actual.iloc[0, 0]
+
+    def test_auto_by_index_preloads_only_index_sheets(self):
+        """auto_by_index模式只预加载与索引值同名的sheet"""
+        nodes, edges = lookup_aggregate_nodes()
+        nodes[1]["data"] = {"targetFileID": TEST_FILE_ID, "mode": "auto_by_index"}
+        workspace = ExecutorTestFramework().build_workspace(nodes, edges)
+
+        analyzer = FileAnalyzer()
+        all_sheets = analyzer.analyze_file_requirements(workspace, ["selector"])
+        self.assertEqual(len(all_sheets[0].required_sheets), len(workspace.files[0].sheet_metas))
+        selected = analyzer.analyze_file_requirements(
+            workspace, ["selector"], {"selector": {SALES_SHEET, "North"}}
+        )
+        self.assertEqual(selected[0].required_sheets, [SALES_SHEET])
+        self.assertEqual(
+            analyzer.analyze_file_requirements(workspace, ["selector"], {"selector": {"North"}}),
+            [],
+        )
+
+        # 索引值（Region）都不是sheet名，执行时只会加载索引源读取的sheet
+        executor = PipelineExecutor()
+        executor.execute_pipeline(
+            ExecutePipelineRequest(
+                workspace_config=workspace,
+                target_node_id="output",
+                execution_mode=ExecutionMode.TEST,
+            )
+        )
+        self.assertEqual(
+            list(executor.context_manager.global_context.loaded_dataframes),
+            [f"{TEST_FILE_ID}_{SALES_SHEET}"],
+        )
+
+    def test_index_source_sheets_are_preloaded_first(self):
+        """索引源读取的sheet进入预加载计划并优先加载，执行时不再按需加载"""
+        nodes, edges = lookup_aggregate_nodes()
+        nodes[0]["data"]["sheetName"] = "Sheet1_Perfect_Clean"
+        nodes[0]["data"]["columnName"] = "Region"
+        workspace = ExecutorTestFramework().build_workspace(nodes, edges)
+
+        batch_infos = FileAnalyzer().analyze_file_requirements(
+            workspace, ["index", "selector"], index_dependent=False
+        )
+        self.assertEqual(len(batch_infos), 1)
+        self.assertEqual(
+            sorted(batch_infos[0].required_sheets), ["Sheet1_Perfect_Clean", SALES_SHEET]
+        )
+        self.assertEqual(batch_infos[0].priority, INDEX_SOURCE_PRIORITY)
+
+        analyzer = get_performance_analyzer()
+        analyzer.reset()
+        result = ExecutorTestFramework().execute(workspace, "output")
+        self.assertTrue(result.success, result.error)
+        self.assertEqual(analyzer.get_stats()["cache_stats"]["miss_count"], 0)
+
+
+class TestSheetDiskCacheUnittest(unittest.TestCase):
+    """持久化Sheet缓存单元测试类 - 兼容unittest"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(prefix="sheet-cache-")
+        self.sheet_cache = configure_sheet_cache(self.cache_dir)
+
+    def tearDown(self):
+        configure_sheet_cache(None)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def preload_all_sheets(self):
+        global_context = BaseTestFramework().setup_global_context()
+        global_context.loaded_dataframes.clear()
+        file_info = global_context.files[TEST_FILE_ID]
+        batch_info = FileBatchInfo(
+            file_id=TEST_FILE_ID,
+            file_path=file_info.path,
+            required_sheets=[meta["sheet_name"] for meta in file_info.sheet_metas],
+            sheet_header_rows={},
+        )
+        summary = BatchPreloader().preload_files([batch_info], global_context)
+        return summary, global_context.loaded_dataframes
+
+    def test_cached_sheets_match_fresh_load(self):
+        """第二次预加载从缓存读取，结果与解析清洗后的DataFrame完全一致"""
+        first_summary, fresh_frames = self.preload_all_sheets()
+        self.assertGreater(first_summary.total_files_size_bytes, 0)
+        self.assertEqual(self.sheet_cache.hit_count, 0)
+
+        second_summary, cached_frames = self.preload_all_sheets()
+        self.assertEqual(second_summary.total_files_size_bytes, 0)
+        self.assertEqual(self.sheet_cache.hit_count, len(fresh_frames))
+        for cache_key, expected in fresh_frames.items():
+            pd.testing.assert_frame_equal(cached_frames[cache_key], expected)
+
+        # 处理器按需加载同样命中缓存
+        framework = BaseTestFramework()
+        global_context = framework.setup_global_context()
+        global_context.loaded_dataframes.clear()
+        df = framework.processors[NodeType.SHEET_SELECTOR].load_dataframe_from_file(
+            global_context, TEST_FILE_ID, SALES_SHEET
+        )
+        self.assertEqual(self.sheet_cache.hit_count, len(fresh_frames) + 1)
+        pd.testing.assert_frame_equal(df, fresh_frames[f"{TEST_FILE_ID}_{SALES_SHEET}"])
+
+    def test_process_preload_writes_cache(self):
+        """配置了持久化缓存时进程池预加载正常完成，工作进程写入的条目可以被再次命中"""
+        global_context = BaseTestFramework().setup_global_context()
+        global_context.loaded_dataframes.clear()
+        file_info = global_context.files[TEST_FILE_ID]
+        batch_infos = [
+            FileBatchInfo(
+                file_id=file_id,
+                file_path=file_info.path,
+                required_sheets=[meta["sheet_name"] for meta in file_info.sheet_metas],
+                sheet_header_rows={},
+            )
+            for file_id in (TEST_FILE_ID, TEST_FILE_ID + "-copy")
+        ]
+        summary = BatchPreloader(max_workers=2).preload_files(
+            batch_infos, global_context, use_processes=True
+        )
+        self.assertEqual(summary.failed_sheets, 0)
+        self.assertEqual(summary.successful_sheets, summary.total_sheets)
+
+        second_summary, cached_frames = self.preload_all_sheets()
+        self.assertEqual(second_summary.total_files_size_bytes, 0)
+        self.assertEqual(self.sheet_cache.hit_count, len(cached_frames))
+        for cache_key, actual in cached_frames.items():
+            pd.testing.assert_frame_equal(actual, global_context.loaded_dataframes[cache_key])
+
+    def test_changed_fingerprint_invalidates_entry(self):
+        """文件指纹或表头行变化时缓存失效"""
+        file_path = BaseTestFramework().setup_global_context().files[TEST_FILE_ID].path
+        fingerprint = file_fingerprint(file_path)
+        df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", None, "z"]})
+        df["c"] = pd.array([1, None, 3], dtype="Int64")
+        self.sheet_cache.store(file_path, SALES_SHEET, 0, fingerprint, df)
+
+        pd.testing.assert_frame_equal(
+            self.sheet_cache.load(file_path, SALES_SHEET, 0, fingerprint), df
+        )
+        changed = (fingerprint[0], fingerprint[1], fingerprint[2] + 1)
+        self.assertIsNone(self.sheet_cache.load(file_path, SALES_SHEET, 0, changed))
+        self.assertIsNone(self.sheet_cache.load(file_path, SALES_SHEET, 1, fingerprint))
+
+    def test_stale_and_least_recently_used_entries_are_removed(self):
+        """文件变化后旧条目被删除，总大小超出上限时淘汰最久未使用的条目"""
+        file_path = BaseTestFramework().setup_global_context().files[TEST_FILE_ID].path
+        fingerprint = file_fingerprint(file_path)
+        changed = (fingerprint[0], fingerprint[1], fingerprint[2] + 1)
+        df = pd.DataFrame({"a": range(1000), "b": [f"v{i}" for i in range(1000)]})
+        cache_dir = os.path.join(self.cache_dir, "lru")
+        sheet_cache = SheetDiskCache(cache_dir)
+
+        def entry_count():
+            return sum(META_FILE in files for _, _, files in os.walk(cache_dir))
+
+        sheet_cache.store(file_path, SALES_SHEET, 0, fingerprint, df)
+        sheet_cache.store(file_path, SALES_SHEET, 0, fingerprint, df[["a"]], frozenset({"a"}))
+        sheet_cache.store(file_path, "Other", 0, fingerprint, df)
+        self.assertEqual(entry_count(), 3)
+        sheet_cache.store(file_path, SALES_SHEET, 0, changed, df)
+        self.assertEqual(entry_count(), 1)
+
+        # 上限只够三个条目：读取过的条目保留，最久未使用的被淘汰
+        sheet_cache.max_bytes = int(
+            sum(
+                os.path.getsize(os.path.join(root, name))
+                for root, _, files in os.walk(cache_dir)
+                for name in files
+            )
+            * 3.5
+        )
+        for sheet_name in ("A", "B"):
+            time.sleep(0.02)
+            sheet_cache.store(file_path, sheet_name, 0, changed, df)
+        time.sleep(0.02)
+        self.assertIsNotNone(sheet_cache.load(file_path, SALES_SHEET, 0, changed))
+        time.sleep(0.02)
+        sheet_cache.store(file_path, "C", 0, changed, df)
+
+        self.assertEqual(entry_count(), 3)
+        self.assertIsNone(sheet_cache.load(file_path, "A", 0, changed))
+        for sheet_name in (SALES_SHEET, "B", "C"):
+            self.assertIsNotNone(sheet_cache.load(file_path, sheet_name, 0, changed))
+
+
+class TestSheetMemoryCacheUnittest(unittest.TestCase):
+    """进程级Sheet内存缓存单元测试类 - 兼容unittest"""
+
+    def tearDown(self):
+        configure_sheet_memory_cache(None)
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        """总内存占用超出上限时按LRU顺序淘汰，文件指纹变化时失效"""
+        frames = {
+            name: pd.DataFrame({"value": range(1000)}) for name in ("a", "b", "c")
+        }
+        nbytes = int(frames["a"].memory_usage(deep=True).sum())
+        cache = SheetMemoryCache(max_bytes=nbytes * 2)
+        fingerprint = ("hash", 1, 1)
+
+        cache.put("file.xlsx", "a", 0, fingerprint, frames["a"])
+        cache.put("file.xlsx", "b", 0, fingerprint, frames["b"])
+        self.assertIs(cache.get("file.xlsx", "a", 0, fingerprint), frames["a"])
+        cache.put("file.xlsx", "c", 0, fingerprint, frames["c"])
+
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.total_bytes, cache.max_bytes)
+        self.assertIsNone(cache.get("file.xlsx", "b", 0, fingerprint))
+        self.assertIs(cache.get("file.xlsx", "c", 0, fingerprint), frames["c"])
+        self.assertIsNone(cache.get("file.xlsx", "a", 0, ("hash", 1, 2)))
+        self.assertEqual(len(cache), 1)
+
+    def test_sheets_reused_across_requests(self):
+        """不同请求的全局上下文共享已加载的Sheet，命中通过性能分析器上报"""
+        memory_cache = configure_sheet_memory_cache(64 * 1024 * 1024)
+        framework = BaseTestFramework()
+        processor = framework.processors[NodeType.SHEET_SELECTOR]
+        analyzer = get_performance_analyzer()
+
+        loaded = []
+        for _ in range(2):
+            global_context = framework.setup_global_context()
+            global_context.loaded_dataframes.clear()
+            analyzer.reset()
+            loaded.append(
+                processor.load_dataframe_from_file(global_context, TEST_FILE_ID, SALES_SHEET)
+            )
+
+        cache_stats = analyzer.get_stats()["cache_stats"]
+        self.assertEqual((cache_stats["hit_count"], cache_stats["miss_count"]), (1, 0))
+        self.assertIs(loaded[0], loaded[1])
+        self.assertEqual(memory_cache.hit_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
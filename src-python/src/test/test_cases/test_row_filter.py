@@ -4,8 +4,14 @@ RowFilter节点测试类
 """
 
 import unittest
+
+import numpy as np
+import pandas as pd
+
 from .test_base import BaseTestFramework, TestSuiteResult
-from pipeline.models import NodeType
+from pipeline.models import AggregationOperation, GlobalContext, NodeType, RowSelection
+from pipeline.processors import AggregatorProcessor
+from pipeline.processors.compiled_filter import _FrameColumns
 
 
 class TestRowFilter(BaseTestFramework):
@@ -75,6 +81,240 @@ class TestRowFilterUnittest(unittest.TestCase):
         )
 
 
+class TestNumericCoercionCacheUnittest(unittest.TestCase):
+    """列数值转换缓存测试 - 过滤结果必须与每次重新转换一致"""
+
+    def setUp(self):
+        self.test_framework = TestRowFilter()
+        self.processor = self.test_framework.processor
+        self.df = pd.read_excel(
+            self.test_framework.excel_file_path,
+            sheet_name="Sheet7_Real_World_Sales",
+            header=0,
+        )
+        self.conditions = [
+            {"column": "Quantity", "operator": ">", "value": 5},
+            {"column": "Final Amount", "operator": "between", "value": [100, 5000]},
+            {"column": "Quantity", "operator": "<=", "value": "20"},
+        ]
+
+    def test_cached_conversion_matches_direct_filter(self):
+        """同一sheet的列只转换一次，行选择向量按位置复用转换结果"""
+        expected = self.processor._apply_filter_conditions(self.df, self.conditions)
+        global_context = GlobalContext()
+        for _ in range(3):
+            actual = self.processor._apply_filter_conditions(
+                self.df, self.conditions, global_context
+            )
+            pd.testing.assert_frame_equal(actual, expected)
+
+        cache = global_context.coercion_cache
+        self.assertEqual(cache.miss_count, 2)  # Quantity和Final Amount各转换一次
+        self.assertGreater(cache.hit_count, 0)
+
+        positions = np.arange(0, len(self.df), 3)
+        selection = RowSelection(self.df, positions)
+        actual = self.processor._apply_filter_conditions(
+            selection, self.conditions, global_context
+        )
+        pd.testing.assert_frame_equal(
+            actual.to_pandas(),
+            self.processor._apply_filter_conditions(
+                self.df.take(positions), self.conditions
+            ),
+        )
+        self.assertEqual(cache.miss_count, 2)
+
+        # 替换后的sheet不会命中旧的转换结果
+        other_df = self.df.copy()
+        cache_key = ("numeric_column", id(self.df), "Quantity")
+        self.assertIsNotNone(cache.get(cache_key, anchor=self.df))
+        self.assertIsNone(cache.get(cache_key, anchor=other_df))
+
+    def test_selection_conversion_matches_copied_subset(self):
+        """整列转换因非数值变为float64时，行选择向量的转换结果与复制出的子集一致"""
+        df = pd.DataFrame({"value": pd.Series([2**53 + 1, 1, 1, "x"], dtype=object)})
+        global_context = GlobalContext()
+        positions = np.array([0, 1, 2])
+        selection = RowSelection(df, positions)
+
+        expected = pd.to_numeric(df.take(positions)["value"], errors="coerce")
+        for _ in range(2):
+            actual = self.processor.numeric_column(selection, "value", global_context)
+            pd.testing.assert_series_equal(actual.numeric, expected)
+        cached = global_context.coercion_cache.get(
+            ("numeric_column", id(df), "value"), anchor=df
+        )
+        self.assertEqual(cached.numeric.dtype, np.float64)
+
+        aggregator = AggregatorProcessor()
+        self.assertEqual(
+            aggregator._perform_aggregation(
+                selection, "value", AggregationOperation.SUM, global_context
+            ),
+            aggregator._perform_aggregation(
+                df.take(positions), "value", AggregationOperation.SUM
+            ),
+        )
+
+
+class TestCompiledFilterUnittest(unittest.TestCase):
+    """编译过滤条件测试 - 编译执行的掩码必须与逐条解释执行一致"""
+
+    def setUp(self):
+        self.test_framework = TestRowFilter()
+        self.processor = self.test_framework.processor
+        self.df = pd.read_excel(
+            self.test_framework.excel_file_path,
+            sheet_name="Sheet7_Real_World_Sales",
+            header=0,
+        )
+        columns = list(self.df.columns)
+        self.condition_lists = [
+            [
+                {"column": "Quantity", "operator": ">=", "value": "3"},
+                {"column": "Final Amount", "operator": "between", "value": [100, 5000], "logic": "OR"},
+            ],
+            [
+                {"column": columns[0], "operator": "contains", "value": "1"},
+                {"column": columns[1], "operator": "not_contains", "value": "a"},
+                {"column": columns[1], "operator": "starts_with", "value": "A", "logic": "OR"},
+            ],
+            [
+                {"column": columns[1], "operator": "!=", "value": "x"},
+                {"column": "Quantity", "operator": "in", "value": [1, 2, 3]},
+                {"column": columns[2], "operator": "is_not_null", "value": None},
+            ],
+            [
+                {"column": "Quantity", "operator": "==", "value": "abc"},
+                {"column": columns[1], "operator": "<", "value": "M", "logic": "or"},
+            ],
+        ]
+
+    def test_compiled_mask_matches_interpreter(self):
+        """DataFrame和行选择向量上的编译结果都与解释执行一致"""
+        global_context = GlobalContext()
+        selection = RowSelection(self.df, np.arange(1, len(self.df), 2))
+        for conditions in self.condition_lists:
+            compiled = self.processor.compile_filter(conditions)
+            for df in (self.df, selection, self.df):
+                expected = self.processor._build_filter_mask(df, conditions).to_numpy(
+                    dtype=bool, na_value=False
+                )
+                np.testing.assert_array_equal(
+                    compiled.evaluate(df, global_context), expected
+                )
+
+    def test_reordered_conditions_match_interpreter(self):
+        """AND条件按统计信息重排、只在剩余行上计算，OR的语义保持不变"""
+        global_context = GlobalContext()
+        columns = list(self.df.columns)
+        conditions = [
+            {"column": columns[1], "operator": "contains", "value": "a"},
+            {"column": "Quantity", "operator": ">", "value": 18},
+            {"column": "Final Amount", "operator": "<", "value": 0, "logic": "OR"},
+            {"column": columns[2], "operator": "is_not_null", "value": None},
+            {"column": "Quantity", "operator": "==", "value": 19},
+        ]
+        compiled = self.processor.compile_filter(conditions)
+        self.assertEqual([len(segment) for segment in compiled.segments], [2, 3])
+
+        expected = self.processor._build_filter_mask(self.df, conditions).to_numpy(
+            dtype=bool, na_value=False
+        )
+        for _ in range(3):
+            np.testing.assert_array_equal(
+                compiled.evaluate(self.df, global_context), expected
+            )
+
+        # 已加载的sheet收集了统计信息，便宜且选择率低的数值条件排在字符串条件之前
+        statistics = self.processor.column_statistics(self.df, "Quantity", global_context)
+        self.assertEqual(statistics.rows, len(self.df))
+        self.assertEqual(statistics.maximum, float(self.df["Quantity"].max()))
+        frame = _FrameColumns(self.processor, self.df, global_context)
+        ordered = compiled._order(compiled.segments[0], frame)
+        self.assertEqual([c.operator for c in ordered], [">", "contains"])
+
+    def test_dictionary_encoded_columns_match_interpreter(self):
+        """重复取值多的object列按字典编码比较，结果与逐行比较一致"""
+        global_context = GlobalContext()
+        global_context.coercion_cache.is_reused(self.df)
+        self.assertIsNotNone(
+            self.processor.dictionary_column(self.df, "Region", global_context)
+        )
+        # 不同取值太多的列和数值列不编码
+        unique_df = pd.DataFrame({"key": [f"k{i}" for i in range(10)], "n": range(10)})
+        global_context.coercion_cache.is_reused(unique_df)
+        for column in ["key", "n"]:
+            self.assertIsNone(
+                self.processor.dictionary_column(unique_df, column, global_context)
+            )
+
+        region = self.df["Region"].dropna().iloc[0]
+        selection = RowSelection(self.df, np.arange(0, len(self.df), 3))
+        for conditions in [
+            [{"column": "Region", "operator": "==", "value": region}],
+            [{"column": "Region", "operator": "!=", "value": region}],
+            [{"column": "Region", "operator": "in", "value": [region, None, "x"]}],
+            [{"column": "Region", "operator": "not_in", "value": [region]}],
+        ]:
+            compiled = self.processor.compile_filter(conditions)
+            for df in (self.df, selection):
+                expected = self.processor._build_filter_mask(df, conditions).to_numpy(
+                    dtype=bool, na_value=False
+                )
+                np.testing.assert_array_equal(
+                    compiled.evaluate(df, global_context), expected
+                )
+
+    def test_sorted_index_range_selection_matches_scan(self):
+        """已加载sheet上选择性高的范围条件用排序索引查找，结果与逐行比较一致"""
+        global_context = GlobalContext()
+        quantity = self.df["Quantity"]
+        high = quantity.quantile(0.9)
+        for conditions in [
+            [{"column": "Quantity", "operator": ">", "value": high}],
+            [{"column": "Quantity", "operator": "<=", "value": str(quantity.min())}],
+            [
+                {"column": "Quantity", "operator": "between", "value": [high, quantity.max()]},
+                {"column": "Final Amount", "operator": ">", "value": 0},
+            ],
+        ]:
+            compiled = self.processor.compile_filter(conditions)
+            expected = np.flatnonzero(
+                self.processor._build_filter_mask(self.df, conditions).to_numpy(
+                    dtype=bool, na_value=False
+                )
+            )
+            for _ in range(3):
+                np.testing.assert_array_equal(
+                    compiled.select(self.df, global_context), expected
+                )
+            pd.testing.assert_frame_equal(
+                self.processor._apply_filter_conditions(self.df, conditions, global_context),
+                self.df.take(expected),
+            )
+
+        sorted_column = self.processor.sorted_column(self.df, "Quantity", global_context)
+        self.assertIsNotNone(sorted_column)
+        self.assertTrue(
+            np.all(np.diff(sorted_column.sorted_values[: sorted_column.valid_count]) >= 0)
+        )
+        # 行选择向量不使用排序索引
+        selection = RowSelection(self.df, np.arange(len(self.df)))
+        self.assertIsNone(self.processor.sorted_column(selection, "Quantity", global_context))
+
+    def test_compiled_filter_is_cached_by_config(self):
+        """相同配置的条件只编译一次"""
+        conditions = self.condition_lists[0]
+        compiled = self.processor.compile_filter(conditions)
+        same_config = [dict(condition) for condition in conditions]
+        self.assertIs(self.processor.compile_filter(same_config), compiled)
+        self.assertIsNot(
+            self.processor.compile_filter(self.condition_lists[1]), compiled
+        )
+
+
 if __name__ == "__main__":
     # 直接运行测试
     test_runner = TestRowFilter()
@@ -4,8 +4,11 @@ RowLookup节点测试类
 """
 
 import unittest
+import numpy as np
+import pandas as pd
 from .test_base import BaseTestFramework, TestSuiteResult
-from pipeline.models import NodeType
+from pipeline.models import BranchContext, GlobalContext, IndexValue, NodeType, RowSelection
+from pipeline.utils.pattern_matcher import is_literal_pattern
 
 
 class TestRowLookup(BaseTestFramework):
@@ -75,6 +78,112 @@ class TestRowLookupUnittest(unittest.TestCase):
         )
 
 
+class TestRowLookupIndexUnittest(unittest.TestCase):
+    """查找加速结构测试 - 结果必须与逐列比较完全一致"""
+
+    def setUp(self):
+        self.test_framework = TestRowLookup()
+        self.processor = self.test_framework.processor
+        self.df = pd.read_excel(
+            self.test_framework.excel_file_path,
+            sheet_name="Sheet7_Real_World_Sales",
+            header=0,
+        )
+
+    def test_exact_hash_lookup_matches_scan(self):
+        """哈希索引查找与全列扫描结果一致（含大小写、数值列和缺失键）"""
+        global_context = GlobalContext()
+        cases = [
+            ("Region", "europe", False),
+            ("Region", "Europe", True),
+            ("Region", "europe", True),
+            ("Product Name", "not-a-product", False),
+            ("Quantity", str(self.df["Quantity"].iloc[0]), False),
+            ("Discount", "nan", False),
+        ]
+        for column, value, case_sensitive in cases:
+            expected = self.processor._find_matching_rows(
+                self.df, column, value, "exact", case_sensitive
+            )
+            # 第一次出现走扫描，之后走哈希索引
+            for _ in range(2):
+                actual = self.processor._find_exact_matching_rows(
+                    self.df, column, value, case_sensitive, global_context
+                )
+                pd.testing.assert_frame_equal(actual, expected)
+
+        self.assertGreater(global_context.index_cache.hit_count, 0)
+
+    def test_exact_lookup_on_selection_uses_encoded_column(self):
+        """行选择向量上的精确查找比较编码，结果与物化后扫描一致"""
+        global_context = GlobalContext()
+        selection = RowSelection(self.df, np.arange(0, len(self.df), 2))
+        materialized = selection.to_pandas()
+        for column, value, case_sensitive in [
+            ("Region", "europe", False),
+            ("Region", "europe", True),
+            ("Quantity", str(self.df["Quantity"].iloc[0]), False),
+            ("Product Name", "not-a-product", False),
+        ]:
+            expected = self.processor._find_matching_rows(
+                materialized, column, value, "exact", case_sensitive
+            )
+            actual = self.processor._find_matching_rows(
+                selection, column, value, "exact", case_sensitive, global_context
+            )
+            self.assertIsInstance(actual, RowSelection)
+            pd.testing.assert_frame_equal(actual.to_pandas(), expected)
+
+        # 查找列的字符串编码只为源sheet构建一次
+        self.assertEqual(global_context.coercion_cache.miss_count, 3)
+
+    def test_index_cache_is_bounded_and_checks_identity(self):
+        """索引缓存按容量淘汰，且不会为被替换的DataFrame返回旧索引"""
+        global_context = GlobalContext()
+        global_context.index_cache.max_entries = 2
+        for column in ["Region", "Category", "Sales Rep"]:
+            self.processor.get_exact_match_index(self.df, column, False, global_context)
+        self.assertEqual(len(global_context.index_cache), 2)
+
+        other_df = self.df.copy()
+        cache_key = ("row_lookup_exact", id(self.df), "Sales Rep", False)
+        self.assertIsNotNone(global_context.index_cache.get(cache_key, anchor=self.df))
+        self.assertIsNone(global_context.index_cache.get(cache_key, anchor=other_df))
+
+    def test_batched_substring_lookup_matches_scan(self):
+        """批量多模式匹配与逐个索引值扫描结果一致"""
+        column = "Product Name"
+        values = self.df[column].dropna().astype(str).unique().tolist()
+        patterns = ["", "a", "an", "n", "pro", "PRO", "a.b", "(x", "zzz"]
+        patterns += [value[:3] for value in values] + [value[-4:] for value in values]
+        patterns += [value[2:6] for value in values]
+        index_values = [IndexValue(pattern) for pattern in dict.fromkeys(patterns)]
+
+        for match_mode in ["contains", "starts_with", "ends_with"]:
+            for case_sensitive in [False, True]:
+                global_context = GlobalContext()
+                branch_context = BranchContext(
+                    branch_id="branch", index_source_node_id="index"
+                )
+                branch_context.branch_metadata["index_values"] = index_values
+                global_context.index_cache.is_reused(self.df)
+
+                for index_value in index_values:
+                    actual = self.processor._find_batched_matching_rows(
+                        self.df, column, index_value, match_mode, case_sensitive,
+                        global_context, branch_context,
+                    )
+                    if actual is None:
+                        # 只有含正则元字符的contains模式会回退到逐个扫描
+                        self.assertEqual(match_mode, "contains")
+                        self.assertFalse(is_literal_pattern(index_value))
+                        continue
+                    expected = self.processor._find_matching_rows(
+                        self.df, column, index_value, match_mode, case_sensitive
+                    )
+                    pd.testing.assert_frame_equal(actual, expected)
+
+
 if __name__ == "__main__":
     # 直接运行测试
     test_runner = TestRowLookup()
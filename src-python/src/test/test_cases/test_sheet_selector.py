@@ -5,7 +5,7 @@ SheetSelector节点测试类
 
 import unittest
 from .test_base import BaseTestFramework, TestSuiteResult
-from pipeline.models import NodeType
+from pipeline.models import GlobalContext, IndexValue, NodeType
 
 
 class TestSheetSelector(BaseTestFramework):
@@ -75,6 +75,46 @@ class TestSheetSelectorUnittest(unittest.TestCase):
         )
 
 
+class TestSheetSelectorColumnMatchUnittest(unittest.TestCase):
+    """column_match模式反向索引测试"""
+
+    def setUp(self):
+        self.test_framework = TestSheetSelector()
+        self.processor = self.test_framework.processor
+        self.file_info = self.test_framework.setup_global_context().files[
+            "test-file-93fac9a3-f4b3-410a-932c-32620bd11122"
+        ]
+
+    def test_reverse_index_returns_first_matching_sheet(self):
+        """反向索引返回第一个包含该值的sheet，与按sheet顺序扫描一致"""
+        global_context = GlobalContext(files={self.file_info.id: self.file_info})
+        match_column = "Region"
+
+        expected = {}
+        for sheet_meta in self.file_info.sheet_metas:
+            sheet_name = sheet_meta["sheet_name"]
+            df = self.processor.load_dataframe_from_file(
+                global_context, self.file_info.id, sheet_name
+            )
+            if match_column in df.columns:
+                for value in df[match_column].astype(str):
+                    expected.setdefault(value, sheet_name)
+        self.assertGreater(len(set(expected.values())), 1)
+
+        for value, sheet_name in expected.items():
+            self.assertEqual(
+                self.processor._find_sheet_by_column_match(
+                    self.file_info, IndexValue(value), match_column, global_context
+                ),
+                sheet_name,
+            )
+
+        with self.assertRaises(ValueError):
+            self.processor._find_sheet_by_column_match(
+                self.file_info, IndexValue("no-such-region"), match_column, global_context
+            )
+
+
 if __name__ == "__main__":
     # 直接运行测试
     test_runner = TestSheetSelector()